@@ -80,6 +80,7 @@ class DealResult(BaseModel):
     opportunity: str | None = None
     currency: str | None = None
     date_create: str | None = None
+    date_modify: str | None = None
 
 
 # --- Helper ---
@@ -364,6 +365,12 @@ async def get_deals(
     entity_id: int | None = Query(None, description="B24 entity ID"),
     field_id: str | None = Query(None, description="Optional UF field ID for filtering"),
     field_value: str | None = Query(None, description="Optional UF field value for filtering"),
+    modified_since: str | None = Query(
+        None, description="Only deals with DATE_MODIFY >= this ISO 8601 datetime (incremental sync)"
+    ),
+    after_id: int | None = Query(
+        None, ge=0, description="Return one page (up to 50) of deals with ID > after_id, ordered by ID"
+    ),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_main_db),
 ):
@@ -371,6 +378,10 @@ async def get_deals(
 
     At least one filter must be provided (entity or UF field).
     Uses crm.deal.list with CONTACT_ID/COMPANY_ID and/or UF field filter.
+    With modified_since only deals changed since then are returned.
+    With after_id a single Bitrix24 request is made (one ID-ordered page
+    without counting), so the caller can pace paging itself; otherwise all
+    pages are fetched.
     """
     if not (entity_type and entity_id) and not (field_id and field_value):
         raise HTTPException(
@@ -394,21 +405,32 @@ async def get_deals(
     if field_id and field_value:
         deal_filter[field_id] = field_value
 
+    params: dict[str, Any] = {
+        "filter": deal_filter,
+        "select": [
+            "ID",
+            "TITLE",
+            "STAGE_ID",
+            "OPPORTUNITY",
+            "CURRENCY_ID",
+            "DATE_CREATE",
+            "DATE_MODIFY",
+        ],
+    }
+    if modified_since:
+        deal_filter[">=DATE_MODIFY"] = modified_since
+
     try:
-        result = await client.get_all(
-            "crm.deal.list",
-            {
-                "filter": deal_filter,
-                "select": [
-                    "ID",
-                    "TITLE",
-                    "STAGE_ID",
-                    "OPPORTUNITY",
-                    "CURRENCY_ID",
-                    "DATE_CREATE",
-                ],
-            },
-        )
+        if after_id is not None:
+            deal_filter[">ID"] = after_id
+            response = await client.call(
+                "crm.deal.list",
+                {**params, "order": {"ID": "ASC"}, "start": -1},
+                raw=True,
+            )
+            result = response.get("result") if isinstance(response, dict) else None
+        else:
+            result = await client.get_all("crm.deal.list", params)
     except Exception as e:
         logger.error(f"Failed to get deals: {e}")
         raise HTTPException(
@@ -427,11 +449,13 @@ async def get_deals(
                     opportunity=item.get("OPPORTUNITY"),
                     currency=item.get("CURRENCY_ID"),
                     date_create=item.get("DATE_CREATE"),
+                    date_modify=item.get("DATE_MODIFY"),
                 )
             )
 
     logger.info(
         f"Deal search for {entity_type}:{entity_id} returned {len(deals)} results"
         + (f" (filtered by {field_id}={field_value})" if field_id else "")
+        + (f" (modified since {modified_since})" if modified_since else "")
     )
     return deals
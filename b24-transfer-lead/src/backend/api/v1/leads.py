@@ -1,23 +1,31 @@
 """Lead management endpoints."""
+import codecs
 import csv
 import io
 import json
-from typing import Any
+from itertools import groupby
+from typing import Iterator
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy import and_, false, select
 from sqlalchemy.orm import Session
 
 from src.backend.api.v1.dependencies import get_current_user
+from src.backend.core.config import settings
 from src.backend.core.database import get_main_db
+from src.backend.models.import_job import ImportJob, ImportJobStatus
 from src.backend.models.lead import Lead
 from src.backend.models.lead_field import LeadField
 from src.backend.models.workflow import Workflow
 from src.backend.models.workflow_field_mapping import WorkflowFieldMapping
 from src.backend.models.user import User
 from src.backend.services.database import database_service
+from src.backend.services.lead_import import lead_import_service
+from src.backend.services.lead_index import LeadIndexService
 from src.backend.services.bitrix24 import Bitrix24Service
-from src.backend.utils.csv_parser import parse_csv_leads
+from src.backend.utils.lead_fields import prepare_extra_fields
 
 router = APIRouter()
 
@@ -66,60 +74,86 @@ class LeadResponse(BaseModel):
         from_attributes = True
 
 
-_STANDARD_FIELD_MAP: dict[str, str] = {
-    "comment": "COMMENTS",
-    "email": "EMAIL",
-    "company": "COMPANY_TITLE",
-}
-
-
-def _prepare_extra_fields(
-    extra_fields_data: dict[str, Any],
-    field_mapping: dict[str, str],
-) -> tuple[dict[str, Any], list[tuple[str, str]]]:
-    """Prepare extra fields for Bitrix24 and for local storage.
-
-    Three categories of extra fields are supported:
-    1. Fields whose names start with ``UF_CRM_`` are already valid Bitrix24 user-field
-       IDs and are passed through directly. This allows the partner tracking system
-       to inject UF fields without requiring a WorkflowFieldMapping entry.
-    2. All other fields are resolved through *field_mapping* (WorkflowFieldMapping).
-    3. Standard fields (comment, email, company) are mapped to their Bitrix24
-       equivalents (COMMENTS, EMAIL, COMPANY_TITLE) automatically if no explicit
-       WorkflowFieldMapping exists.
-
-    Returns:
-        A tuple of (bitrix24_extra_fields, lead_fields_to_save).
-    """
-    bitrix24_extra_fields: dict[str, Any] = {}
-    lead_fields_to_save: list[tuple[str, str]] = []
-
-    for field_name, field_value in extra_fields_data.items():
-        if field_value is None:
-            continue
-        if field_name.startswith("UF_CRM_"):
-            # UF fields are already Bitrix24 field IDs -- pass through directly
-            bitrix24_extra_fields[field_name] = field_value
-            lead_fields_to_save.append((field_name, str(field_value)))
-        elif field_name in field_mapping:
-            bitrix24_field_id = field_mapping[field_name]
-            bitrix24_extra_fields[bitrix24_field_id] = field_value
-            lead_fields_to_save.append((field_name, str(field_value)))
-        elif field_name in _STANDARD_FIELD_MAP:
-            bitrix24_field_id = _STANDARD_FIELD_MAP[field_name]
-            bitrix24_extra_fields[bitrix24_field_id] = field_value
-            lead_fields_to_save.append((field_name, str(field_value)))
-
-    return bitrix24_extra_fields, lead_fields_to_save
+# Lead columns that can be requested through ?columns= ("fields" = additional fields)
+LEAD_COLUMNS = (
+    "id",
+    "phone",
+    "name",
+    "status",
+    "bitrix24_lead_id",
+    "assigned_by_name",
+    "status_semantic_id",
+    "deal_id",
+    "deal_amount",
+    "deal_status",
+    "deal_status_name",
+    "created_at",
+    "updated_at",
+)
+
+# Max IDs per IN (...) clause
+_IN_CHUNK_SIZE = 500
+
+
+def _load_lead_fields(workflow_db: Session, lead_ids: list[int]) -> dict[int, list[LeadFieldResponse]]:
+    """Load additional fields of many leads with one IN query per 500 leads."""
+    fields_by_lead: dict[int, list[LeadFieldResponse]] = {lead_id: [] for lead_id in lead_ids}
+    for offset in range(0, len(lead_ids), _IN_CHUNK_SIZE):
+        chunk = lead_ids[offset:offset + _IN_CHUNK_SIZE]
+        for lead_id, field_name, field_value in (
+            workflow_db.query(LeadField.lead_id, LeadField.field_name, LeadField.field_value)
+            .filter(LeadField.lead_id.in_(chunk))
+            .order_by(LeadField.id)
+        ):
+            fields_by_lead[lead_id].append(LeadFieldResponse(field_name=field_name, field_value=field_value))
+    return fields_by_lead
+
+
+def _lead_response(lead, fields: list[LeadFieldResponse]) -> LeadResponse:
+    """Build LeadResponse from a Lead (or a row with the same attributes) and its fields."""
+    return LeadResponse(
+        id=lead.id,
+        phone=lead.phone,
+        name=lead.name,
+        status=lead.status,
+        bitrix24_lead_id=lead.bitrix24_lead_id,
+        assigned_by_name=lead.assigned_by_name,
+        status_semantic_id=lead.status_semantic_id,
+        deal_id=lead.deal_id,
+        deal_amount=lead.deal_amount,
+        deal_status=lead.deal_status,
+        deal_status_name=lead.deal_status_name,
+        created_at=lead.created_at.isoformat(),
+        updated_at=lead.updated_at.isoformat(),
+        fields=fields,
+    )
 
 
 @router.get("/{workflow_id}/leads", response_model=list[LeadResponse])
 async def list_leads(
     workflow_id: int,
+    response: Response,
+    after_id: int | None = Query(None, ge=0),
+    limit: int | None = Query(None, ge=1, le=10000),
+    status_filter: list[str] | None = Query(None, alias="status"),
+    deal_status: list[str] | None = Query(None),
+    bitrix24_lead_id: str | None = Query(None),
+    columns: str | None = Query(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_main_db),
 ):
-    """List leads for a workflow."""
+    """List leads for a workflow.
+
+    Args:
+        workflow_id: ID of the workflow
+        after_id: Cursor - return leads with ID greater than this (ordered by ID)
+        limit: Page size; when the page is full, X-Next-Cursor holds the cursor of the next page
+        status_filter: Only leads with these statuses (?status=NEW&status=CONVERTED)
+        deal_status: Only leads with these deal stage IDs
+        bitrix24_lead_id: Only leads with this Bitrix24 lead/deal ID
+        columns: Comma-separated projection (e.g. "id,phone,status"); "fields" adds additional fields.
+                 Without it every column and the additional fields are returned.
+    """
     # Verify workflow access
     workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
     if not workflow:
@@ -141,40 +175,60 @@ async def list_leads(
             detail="Access denied",
         )
 
+    projection: list[str] | None = None
+    if columns:
+        projection = list(dict.fromkeys(name.strip() for name in columns.split(",") if name.strip()))
+        unknown = [name for name in projection if name not in LEAD_COLUMNS and name != "fields"]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown columns: {', '.join(unknown)}",
+            )
+
+    lead_columns = list(LEAD_COLUMNS) if projection is None else [name for name in projection if name != "fields"]
+    include_fields = projection is None or "fields" in projection
+
     # Get leads from workflow database
     workflow_db = next(database_service.get_workflow_session(workflow_id))
-    leads = workflow_db.query(Lead).all()
+    try:
+        # Only requested columns are selected; id is always needed for the cursor and fields
+        query = workflow_db.query(*(getattr(Lead, name) for name in dict.fromkeys(["id", *lead_columns])))
+        if after_id is not None:
+            query = query.filter(Lead.id > after_id)
+        if status_filter:
+            query = query.filter(Lead.status.in_(status_filter))
+        if deal_status:
+            query = query.filter(Lead.deal_status.in_(deal_status))
+        if bitrix24_lead_id is not None:
+            query = query.filter(Lead.bitrix24_lead_id == bitrix24_lead_id)
+        query = query.order_by(Lead.id)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = query.all()
+
+        # Fields of the whole page in one query instead of one per lead
+        fields_by_lead = _load_lead_fields(workflow_db, [row.id for row in rows]) if include_fields else {}
+    finally:
+        workflow_db.close()
+
+    next_cursor = str(rows[-1].id) if limit is not None and len(rows) == limit else None
+
+    if projection is None:
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [_lead_response(row, fields_by_lead[row.id]) for row in rows]
 
     result = []
-    for lead in leads:
-        # Get additional fields for this lead
-        lead_fields = workflow_db.query(LeadField).filter(LeadField.lead_id == lead.id).all()
-        fields = [
-            LeadFieldResponse(field_name=lf.field_name, field_value=lf.field_value)
-            for lf in lead_fields
-        ]
-
-        result.append(
-            LeadResponse(
-                id=lead.id,
-                phone=lead.phone,
-                name=lead.name,
-                status=lead.status,
-                bitrix24_lead_id=lead.bitrix24_lead_id,
-                assigned_by_name=lead.assigned_by_name,
-                status_semantic_id=lead.status_semantic_id,
-                deal_id=lead.deal_id,
-                deal_amount=lead.deal_amount,
-                deal_status=lead.deal_status,
-                deal_status_name=lead.deal_status_name,
-                created_at=lead.created_at.isoformat(),
-                updated_at=lead.updated_at.isoformat(),
-                fields=fields,
-            )
-        )
-
-    workflow_db.close()
-    return result
+    for row in rows:
+        item = {}
+        for name in lead_columns:
+            value = getattr(row, name)
+            item[name] = value.isoformat() if name in ("created_at", "updated_at") and value else value
+        if include_fields:
+            item["fields"] = [field.model_dump() for field in fields_by_lead[row.id]]
+        result.append(item)
+    # Projected rows don't match LeadResponse, so they bypass response_model validation
+    return JSONResponse(result, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
 
 @router.post("/{workflow_id}/leads", response_model=LeadResponse, status_code=status.HTTP_201_CREATED)
@@ -221,7 +275,7 @@ async def create_lead(
 
     # Prepare extra fields for Bitrix24
     # UF_CRM_* fields pass through directly; others go through WorkflowFieldMapping.
-    bitrix24_extra_fields, lead_fields_to_save = _prepare_extra_fields(
+    bitrix24_extra_fields, lead_fields_to_save = prepare_extra_fields(
         extra_fields_data, field_mapping
     )
 
@@ -263,50 +317,21 @@ async def create_lead(
 
         lead.bitrix24_lead_id = str(bitrix_entity_id)
         workflow_db.commit()
+        LeadIndexService.add_lead(db, workflow_id, lead)
     except Exception as e:
         # Log error but don't fail the request
         print(f"Error creating {entity_type} in Bitrix24: {e}")
 
-    # Get additional fields for response
-    lead_fields_query = workflow_db.query(LeadField).filter(LeadField.lead_id == lead.id).all()
-    fields = [
-        LeadFieldResponse(field_name=lf.field_name, field_value=lf.field_value)
-        for lf in lead_fields_query
-    ]
-
-    # Save attribute values before closing session
-    lead_id = lead.id
-    lead_phone = lead.phone
-    lead_name = lead.name
-    lead_status = lead.status
-    lead_bitrix_id = lead.bitrix24_lead_id
-    lead_assigned_by_name = lead.assigned_by_name
-    lead_status_semantic_id = lead.status_semantic_id
-    lead_deal_id = lead.deal_id
-    lead_deal_amount = lead.deal_amount
-    lead_deal_status = lead.deal_status
-    lead_deal_status_name = lead.deal_status_name
-    lead_created_at = lead.created_at.isoformat()
-    lead_updated_at = lead.updated_at.isoformat()
-
-    workflow_db.close()
-
-    return LeadResponse(
-        id=lead_id,
-        phone=lead_phone,
-        name=lead_name,
-        status=lead_status,
-        bitrix24_lead_id=lead_bitrix_id,
-        assigned_by_name=lead_assigned_by_name,
-        status_semantic_id=lead_status_semantic_id,
-        deal_id=lead_deal_id,
-        deal_amount=lead_deal_amount,
-        deal_status=lead_deal_status,
-        deal_status_name=lead_deal_status_name,
-        created_at=lead_created_at,
-        updated_at=lead_updated_at,
-        fields=fields,
+    # Additional fields are the ones just saved - no need to query them back
+    result = _lead_response(
+        lead,
+        [
+            LeadFieldResponse(field_name=field_name, field_value=field_value)
+            for field_name, field_value in lead_fields_to_save
+        ],
     )
+    workflow_db.close()
+    return result
 
 
 class ImportLeadRequest(BaseModel):
@@ -388,6 +413,7 @@ async def import_lead(
     workflow_db.add(lead)
     workflow_db.commit()
     workflow_db.refresh(lead)
+    LeadIndexService.add_lead(db, workflow_id, lead)
 
     lead_id = lead.id
     lead_phone = lead.phone
@@ -423,25 +449,34 @@ async def import_lead(
     )
 
 
-@router.post("/{workflow_id}/leads/upload", response_model=list[LeadResponse], status_code=status.HTTP_201_CREATED)
-async def upload_leads_csv(
+class ImportLeadsBatchRequest(BaseModel):
+    """Batch of leads from an external sync (e.g. B24 deal sync)."""
+
+    leads: list[ImportLeadRequest]
+
+
+class ImportLeadsBatchResponse(BaseModel):
+    """Result of a batch import."""
+
+    created: int
+    skipped: int
+
+
+@router.post(
+    "/{workflow_id}/leads/import/batch",
+    response_model=ImportLeadsBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def import_leads_batch(
     workflow_id: int,
-    file: UploadFile = File(...),
-    column_mapping: str | None = Form(None),
-    limit: str | None = Form(None),
+    request: ImportLeadsBatchRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_main_db),
 ):
-    """Upload leads from CSV file.
+    """Import many leads in one transaction (local records only, no B24 push).
 
-    Args:
-        workflow_id: ID of the workflow
-        file: CSV file to upload
-        column_mapping: Optional JSON string mapping CSV column names to field names
-                        (e.g., '{"Email": "email", "Company": "company"}')
-        limit: Optional limit on number of rows to process (if None, processes all rows)
+    Leads whose deal_id already exists in the workflow (or repeats within the batch) are skipped.
     """
-    # Verify workflow access
     workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
     if not workflow:
         raise HTTPException(
@@ -449,20 +484,87 @@ async def upload_leads_csv(
             detail="Workflow not found",
         )
 
-    # Check access: user can access workflow if they created it, have access to it, or are admin
     has_access = (
         current_user.role == "admin"
         or workflow.user_id == current_user.id
         or workflow in current_user.accessible_workflows
     )
+    if not has_access:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+    workflow_db = next(database_service.get_workflow_session(workflow_id))
+    try:
+        deal_ids = {item.deal_id for item in request.leads if item.deal_id}
+        seen_deal_ids: set[str] = set()
+        if deal_ids:
+            # One lookup for the whole batch instead of one per lead
+            seen_deal_ids = {
+                row[0]
+                for row in workflow_db.query(Lead.deal_id).filter(Lead.deal_id.in_(deal_ids)).all()
+            }
+
+        leads: list[Lead] = []
+        skipped = 0
+        for item in request.leads:
+            if item.deal_id:
+                if item.deal_id in seen_deal_ids:
+                    skipped += 1
+                    continue
+                seen_deal_ids.add(item.deal_id)
+            leads.append(
+                Lead(
+                    phone=item.phone,
+                    name=item.name,
+                    status=item.status or "NEW",
+                    bitrix24_lead_id=item.bitrix24_lead_id,
+                    deal_id=item.deal_id,
+                    deal_amount=item.deal_amount,
+                    deal_status=item.deal_status,
+                    deal_status_name=item.deal_status_name,
+                )
+            )
+
+        if leads:
+            workflow_db.add_all(leads)
+            workflow_db.flush()
+            # Read before commit expires the objects (one refresh SELECT per lead otherwise)
+            index_rows = [(lead.bitrix24_lead_id, lead.id) for lead in leads]
+            workflow_db.commit()
+            LeadIndexService.add(db, workflow_id, index_rows)
+    finally:
+        workflow_db.close()
+
+    return ImportLeadsBatchResponse(created=len(leads), skipped=skipped)
 
+
+def _get_accessible_workflow(db: Session, workflow_id: int, current_user: User) -> Workflow:
+    """Get workflow or raise 404/403 if it does not exist or the user has no access."""
+    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    if not workflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow not found",
+        )
+
+    # Check access: user can access workflow if they created it, have access to it, or are admin
+    has_access = (
+        current_user.role == "admin"
+        or workflow.user_id == current_user.id
+        or workflow in current_user.accessible_workflows
+    )
     if not has_access:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied",
         )
+    return workflow
+
 
-    # Parse column mapping if provided
+def _parse_upload_options(column_mapping: str | None, limit: str | None) -> tuple[dict[str, str] | None, int | None]:
+    """Parse column_mapping JSON and row limit form fields of a CSV upload."""
     column_mapping_dict: dict[str, str] | None = None
     if column_mapping:
         try:
@@ -473,125 +575,217 @@ async def upload_leads_csv(
                 detail="Invalid column_mapping JSON format",
             )
 
-    # Parse limit if provided
     limit_int: int | None = None
     if limit:
         try:
             limit_int = int(limit)
-            if limit_int < 1:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="limit must be a positive integer",
-                )
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid limit format",
             )
+        if limit_int < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="limit must be a positive integer",
+            )
+    return column_mapping_dict, limit_int
 
-    # Parse CSV
-    content = await file.read()
-    leads_data = parse_csv_leads(content.decode("utf-8"), column_mapping=column_mapping_dict)
 
-    # Apply limit if specified
-    if limit_int is not None:
-        leads_data = leads_data[:limit_int]
+class ImportJobResponse(BaseModel):
+    """CSV import job response model."""
 
-    # Get field mappings for this workflow
-    mappings = db.query(WorkflowFieldMapping).filter(
-        WorkflowFieldMapping.workflow_id == workflow_id,
-        WorkflowFieldMapping.entity_type == workflow.entity_type,
-    ).all()
+    id: int
+    workflow_id: int
+    status: str
+    file_name: str | None
+    total_rows: int
+    inserted_rows: int
+    pushed_rows: int
+    failed_rows: int
+    progress: float  # 0-100: saving rows is the first half, Bitrix24 creation the second
+    error: str | None
+    created_at: str
+    updated_at: str
+    finished_at: str | None
+
+
+def _job_response(job: ImportJob) -> ImportJobResponse:
+    """Build import job response with overall progress."""
+    if job.status == ImportJobStatus.COMPLETED.value:
+        progress = 100.0
+    elif job.total_rows:
+        done = job.inserted_rows + job.pushed_rows + job.failed_rows
+        progress = round(min(done / (2 * job.total_rows), 1.0) * 100, 1)
+    else:
+        progress = 0.0
+    return ImportJobResponse(
+        id=job.id,
+        workflow_id=job.workflow_id,
+        status=job.status,
+        file_name=job.file_name,
+        total_rows=job.total_rows,
+        inserted_rows=job.inserted_rows,
+        pushed_rows=job.pushed_rows,
+        failed_rows=job.failed_rows,
+        progress=progress,
+        error=job.error,
+        created_at=job.created_at.isoformat(),
+        updated_at=job.updated_at.isoformat(),
+        finished_at=job.finished_at.isoformat() if job.finished_at else None,
+    )
 
-    # Create mapping dict: field_name -> bitrix24_field_id
-    field_mapping = {mapping.field_name: mapping.bitrix24_field_id for mapping in mappings}
 
-    # Create leads
-    workflow_db = next(database_service.get_workflow_session(workflow_id))
-    bitrix_service = Bitrix24Service(workflow.bitrix24_webhook_url)
-    created_leads = []
-    entity_type = workflow.entity_type or "lead"
-
-    for lead_data in leads_data:
-        # Extract base fields and additional fields
-        phone = lead_data.get("phone", "")
-        name = lead_data.get("name", "")
-        extra_fields_data = {k: v for k, v in lead_data.items() if k not in ["name", "phone"]}
-
-        # Prepare extra fields for Bitrix24
-        # UF_CRM_* fields pass through directly; others go through WorkflowFieldMapping.
-        bitrix24_extra_fields, lead_fields_to_save = _prepare_extra_fields(
-            extra_fields_data, field_mapping
+async def _create_import_job(
+    db: Session,
+    workflow: Workflow,
+    current_user: User,
+    file: UploadFile,
+    column_mapping: str | None,
+    limit: str | None,
+) -> ImportJob:
+    """Validate an uploaded CSV and register an import job for it."""
+    column_mapping_dict, limit_int = _parse_upload_options(column_mapping, limit)
+    content = await file.read()
+    try:
+        return lead_import_service.create_job(
+            db, workflow, current_user, content, file.filename, column_mapping_dict, limit_int
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
 
-        lead = Lead(phone=phone, name=name, status="NEW")
-        workflow_db.add(lead)
-        workflow_db.commit()
-        workflow_db.refresh(lead)
-
-        # Save additional fields
-        for field_name, field_value in lead_fields_to_save:
-            lead_field = LeadField(
-                lead_id=lead.id,
-                field_name=field_name,
-                field_value=field_value,
-            )
-            workflow_db.add(lead_field)
-        workflow_db.commit()
 
-        # Create entity in Bitrix24 based on workflow settings
-        try:
-            if entity_type == "deal":
-                # Create deal
-                category_id = workflow.deal_category_id if workflow.deal_category_id is not None else 0
-                stage_id = workflow.deal_stage_id if workflow.deal_stage_id else "NEW"
-                bitrix_entity_id = await bitrix_service.create_deal(
-                    name, phone, category_id, stage_id, extra_fields=bitrix24_extra_fields
-                )
-            else:
-                # Create lead (default)
-                status_id = workflow.lead_status_id if workflow.lead_status_id else "NEW"
-                bitrix_entity_id = await bitrix_service.create_lead(
-                    name, phone, status_id, extra_fields=bitrix24_extra_fields
-                )
+@router.post(
+    "/{workflow_id}/leads/import-jobs",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_csv_import(
+    workflow_id: int,
+    file: UploadFile = File(...),
+    column_mapping: str | None = Form(None),
+    limit: str | None = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_main_db),
+):
+    """Start a background import of leads from a CSV file.
 
-            lead.bitrix24_lead_id = str(bitrix_entity_id)
-            workflow_db.commit()
-        except Exception as e:
-            print(f"Error creating {entity_type} in Bitrix24: {e}")
+    Same form fields as /leads/upload; returns immediately, progress is
+    available at /leads/import-jobs/{job_id}.
+    """
+    workflow = _get_accessible_workflow(db, workflow_id, current_user)
+    job = await _create_import_job(db, workflow, current_user, file, column_mapping, limit)
+    lead_import_service.start(job.id)
+    return _job_response(job)
 
-        created_leads.append(lead)
 
-    result = []
-    for lead in created_leads:
-        # Get additional fields for this lead
-        lead_fields = workflow_db.query(LeadField).filter(LeadField.lead_id == lead.id).all()
-        fields = [
-            LeadFieldResponse(field_name=lf.field_name, field_value=lf.field_value)
-            for lf in lead_fields
-        ]
-
-        result.append(
-            LeadResponse(
-                id=lead.id,
-                phone=lead.phone,
-                name=lead.name,
-                status=lead.status,
-                bitrix24_lead_id=lead.bitrix24_lead_id,
-                assigned_by_name=lead.assigned_by_name,
-                status_semantic_id=lead.status_semantic_id,
-                deal_id=lead.deal_id,
-                deal_amount=lead.deal_amount,
-                deal_status=lead.deal_status,
-                deal_status_name=lead.deal_status_name,
-                created_at=lead.created_at.isoformat(),
-                updated_at=lead.updated_at.isoformat(),
-                fields=fields,
-            )
+@router.get("/{workflow_id}/leads/import-jobs", response_model=list[ImportJobResponse])
+async def list_csv_imports(
+    workflow_id: int,
+    limit: int = 20,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_main_db),
+):
+    """List recent CSV import jobs of a workflow (newest first)."""
+    _get_accessible_workflow(db, workflow_id, current_user)
+    jobs = (
+        db.query(ImportJob)
+        .filter(ImportJob.workflow_id == workflow_id)
+        .order_by(ImportJob.id.desc())
+        .limit(min(max(limit, 1), 100))
+        .all()
+    )
+    return [_job_response(job) for job in jobs]
+
+
+@router.get("/{workflow_id}/leads/import-jobs/{job_id}", response_model=ImportJobResponse)
+async def get_csv_import(
+    workflow_id: int,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_main_db),
+):
+    """Get status and progress of a CSV import job."""
+    _get_accessible_workflow(db, workflow_id, current_user)
+    job = db.query(ImportJob).filter(ImportJob.id == job_id, ImportJob.workflow_id == workflow_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
         )
+    return _job_response(job)
 
-    workflow_db.close()
-    return result
+
+@router.post("/{workflow_id}/leads/import-jobs/{job_id}/resume", response_model=ImportJobResponse)
+async def resume_csv_import(
+    workflow_id: int,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_main_db),
+):
+    """Resume a failed job, or retry Bitrix24 creation of leads that failed in a completed one."""
+    _get_accessible_workflow(db, workflow_id, current_user)
+    job = db.query(ImportJob).filter(ImportJob.id == job_id, ImportJob.workflow_id == workflow_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+    if lead_import_service.is_running(job.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import job is already running",
+        )
+    if job.status == ImportJobStatus.COMPLETED.value and job.failed_rows == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import job has nothing to resume",
+        )
+
+    job.status = ImportJobStatus.PENDING.value
+    job.error = None
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    lead_import_service.start(job.id)
+    return _job_response(job)
+
+
+@router.post("/{workflow_id}/leads/upload", response_model=list[LeadResponse], status_code=status.HTTP_201_CREATED)
+async def upload_leads_csv(
+    workflow_id: int,
+    file: UploadFile = File(...),
+    column_mapping: str | None = Form(None),
+    limit: str | None = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_main_db),
+):
+    """Upload leads from CSV file and wait until they are created.
+
+    Runs the same import job as /leads/import-jobs inline; prefer the job
+    endpoint for large files.
+
+    Args:
+        workflow_id: ID of the workflow
+        file: CSV file to upload
+        column_mapping: Optional JSON string mapping CSV column names to field names
+                        (e.g., '{"Email": "email", "Company": "company"}')
+        limit: Optional limit on number of rows to process (if None, processes all rows)
+    """
+    workflow = _get_accessible_workflow(db, workflow_id, current_user)
+    job = await _create_import_job(db, workflow, current_user, file, column_mapping, limit)
+    await lead_import_service.run(job.id)
+
+    workflow_db = next(database_service.get_workflow_session(workflow_id))
+    try:
+        leads = workflow_db.query(Lead).filter(Lead.import_job_id == job.id).order_by(Lead.id).all()
+        fields_by_lead = _load_lead_fields(workflow_db, [lead.id for lead in leads])
+        return [_lead_response(lead, fields_by_lead[lead.id]) for lead in leads]
+    finally:
+        workflow_db.close()
 
 
 @router.get("/{workflow_id}/leads/export")
@@ -622,22 +816,12 @@ async def export_leads_csv(
             detail="Access denied",
         )
 
-    # Get leads from workflow database
-    workflow_db = next(database_service.get_workflow_session(workflow_id))
-    leads = workflow_db.query(Lead).all()
-
     # Get field mappings for column headers
     mappings = db.query(WorkflowFieldMapping).filter(
         WorkflowFieldMapping.workflow_id == workflow_id,
         WorkflowFieldMapping.entity_type == workflow.entity_type,
     ).all()
 
-    # Create mapping dict: field_name -> display_name
-    field_display_names = {}
-    for mapping in mappings:
-        display_name = mapping.display_name.strip() if mapping.display_name else mapping.bitrix24_field_name
-        field_display_names[mapping.field_name] = display_name
-
     # Get status map for display
     status_map: dict[str, str] = {}
     try:
@@ -650,74 +834,117 @@ async def export_leads_csv(
         else:
             statuses = await bitrix_service.get_lead_statuses()
 
-        for status in statuses:
-            status_map[status["id"]] = status["name"]
+        for item in statuses:
+            status_map[item["id"]] = item["name"]
     except Exception as e:
         print(f"Error loading status map: {e}")
 
-    # Get all unique field names from leads
-    all_field_names = set()
-    for lead in leads:
-        lead_fields = workflow_db.query(LeadField).filter(LeadField.lead_id == lead.id).all()
-        for field in lead_fields:
-            all_field_names.add(field.field_name)
-
-    # Build CSV headers
-    headers = ["Имя", "Телефон", "Статус", "Ответственный", "Bitrix24 ID", "Сумма сделки", "Стадия сделки", "Создан"]
-    # Add additional fields in order from mappings
-    for mapping in mappings:
-        if mapping.field_name in all_field_names:
-            display_name = mapping.display_name.strip() if mapping.display_name else mapping.bitrix24_field_name
-            headers.append(display_name)
-
-    # Create CSV content with semicolon delimiter for Excel compatibility (Russian locale uses ;)
-    output = io.StringIO()
-    writer = csv.writer(output, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-
-    # Write headers
-    writer.writerow(headers)
-
-    # Write data rows
-    for lead in leads:
-        # Get status display name
-        status_display = status_map.get(lead.status, lead.status) if lead.status else "NEW"
-
-        # Get additional fields
-        lead_fields = workflow_db.query(LeadField).filter(LeadField.lead_id == lead.id).all()
-        field_dict = {field.field_name: field.field_value for field in lead_fields}
-
-        # Build row
-        row = [
-            lead.name,
-            lead.phone,
-            status_display,
-            lead.assigned_by_name or "",
-            lead.bitrix24_lead_id or "",
-            lead.deal_amount or "",
-            lead.deal_status_name or lead.deal_status or "",
-            lead.created_at.strftime("%Y-%m-%d %H:%M:%S") if lead.created_at else "",
-        ]
-
-        # Add additional fields in order from mappings
-        for mapping in mappings:
-            if mapping.field_name in all_field_names:
-                row.append(field_dict.get(mapping.field_name, ""))
-
-        writer.writerow(row)
-
-    workflow_db.close()
-
-    # Return CSV file with UTF-8 BOM for Excel compatibility
-    csv_content = output.getvalue()
-    output.close()
-
-    # Add UTF-8 BOM for Excel to recognize encoding correctly
-    csv_bytes = csv_content.encode('utf-8-sig')
+    # (field_name, display_name) of mapped fields, in mapping order
+    mapped_fields = [
+        (mapping.field_name, mapping.display_name.strip() if mapping.display_name else mapping.bitrix24_field_name)
+        for mapping in mappings
+    ]
 
-    return Response(
-        content=csv_bytes,
-        media_type="text/csv; charset=utf-8",
+    return StreamingResponse(
+        _iter_leads_csv(workflow_id, mapped_fields, status_map),
+        media_type="text/csv",  # Starlette appends "; charset=utf-8"
         headers={
             "Content-Disposition": f'attachment; filename="leads_workflow_{workflow_id}.csv"'
         }
     )
+
+
+def _iter_leads_csv(
+    workflow_id: int,
+    mapped_fields: list[tuple[str, str]],
+    status_map: dict[str, str],
+) -> Iterator[bytes]:
+    """Yield the leads CSV export chunk by chunk.
+
+    Leads are read with keyset pagination (CSV_EXPORT_CHUNK_SIZE leads per
+    query, joined with their fields), so memory use does not depend on the
+    workflow size. Runs in a worker thread (sync generator of StreamingResponse).
+    """
+    workflow_db = next(database_service.get_workflow_session(workflow_id))
+    try:
+        # Only mapped fields that at least one lead has get a column (one DISTINCT query)
+        present_field_names = {
+            row[0] for row in workflow_db.query(LeadField.field_name).distinct()
+        }
+        export_fields = [(name, display) for name, display in mapped_fields if name in present_field_names]
+        export_field_names = [name for name, _ in export_fields]
+
+        # Semicolon delimiter for Excel compatibility (Russian locale uses ;)
+        output = io.StringIO()
+        writer = csv.writer(output, delimiter=';', quoting=csv.QUOTE_MINIMAL)
+
+        def flush() -> bytes:
+            data = output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+            return data
+
+        headers = ["Имя", "Телефон", "Статус", "Ответственный", "Bitrix24 ID", "Сумма сделки", "Стадия сделки", "Создан"]
+        writer.writerow(headers + [display for _, display in export_fields])
+        # UTF-8 BOM for Excel to recognize encoding correctly
+        yield codecs.BOM_UTF8 + flush()
+
+        last_id = 0
+        while True:
+            chunk_ids = (
+                select(Lead.id)
+                .where(Lead.id > last_id)
+                .order_by(Lead.id)
+                .limit(settings.CSV_EXPORT_CHUNK_SIZE)
+                .subquery()
+            )
+            field_join = LeadField.lead_id == Lead.id
+            if export_field_names:
+                field_join = and_(field_join, LeadField.field_name.in_(export_field_names))
+            else:
+                field_join = and_(field_join, false())
+            rows = (
+                workflow_db.query(
+                    Lead.id,
+                    Lead.name,
+                    Lead.phone,
+                    Lead.status,
+                    Lead.assigned_by_name,
+                    Lead.bitrix24_lead_id,
+                    Lead.deal_amount,
+                    Lead.deal_status,
+                    Lead.deal_status_name,
+                    Lead.created_at,
+                    LeadField.field_name,
+                    LeadField.field_value,
+                )
+                .join(chunk_ids, chunk_ids.c.id == Lead.id)
+                .outerjoin(LeadField, field_join)
+                .order_by(Lead.id, LeadField.id)
+                .all()
+            )
+            if not rows:
+                break
+
+            for _, lead_rows in groupby(rows, key=lambda row: row.id):
+                lead_rows = list(lead_rows)
+                lead = lead_rows[0]
+                field_dict = {row.field_name: row.field_value for row in lead_rows if row.field_name is not None}
+                # Get status display name
+                status_display = status_map.get(lead.status, lead.status) if lead.status else "NEW"
+                writer.writerow([
+                    lead.name,
+                    lead.phone,
+                    status_display,
+                    lead.assigned_by_name or "",
+                    lead.bitrix24_lead_id or "",
+                    lead.deal_amount or "",
+                    lead.deal_status_name or lead.deal_status or "",
+                    lead.created_at.strftime("%Y-%m-%d %H:%M:%S") if lead.created_at else "",
+                    *(field_dict.get(name, "") for name in export_field_names),
+                ])
+
+            last_id = rows[-1].id
+            yield flush()
+    finally:
+        workflow_db.close()
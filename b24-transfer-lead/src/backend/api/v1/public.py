@@ -12,6 +12,7 @@ from src.backend.models.lead_field import LeadField
 from src.backend.models.workflow import Workflow
 from src.backend.models.workflow_field_mapping import WorkflowFieldMapping
 from src.backend.services.database import database_service
+from src.backend.services.lead_index import LeadIndexService
 from src.backend.services.bitrix24 import Bitrix24Service
 
 logger = logging.getLogger(__name__)
@@ -166,6 +167,7 @@ async def create_lead_public(
         
         lead.bitrix24_lead_id = str(bitrix_entity_id)
         workflow_db.commit()
+        LeadIndexService.add_lead(db, workflow.id, lead)
     except Exception as e:
         # Log error but don't fail the request
         logger.error(f"Error creating {entity_type} in Bitrix24: {e}", exc_info=True)
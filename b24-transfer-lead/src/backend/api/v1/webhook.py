@@ -9,6 +9,7 @@ from src.backend.models.lead import Lead
 from src.backend.models.lead_field import LeadField
 from src.backend.models.workflow_field_mapping import WorkflowFieldMapping
 from src.backend.services.database import database_service
+from src.backend.services.lead_index import LeadIndexService
 from src.backend.services.bitrix24 import Bitrix24Service
 
 logger = logging.getLogger(__name__)
@@ -159,6 +160,38 @@ def extract_id_from_nested_dict(data: dict) -> str | None:
     return None
 
 
+def _find_indexed_lead(
+    db: Session, bitrix24_entity_id: str, workflows: list[Workflow]
+) -> tuple[Lead, Session, Workflow] | None:
+    """Find a lead by Bitrix24 ID through the global lead index.
+
+    One indexed lookup in the main database, then only the owning workflow
+    database is opened. A stale index entry (lead missing or re-pointed) is
+    dropped and the lead is treated as not found.
+
+    Args:
+        db: Main database session
+        bitrix24_entity_id: Bitrix24 lead or deal ID
+        workflows: Candidate workflows, in priority order
+
+    Returns:
+        (lead, workflow database session, workflow) or None
+    """
+    entry = LeadIndexService.find(db, str(bitrix24_entity_id), [wf.id for wf in workflows])
+    if entry is None:
+        return None
+
+    workflow = next(wf for wf in workflows if wf.id == entry.workflow_id)
+    workflow_db = next(database_service.get_workflow_session(workflow.id))
+    lead = workflow_db.query(Lead).filter(Lead.id == entry.lead_id).first()
+    if lead is None or lead.bitrix24_lead_id != str(bitrix24_entity_id):
+        workflow_db.close()
+        logger.warning(f"Stale lead index entry for {bitrix24_entity_id} in workflow {workflow.id}, removing")
+        LeadIndexService.remove(db, workflow.id, bitrix24_entity_id)
+        return None
+    return lead, workflow_db, workflow
+
+
 @router.post("")
 async def handle_bitrix24_webhook(
     request: Request,
@@ -297,18 +330,13 @@ async def handle_bitrix24_webhook(
                 status_id = lead_data.get("STATUS_ID")
 
                 if status_id:
-                    # Search for the lead across all matching workflows
+                    # Find the lead across all matching workflows via the global lead index
                     lead = None
                     workflow_db = None
-                    for wf in matching_workflows:
-                        wf_db = next(database_service.get_workflow_session(wf.id))
-                        found = wf_db.query(Lead).filter(Lead.bitrix24_lead_id == str(bitrix_lead_id)).first()
-                        if found:
-                            lead = found
-                            workflow_db = wf_db
-                            workflow = wf
-                            logger.info(f"Found lead {bitrix_lead_id} in workflow {wf.id}")
-                            break
+                    found = _find_indexed_lead(db, bitrix_lead_id, matching_workflows)
+                    if found:
+                        lead, workflow_db, workflow = found
+                        logger.info(f"Found lead {bitrix_lead_id} in workflow {workflow.id}")
 
                     if lead:
                         old_status = lead.status
@@ -468,25 +496,17 @@ async def handle_bitrix24_webhook(
                     workflow_db = None
                     deal_lead_id = deal_data.get("LEAD_ID")
 
-                    for wf in matching_workflows:
-                        wf_db = next(database_service.get_workflow_session(wf.id))
-                        # First: direct match (deal-type workflows store deal ID as bitrix24_lead_id)
-                        found = wf_db.query(Lead).filter(Lead.bitrix24_lead_id == str(bitrix_deal_id)).first()
+                    # First: direct match (deal-type workflows store deal ID as bitrix24_lead_id)
+                    found = _find_indexed_lead(db, bitrix_deal_id, matching_workflows)
+                    if found:
+                        lead, workflow_db, workflow = found
+                        logger.info(f"Found deal {bitrix_deal_id} by direct match in workflow {workflow.id}")
+                    # Second: match by deal's LEAD_ID (lead-type workflows)
+                    elif deal_lead_id:
+                        found = _find_indexed_lead(db, deal_lead_id, matching_workflows)
                         if found:
-                            lead = found
-                            workflow_db = wf_db
-                            workflow = wf
-                            logger.info(f"Found deal {bitrix_deal_id} by direct match in workflow {wf.id}")
-                            break
-                        # Second: match by deal's LEAD_ID (lead-type workflows)
-                        if deal_lead_id:
-                            found = wf_db.query(Lead).filter(Lead.bitrix24_lead_id == str(deal_lead_id)).first()
-                            if found:
-                                lead = found
-                                workflow_db = wf_db
-                                workflow = wf
-                                logger.info(f"Found lead {deal_lead_id} (from deal {bitrix_deal_id} LEAD_ID) in workflow {wf.id}")
-                                break
+                            lead, workflow_db, workflow = found
+                            logger.info(f"Found lead {deal_lead_id} (from deal {bitrix_deal_id} LEAD_ID) in workflow {workflow.id}")
 
                     if lead:
                         # Determine if lead was found via LEAD_ID (lead-type workflow)
@@ -13,6 +13,7 @@ from src.backend.models.workflow_field_mapping import WorkflowFieldMapping
 from src.backend.models.user import User
 from src.backend.models.lead import Lead
 from src.backend.services.database import database_service
+from src.backend.services.lead_index import LeadIndexService
 from src.backend.services.bitrix24 import Bitrix24Service
 from src.backend.utils.bitrix24_url import extract_domain_from_webhook_url
 
@@ -170,8 +171,9 @@ async def delete_workflow(
             detail="Access denied",
         )
 
-    # Delete workflow database
+    # Delete workflow database and its lead index entries
     database_service.delete_workflow_db(workflow_id)
+    LeadIndexService.remove(db, workflow_id)
 
     db.delete(workflow)
     db.commit()
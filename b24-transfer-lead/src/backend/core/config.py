@@ -8,6 +8,24 @@ class Settings(BaseSettings):
     # Database
     MAIN_DB_URL: str = "sqlite:///./main.db"
     WORKFLOWS_DIR: str = "./workflows"
+    # Per-workflow SQLite engines kept open (LRU; evicted engines are disposed)
+    WORKFLOW_ENGINE_CACHE_SIZE: int = 64
+    WORKFLOW_DB_SYNCHRONOUS: str = "NORMAL"  # safe with WAL; FULL for extra durability
+    WORKFLOW_DB_BUSY_TIMEOUT_MS: int = 5000
+
+    # CSV import jobs
+    IMPORTS_DIR: str = "./imports"  # uploaded CSV files of unfinished jobs
+    CSV_IMPORT_CHUNK_SIZE: int = 500  # leads inserted per transaction
+    CSV_IMPORT_B24_BATCH_ROWS: int = 15  # leads per Bitrix24 `batch` call (<=3 commands each, limit 50)
+    CSV_IMPORT_B24_CONCURRENCY: int = 2  # parallel `batch` calls per job
+    CSV_EXPORT_CHUNK_SIZE: int = 1000  # leads per query when streaming the CSV export
+
+    # Bitrix24 contact lookup by phone
+    CONTACT_CACHE_TTL_SECONDS: int = 86400  # in-memory phone -> contact entries
+    CONTACT_CACHE_NEGATIVE_TTL_SECONDS: int = 300  # "no contact with this phone" entries
+    CONTACT_CACHE_MAX_ENTRIES: int = 100_000
+    CONTACT_INDEX_TTL_SECONDS: int = 7 * 86400  # contact_phone_index rows older than this are re-checked
+    CONTACT_INDEX_WARMUP_ON_STARTUP: bool = False  # scan contacts of every workflow portal at startup
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -1,13 +1,20 @@
 """Main FastAPI application entry point."""
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from src.backend.api.v1 import auth, b24_entities, leads, public, users, webhook, workflows
+from src.backend.api.v1.dependencies import get_admin_user
 from src.backend.core.config import settings
 from src.backend.core.database import init_main_db
 # Import models to ensure they are registered with SQLAlchemy
 from src.backend.models import user_workflow_access  # noqa: F401
+from src.backend.models.user import User
+from src.backend.services.bitrix24 import Bitrix24Service
+from src.backend.services.contact_index import contact_index_service
+from src.backend.services.database import database_service
+from src.backend.services.lead_import import lead_import_service
+from src.backend.services.lead_index import LeadIndexService
 from src.backend.utils.migrate_db import (
     migrate_workflow_api_token,
     migrate_workflow_app_token,
@@ -17,6 +24,7 @@ from src.backend.utils.migrate_db import (
     migrate_workflows_table,
     migrate_user_workflow_access,
     migrate_lead_deal_fields,
+    migrate_lead_import_fields,
 )
 
 app = FastAPI(
@@ -42,6 +50,37 @@ async def startup_event():
     migrate_user_workflow_access()
     migrate_workflow_webhook_url_nullable()
     migrate_lead_deal_fields()
+    migrate_lead_import_fields()
+
+    # Build the global lead index on first start
+    from src.backend.core.database import MainSessionLocal
+
+    index_db = MainSessionLocal()
+    try:
+        LeadIndexService.ensure_built(index_db)
+    finally:
+        index_db.close()
+
+    # Continue CSV imports interrupted by a restart
+    lead_import_service.resume_unfinished()
+
+    # Optionally fill the phone -> contact index of every portal in the background
+    if settings.CONTACT_INDEX_WARMUP_ON_STARTUP:
+        from src.backend.models.workflow import Workflow
+
+        warmup_db = MainSessionLocal()
+        try:
+            webhook_urls = {
+                row[0]
+                for row in warmup_db.query(Workflow.bitrix24_webhook_url).filter(
+                    Workflow.bitrix24_webhook_url.isnot(None)
+                )
+            }
+        finally:
+            warmup_db.close()
+        portals = {Bitrix24Service(url).portal: url for url in webhook_urls}
+        for webhook_url in portals.values():
+            contact_index_service.start_warm_up(Bitrix24Service(webhook_url))
 
     # Auto-create admin user if configured and not exists
     if settings.ADMIN_USERNAME and settings.ADMIN_PASSWORD:
@@ -57,6 +96,13 @@ async def startup_event():
         finally:
             db.close()
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled workflow database connections."""
+    database_service.dispose_all()
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -85,6 +131,18 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/api/v1/metrics/databases")
+async def database_metrics(admin_user: User = Depends(get_admin_user)):
+    """Workflow database engine cache counters (admin only)."""
+    return database_service.stats()
+
+
+@app.get("/api/v1/metrics/contacts")
+async def contact_index_metrics(admin_user: User = Depends(get_admin_user)):
+    """Phone -> contact cache and index counters (admin only)."""
+    return contact_index_service.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,6 +1,9 @@
 """Models package."""
+from src.backend.models.contact_phone_index import ContactPhoneIndex
+from src.backend.models.import_job import ImportJob, ImportJobStatus
 from src.backend.models.lead import Base as LeadBase, Lead
 from src.backend.models.lead_field import LeadField
+from src.backend.models.lead_index import LeadIndex
 from src.backend.models.user import User, UserRole
 from src.backend.models.workflow import Workflow
 from src.backend.models.workflow_field_mapping import WorkflowFieldMapping
@@ -8,12 +11,16 @@ from src.backend.models.user_workflow_access import user_workflow_access
 from src.backend.core.database import MainBase
 
 __all__ = [
+    "ContactPhoneIndex",
+    "ImportJob",
+    "ImportJobStatus",
     "User",
     "UserRole",
     "Workflow",
     "WorkflowFieldMapping",
     "Lead",
     "LeadField",
+    "LeadIndex",
     "MainBase",
     "LeadBase",
     "user_workflow_access",
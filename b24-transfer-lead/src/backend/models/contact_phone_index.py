@@ -0,0 +1,29 @@
+"""Bitrix24 contact phone index model for main database."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+
+from src.backend.core.database import MainBase
+
+
+class ContactPhoneIndex(MainBase):
+    """Maps a normalized phone to a Bitrix24 contact of a portal.
+
+    Filled from contacts found or created by the service and by the paged
+    contact scan, so contact lookup doesn't query the portal for known phones.
+    """
+
+    __tablename__ = "contact_phone_index"
+
+    id = Column(Integer, primary_key=True, index=True)
+    portal = Column(String, nullable=False, index=True)  # Bitrix24 portal domain
+    phone = Column(String, nullable=False)  # normalize_phone() result
+    contact_id = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("portal", "phone", name="uq_contact_phone_index_portal_phone"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ContactPhoneIndex(portal={self.portal}, phone={self.phone}, contact_id={self.contact_id})>"
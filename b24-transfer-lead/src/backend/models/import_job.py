@@ -0,0 +1,52 @@
+"""CSV import job model for main database."""
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from src.backend.core.database import MainBase
+
+
+class ImportJobStatus(str, Enum):
+    """Import job status enum."""
+
+    PENDING = "pending"  # created, waiting for the worker
+    INSERTING = "inserting"  # CSV rows are being saved to the workflow database
+    PUSHING = "pushing"  # saved leads are being created in Bitrix24
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+# Jobs in these states are resumed on startup
+UNFINISHED_IMPORT_STATUSES = (ImportJobStatus.PENDING, ImportJobStatus.INSERTING, ImportJobStatus.PUSHING)
+
+
+class ImportJob(MainBase):
+    """Background CSV import of leads into a workflow.
+
+    Progress lives here; the leads themselves carry import_job_id/import_row,
+    so an interrupted job resumes from the last saved row and pushes only
+    leads that have no Bitrix24 ID yet.
+    """
+
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    workflow_id = Column(Integer, ForeignKey("workflows.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String, nullable=False, default=ImportJobStatus.PENDING.value, index=True)
+    file_path = Column(String, nullable=False)  # uploaded CSV, removed when the job completes
+    file_name = Column(String, nullable=True)
+    column_mapping = Column(Text, nullable=True)  # JSON: CSV column -> field name
+    row_limit = Column(Integer, nullable=True)
+    total_rows = Column(Integer, nullable=False, default=0)
+    inserted_rows = Column(Integer, nullable=False, default=0)
+    pushed_rows = Column(Integer, nullable=False, default=0)
+    failed_rows = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ImportJob(id={self.id}, workflow_id={self.workflow_id}, status={self.status})>"
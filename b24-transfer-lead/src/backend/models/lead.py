@@ -23,6 +23,8 @@ class Lead(Base):
     deal_amount = Column(String, nullable=True)  # Сумма сделки (OPPORTUNITY)
     deal_status = Column(String, nullable=True)  # ID стадии сделки (STAGE_ID)
     deal_status_name = Column(String, nullable=True)  # Человекочитаемое название стадии сделки
+    import_job_id = Column(Integer, nullable=True, index=True)  # ImportJob, создавший лид (CSV-импорт)
+    import_row = Column(Integer, nullable=True)  # Номер строки CSV (с 0) внутри импорта
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -0,0 +1,26 @@
+"""Global lead index model for main database."""
+from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint
+
+from src.backend.core.database import MainBase
+
+
+class LeadIndex(MainBase):
+    """Maps a Bitrix24 entity ID to the workflow lead that stores it.
+
+    Lets webhook routing find a lead with one indexed lookup instead of
+    opening every matching workflow database.
+    """
+
+    __tablename__ = "lead_index"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bitrix24_entity_id = Column(String, nullable=False, index=True)  # Lead.bitrix24_lead_id (lead or deal ID)
+    workflow_id = Column(Integer, ForeignKey("workflows.id"), nullable=False, index=True)
+    lead_id = Column(Integer, nullable=False)  # Lead.id in the workflow database
+
+    __table_args__ = (
+        UniqueConstraint("workflow_id", "bitrix24_entity_id", name="uq_lead_index_workflow_entity"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<LeadIndex(bitrix24_entity_id={self.bitrix24_entity_id}, workflow_id={self.workflow_id}, lead_id={self.lead_id})>"
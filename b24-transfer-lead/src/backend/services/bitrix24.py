@@ -3,12 +3,17 @@ import logging
 from typing import Any
 
 from fast_bitrix24 import BitrixAsync
+from fast_bitrix24.utils import http_build_query
 
+from src.backend.services.contact_index import contact_index_service
 from src.backend.utils.cache import lead_statuses_cache
 from src.backend.utils.phone import format_phone_variants, normalize_phone
 
 logger = logging.getLogger(__name__)
 
+# Bitrix24 limit of commands in one `batch` call
+MAX_BATCH_COMMANDS = 50
+
 
 class Bitrix24Service:
     """Service for interacting with Bitrix24 REST API using fast-bitrix24."""
@@ -21,6 +26,8 @@ class Bitrix24Service:
         """
         # Ensure webhook URL ends with / for proper API calls
         self.webhook_url = webhook_url.rstrip("/") + "/"
+        # Contact cache/index key
+        self.portal = contact_index_service.portal_key(self.webhook_url)
 
     def _get_client(self) -> BitrixAsync:
         """Get Bitrix24 async client instance.
@@ -205,6 +212,7 @@ class Bitrix24Service:
         """
         # Search for existing contact by phone
         contact_id = await self.find_contact_by_phone(phone)
+        found_contact = contact_id is not None
         
         # Create contact if not found
         if contact_id is None:
@@ -224,7 +232,13 @@ class Bitrix24Service:
             fields.update(extra_fields)
 
         client = self._get_client()
-        result = await client.call("crm.lead.add", {"fields": fields})
+        try:
+            result = await client.call("crm.lead.add", {"fields": fields})
+        except Exception:
+            if found_contact:
+                # The contact may have been deleted or merged: search for it again next time
+                contact_index_service.forget(self.portal, [normalized_phone])
+            raise
         lead_id = int(result) if isinstance(result, (int, str)) else result.get("id", result)
         logger.info(f"Created lead in Bitrix24 with ID: {lead_id}, linked to contact {contact_id}")
         return lead_id
@@ -462,138 +476,85 @@ class Bitrix24Service:
 
     async def find_contact_by_phone(self, phone: str) -> int | None:
         """Find contact by phone number in Bitrix24.
-        
-        First normalizes the phone number, then generates all format variants,
-        and searches using batch requests for all variants simultaneously.
-        
+
+        The phone is normalized and resolved from the contact cache/index
+        first (no API call for known phones, including phones known to have
+        no contact). Otherwise one crm.duplicate.findbycomm call checks all
+        format variants and the result is cached.
+
         Args:
             phone: Phone number in any format
-            
+
         Returns:
             Contact ID if found, None otherwise
         """
-        import asyncio
-        
-        client = self._get_client()
-        
-        # Step 1: Normalize the phone number first
         normalized_search_phone = normalize_phone(phone)
-        
-        # Step 2: Generate all format variants from normalized phone
-        phone_variants = format_phone_variants(normalized_search_phone)
-        
+        known, contact_id = contact_index_service.lookup(self.portal, normalized_search_phone)
+        if known:
+            logger.debug(f"Contact for phone {normalized_search_phone} resolved from cache: {contact_id}")
+            return contact_id
+
+        client = self._get_client()
         logger.info(f"Searching contact by phone: {phone} (normalized: {normalized_search_phone})")
-        logger.debug(f"Phone variants to search: {phone_variants}")
-        
-        # Step 3: Create batch requests for all variants
-        async def search_variant(variant: str) -> list[dict]:
-            """Search for a single phone variant."""
-            try:
-                result = await client.get_all(
-                    "crm.contact.list",
-                    {
-                        "filter": {"PHONE": variant},
-                        "select": ["ID", "NAME", "LAST_NAME", "PHONE"],
-                    },
-                )
-                return result if result else []
-            except Exception as e:
-                logger.debug(f"Search failed for variant '{variant}': {e}")
-                return []
-        
-        # Execute all searches in parallel using asyncio.gather
-        logger.info(f"Executing batch search for {len(phone_variants)} phone variants...")
-        search_results = await asyncio.gather(*[search_variant(variant) for variant in phone_variants])
-        
-        # Process all results
-        all_found_contacts = []
-        for variant, results in zip(phone_variants, search_results):
-            logger.info(f"Search for '{variant}' returned {len(results)} contacts")
-            if results:
-                all_found_contacts.extend(results)
-        
-        # Remove duplicates by contact ID
-        seen_ids = set()
-        unique_contacts = []
-        for contact in all_found_contacts:
-            contact_id = contact.get("ID")
-            if contact_id and contact_id not in seen_ids:
-                seen_ids.add(contact_id)
-                unique_contacts.append(contact)
-        
-        logger.info(f"Found {len(unique_contacts)} unique contacts to verify")
-        
-        # Verify that contacts actually have the matching phone number
-        for contact in unique_contacts:
-            contact_id = contact.get("ID")
-            contact_phones = contact.get("PHONE", [])
-            
-            logger.debug(f"Checking contact {contact_id} with phones: {contact_phones}")
-            
-            # Check if any phone in contact matches our normalized search phone
-            for contact_phone in contact_phones:
-                if isinstance(contact_phone, dict):
-                    phone_value = contact_phone.get("VALUE", "")
-                else:
-                    phone_value = str(contact_phone)
-                
-                # Normalize both for comparison
-                normalized_contact_phone = normalize_phone(phone_value)
-                
-                logger.debug(f"Comparing: search={normalized_search_phone}, contact={normalized_contact_phone} (from '{phone_value}')")
-                
-                if normalized_contact_phone == normalized_search_phone:
-                    logger.info(f"✓ Found matching contact {contact_id} by phone {phone} (normalized: {normalized_search_phone})")
-                    return int(contact_id)
-        
-        # If batch search didn't work, try local filtering as fallback
-        logger.info("Batch search didn't find matching contact, trying local filtering approach...")
         try:
-            # Get contacts and filter locally
-            all_contacts = await client.get_all(
-                "crm.contact.list",
+            result = await client.call(
+                "crm.duplicate.findbycomm",
                 {
-                    "select": ["ID", "NAME", "LAST_NAME", "PHONE"],
+                    "entity_type": "CONTACT",
+                    "type": "PHONE",
+                    "values": format_phone_variants(normalized_search_phone)[:20],  # API limit: 20 values
                 },
             )
-            
-            logger.info(f"Fetched {len(all_contacts) if all_contacts else 0} contacts for local filtering")
-            
-            if all_contacts:
-                # Filter contacts locally by comparing normalized phone numbers
-                checked_count = 0
-                for contact in all_contacts:
-                    contact_id = contact.get("ID")
-                    contact_phones = contact.get("PHONE", [])
-                    
-                    if not contact_phones:
-                        continue
-                    
-                    checked_count += 1
-                    if checked_count <= 10:  # Log first 10 contacts for debugging
-                        logger.debug(f"Checking contact {contact_id} with phones: {contact_phones}")
-                    
-                    # Check if any phone in contact matches our search phone
-                    for contact_phone in contact_phones:
-                        if isinstance(contact_phone, dict):
-                            phone_value = contact_phone.get("VALUE", "")
-                        else:
-                            phone_value = str(contact_phone)
-                        
-                        # Normalize both for comparison
-                        normalized_contact_phone = normalize_phone(phone_value)
-                        
-                        if normalized_contact_phone == normalized_search_phone:
-                            logger.info(f"✓ Found matching contact {contact_id} by phone {phone} (local filtering, checked {checked_count} contacts)")
-                            return int(contact_id)
-                
-                logger.info(f"Checked {checked_count} contacts locally, no match found")
         except Exception as e:
-            logger.warning(f"Local filtering approach failed: {e}")
-        
+            # Not cached: the next lead with this phone retries the search
+            logger.warning(f"Contact search failed for phone {phone}: {e}")
+            return None
+
+        contact_ids = result.get("CONTACT") if isinstance(result, dict) else None
+        if contact_ids:
+            contact_id = min(int(contact_id) for contact_id in contact_ids)
+            contact_index_service.remember(self.portal, {normalized_search_phone: contact_id})
+            logger.info(f"✓ Found matching contact {contact_id} by phone {phone} (normalized: {normalized_search_phone})")
+            return contact_id
+
+        contact_index_service.remember_missing(self.portal, [normalized_search_phone])
         logger.info(f"✗ Contact not found by phone: {phone} (normalized: {normalized_search_phone})")
         return None
 
+    async def list_contact_phones(self, after_id: int = 0) -> list[tuple[int, list[str]]]:
+        """Get one page (up to 50) of contacts with ID > after_id and their normalized phones.
+
+        Uses ID-ordered paging without counting (start=-1), which stays fast on large portals.
+
+        Args:
+            after_id: Last contact ID of the previous page
+
+        Returns:
+            (contact ID, normalized phones) pairs ordered by ID; empty when there are no more contacts
+        """
+        client = self._get_client()
+        response = await client.call(
+            "crm.contact.list",
+            {
+                "order": {"ID": "ASC"},
+                "filter": {">ID": after_id},
+                "select": ["ID", "PHONE"],
+                "start": -1,
+            },
+            raw=True,
+        )
+        contacts = response.get("result") if isinstance(response, dict) else None
+        page = []
+        for contact in contacts or []:
+            phones = []
+            for contact_phone in contact.get("PHONE") or []:
+                phone_value = contact_phone.get("VALUE", "") if isinstance(contact_phone, dict) else str(contact_phone)
+                normalized = normalize_phone(phone_value)
+                if normalized:
+                    phones.append(normalized)
+            page.append((int(contact["ID"]), phones))
+        return page
+
     async def create_contact(self, name: str, phone: str) -> int:
         """Create a contact in Bitrix24.
 
@@ -623,6 +584,7 @@ class Bitrix24Service:
         result = await client.call("crm.contact.add", {"fields": fields})
         contact_id = int(result) if isinstance(result, (int, str)) else result.get("id", result)
         logger.info(f"Created contact in Bitrix24 with ID: {contact_id}")
+        contact_index_service.remember(self.portal, {normalized_phone: int(contact_id)})
         return contact_id
 
     async def add_contact_to_deal(self, deal_id: int, contact_id: int) -> bool:
@@ -668,6 +630,7 @@ class Bitrix24Service:
         """
         # Search for existing contact by phone
         contact_id = await self.find_contact_by_phone(phone)
+        found_contact = contact_id is not None
         
         # Create contact if not found
         if contact_id is None:
@@ -690,7 +653,202 @@ class Bitrix24Service:
         logger.info(f"Created deal in Bitrix24 with ID: {deal_id}")
         
         # Add contact to deal
-        await self.add_contact_to_deal(deal_id, contact_id)
+        try:
+            await self.add_contact_to_deal(deal_id, contact_id)
+        except Exception:
+            if found_contact:
+                # The contact may have been deleted or merged: search for it again next time
+                contact_index_service.forget(self.portal, [normalize_phone(phone)])
+            raise
         
         return deal_id
 
+    async def _call_batch(self, client: BitrixAsync, commands: dict[str, str]) -> tuple[dict, dict]:
+        """Run up to MAX_BATCH_COMMANDS commands in one `batch` call without halting on errors.
+
+        Args:
+            client: Bitrix24 client
+            commands: Command key -> "method?query" (may reference $result[key] of earlier commands)
+
+        Returns:
+            (results, errors) dicts keyed by command key
+        """
+        response = await client.call("batch", {"halt": 0, "cmd": commands}, raw=True)
+        payload = response.get("result") if isinstance(response, dict) else None
+        if not isinstance(payload, dict):
+            raise ValueError(f"Unexpected batch response: {response}")
+        results = payload.get("result") or {}
+        errors = payload.get("result_error") or {}
+        # Bitrix24 (PHP) returns [] instead of {} for empty maps
+        return (results if isinstance(results, dict) else {}), (errors if isinstance(errors, dict) else {})
+
+    async def find_contacts_by_phones(self, phones: list[str], client: BitrixAsync | None = None) -> dict[str, int]:
+        """Find contacts for many phones with crm.duplicate.findbycomm in `batch` calls.
+
+        Phones known to the contact cache/index are not sent to Bitrix24.
+
+        Args:
+            phones: Phone numbers in any format
+            client: Optional client to reuse
+
+        Returns:
+            Normalized phone -> contact ID for phones that have a contact
+        """
+        known, normalized = contact_index_service.lookup_many(
+            self.portal, [normalize_phone(phone) for phone in phones if phone]
+        )
+        found: dict[str, int] = {phone: contact_id for phone, contact_id in known.items() if contact_id}
+        if not normalized:
+            return found
+        client = client or self._get_client()
+        searched: dict[str, int] = {}
+        not_found: list[str] = []
+
+        for offset in range(0, len(normalized), MAX_BATCH_COMMANDS):
+            chunk = normalized[offset:offset + MAX_BATCH_COMMANDS]
+            commands = {
+                f"p{i}": "crm.duplicate.findbycomm?" + http_build_query({
+                    "entity_type": "CONTACT",
+                    "type": "PHONE",
+                    "values": format_phone_variants(phone)[:20],  # API limit: 20 values
+                })
+                for i, phone in enumerate(chunk)
+            }
+            results, errors = await self._call_batch(client, commands)
+            for i, phone in enumerate(chunk):
+                result = results.get(f"p{i}")
+                contact_ids = result.get("CONTACT") if isinstance(result, dict) else None
+                if contact_ids:
+                    searched[phone] = int(min(int(contact_id) for contact_id in contact_ids))
+                elif f"p{i}" in errors:
+                    logger.warning(f"Contact search failed for phone {phone}: {errors[f'p{i}']}")
+                else:
+                    not_found.append(phone)
+
+        contact_index_service.remember(self.portal, searched)
+        contact_index_service.remember_missing(self.portal, not_found)
+        logger.info(
+            f"Batch contact search: {len(searched)} of {len(normalized)} phones matched "
+            f"({len(known)} resolved from cache)"
+        )
+        found.update(searched)
+        return found
+
+    async def create_entities_batch(
+        self,
+        entity_type: str,
+        items: list[dict[str, Any]],
+        status_id: str = "NEW",
+        category_id: int = 0,
+        stage_id: str = "NEW",
+    ) -> list[tuple[int | None, str | None]]:
+        """Create many leads or deals (with contact search/creation) through `batch` calls.
+
+        Same result as create_lead()/create_deal() per item, but contacts are looked
+        up for all items at once and every item takes 1-3 commands of a shared batch.
+
+        Args:
+            entity_type: "lead" or "deal"
+            items: Dicts with name, phone and optional extra_fields
+            status_id: Lead status ID (leads)
+            category_id: Funnel ID (deals)
+            stage_id: Stage ID (deals)
+
+        Returns:
+            (entity ID, None) or (None, error) for every item, in order
+        """
+        client = self._get_client()
+        contacts = await self.find_contacts_by_phones([item["phone"] for item in items], client=client)
+
+        # Commands of one item always go to the same batch ($result references)
+        item_commands: list[list[tuple[str, str]]] = []
+        for i, item in enumerate(items):
+            name = item["name"]
+            normalized_phone = normalize_phone(item["phone"])
+            extra_fields = item.get("extra_fields") or {}
+            commands: list[tuple[str, str]] = []
+
+            contact_id = contacts.get(normalized_phone)
+            if contact_id is None:
+                phone_for_bitrix = f"+{normalized_phone}" if not normalized_phone.startswith("+") else normalized_phone
+                name_parts = name.strip().split(maxsplit=1)
+                contact_fields = {
+                    "NAME": name_parts[0] if name_parts else name,
+                    "LAST_NAME": name_parts[1] if len(name_parts) > 1 else "",
+                    "PHONE": [{"VALUE": phone_for_bitrix, "VALUE_TYPE": "WORK"}],
+                }
+                commands.append((f"c{i}", "crm.contact.add?" + http_build_query({"fields": contact_fields})))
+                contact_ref = f"$result[c{i}]"
+            else:
+                contact_ref = str(contact_id)
+
+            if entity_type == "deal":
+                fields = {"TITLE": name, "CATEGORY_ID": category_id, "STAGE_ID": stage_id, **extra_fields}
+                commands.append((f"e{i}", "crm.deal.add?" + http_build_query({"fields": fields})))
+                commands.append((
+                    f"l{i}",
+                    f"crm.deal.contact.add?id=$result[e{i}]&fields[CONTACT_ID]={contact_ref}&fields[IS_PRIMARY]=Y",
+                ))
+            else:
+                fields = {
+                    "TITLE": name,
+                    "NAME": name,
+                    "STATUS_ID": status_id,
+                    "PHONE": [{"VALUE": normalized_phone, "VALUE_TYPE": "WORK"}],
+                    **extra_fields,
+                }
+                commands.append((
+                    f"e{i}",
+                    "crm.lead.add?" + http_build_query({"fields": fields}) + f"fields[CONTACT_ID]={contact_ref}",
+                ))
+            item_commands.append(commands)
+
+        outcome: list[tuple[int | None, str | None]] = [(None, "not sent")] * len(items)
+        pending: list[int] = []
+        pending_size = 0
+
+        async def flush():
+            commands = {key: command for index in pending for key, command in item_commands[index]}
+            try:
+                results, errors = await self._call_batch(client, commands)
+            except Exception as e:
+                logger.error(f"Batch creation of {len(pending)} {entity_type}s failed: {e}")
+                for index in pending:
+                    outcome[index] = (None, str(e))
+                return
+            # Contacts created in this batch are known from now on
+            created_contacts = {
+                normalize_phone(items[index]["phone"]): int(results[f"c{index}"])
+                for index in pending
+                if results.get(f"c{index}")
+            }
+            contact_index_service.remember(self.portal, created_contacts)
+            # A found contact the lead or the deal link was rejected for may be deleted or merged
+            stale_phones = [
+                normalize_phone(items[index]["phone"])
+                for index in pending
+                if f"c{index}" not in results
+                and f"c{index}" not in errors
+                and (f"e{index}" in errors or f"l{index}" in errors)
+            ]
+            contact_index_service.forget(self.portal, stale_phones)
+            for index in pending:
+                entity_id = results.get(f"e{index}")
+                if entity_id:
+                    outcome[index] = (int(entity_id), None)
+                else:
+                    error = errors.get(f"e{index}") or errors.get(f"c{index}") or "no result"
+                    outcome[index] = (None, str(error))
+
+        for index, commands in enumerate(item_commands):
+            if pending_size + len(commands) > MAX_BATCH_COMMANDS:
+                await flush()
+                pending, pending_size = [], 0
+            pending.append(index)
+            pending_size += len(commands)
+        if pending:
+            await flush()
+
+        created = sum(1 for entity_id, _ in outcome if entity_id)
+        logger.info(f"Batch created {created} of {len(items)} {entity_type}s in Bitrix24")
+        return outcome
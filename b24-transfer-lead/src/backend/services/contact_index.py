@@ -0,0 +1,228 @@
+"""Phone -> Bitrix24 contact resolution cache and index."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from src.backend.core.config import settings
+from src.backend.core.database import MainSessionLocal
+from src.backend.models.contact_phone_index import ContactPhoneIndex
+from src.backend.utils.bitrix24_url import extract_domain_from_webhook_url
+from src.backend.utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    from src.backend.services.bitrix24 import Bitrix24Service
+
+logger = logging.getLogger(__name__)
+
+# Max phones per IN (...) clause
+_CHUNK_SIZE = 500
+
+
+class ContactIndexService:
+    """Resolves normalized phones to Bitrix24 contact IDs without asking the portal.
+
+    Two layers, both keyed by portal domain:
+    - an in-memory TTLCache (CONTACT_CACHE_TTL_SECONDS) that also keeps
+      negative results ("no contact with this phone") for
+      CONTACT_CACHE_NEGATIVE_TTL_SECONDS, so repeated misses are cheap;
+    - the contact_phone_index table in the main database, filled from
+      contacts the service finds or creates and by the paged contact scan
+      (warm_up). Rows older than CONTACT_INDEX_TTL_SECONDS are ignored, so
+      the portal is asked again for them.
+    """
+
+    # Cache value for "no contact" (TTLCache returns None for a missing key)
+    _NOT_FOUND = 0
+
+    def __init__(self):
+        """Initialize contact index service."""
+        self._cache = TTLCache(
+            default_ttl=settings.CONTACT_CACHE_TTL_SECONDS,
+            max_size=settings.CONTACT_CACHE_MAX_ENTRIES,
+        )
+        self._warm_up_tasks: dict[str, asyncio.Task] = {}
+        self.cache_hits = 0
+        self.index_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def portal_key(webhook_url: str) -> str:
+        """Portal domain of a webhook URL (the URL itself if it can't be parsed)."""
+        try:
+            return extract_domain_from_webhook_url(webhook_url)
+        except ValueError:
+            return webhook_url
+
+    def lookup_many(self, portal: str, phones: list[str]) -> tuple[dict[str, int | None], list[str]]:
+        """Resolve normalized phones from the cache and the index.
+
+        Args:
+            portal: Portal key (see portal_key)
+            phones: Normalized phones
+
+        Returns:
+            (known phones -> contact ID or None when known to have no contact, phones to ask Bitrix24 about)
+        """
+        known: dict[str, int | None] = {}
+        missing: list[str] = []
+        for phone in dict.fromkeys(phones):
+            cached = self._cache.get(f"{portal}:{phone}")
+            if cached is None:
+                missing.append(phone)
+            else:
+                self.cache_hits += 1
+                known[phone] = cached or None
+
+        if missing:
+            fresh_after = datetime.utcnow() - timedelta(seconds=settings.CONTACT_INDEX_TTL_SECONDS)
+            db = MainSessionLocal()
+            try:
+                for offset in range(0, len(missing), _CHUNK_SIZE):
+                    chunk = missing[offset:offset + _CHUNK_SIZE]
+                    for phone, contact_id in db.query(ContactPhoneIndex.phone, ContactPhoneIndex.contact_id).filter(
+                        ContactPhoneIndex.portal == portal,
+                        ContactPhoneIndex.phone.in_(chunk),
+                        ContactPhoneIndex.updated_at >= fresh_after,
+                    ):
+                        known[phone] = contact_id
+                        self._cache.set(f"{portal}:{phone}", contact_id)
+            finally:
+                db.close()
+            self.index_hits += sum(1 for phone in missing if phone in known)
+            missing = [phone for phone in missing if phone not in known]
+
+        self.misses += len(missing)
+        return known, missing
+
+    def lookup(self, portal: str, phone: str) -> tuple[bool, int | None]:
+        """Resolve one normalized phone; returns (known, contact ID or None)."""
+        known, _ = self.lookup_many(portal, [phone])
+        return phone in known, known.get(phone)
+
+    def remember(self, portal: str, contacts: dict[str, int], scan_started: datetime | None = None) -> None:
+        """Store phone -> contact ID pairs in the cache and the index (replacing older IDs).
+
+        Args:
+            portal: Portal key (see portal_key)
+            contacts: Normalized phone -> contact ID
+            scan_started: Start of the warm_up scan storing these pairs. Rows
+                already stored by the same scan keep their ID when it is lower,
+                so the lowest contact ID wins across scan pages.
+        """
+        if not contacts:
+            return
+
+        now = datetime.utcnow()
+        db = MainSessionLocal()
+        try:
+            phones = list(contacts)
+            for offset in range(0, len(phones), _CHUNK_SIZE):
+                chunk = phones[offset:offset + _CHUNK_SIZE]
+                existing = {
+                    row.phone: row
+                    for row in db.query(ContactPhoneIndex).filter(
+                        ContactPhoneIndex.portal == portal,
+                        ContactPhoneIndex.phone.in_(chunk),
+                    )
+                }
+                for phone in chunk:
+                    contact_id = contacts[phone]
+                    row = existing.get(phone)
+                    if row is None:
+                        db.add(ContactPhoneIndex(portal=portal, phone=phone, contact_id=contact_id, updated_at=now))
+                    elif scan_started is not None and row.updated_at >= scan_started and row.contact_id < contact_id:
+                        contact_id = row.contact_id
+                    else:
+                        row.contact_id = contact_id
+                        row.updated_at = now
+                    self._cache.set(f"{portal}:{phone}", contact_id)
+            db.commit()
+        finally:
+            db.close()
+
+    def forget(self, portal: str, phones: list[str]) -> None:
+        """Drop phones from the cache and the index (their contact ID turned out to be stale)."""
+        if not phones:
+            return
+        for phone in phones:
+            self._cache.remove(f"{portal}:{phone}")
+
+        db = MainSessionLocal()
+        try:
+            for offset in range(0, len(phones), _CHUNK_SIZE):
+                chunk = phones[offset:offset + _CHUNK_SIZE]
+                db.query(ContactPhoneIndex).filter(
+                    ContactPhoneIndex.portal == portal,
+                    ContactPhoneIndex.phone.in_(chunk),
+                ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        logger.info(f"Dropped {len(phones)} stale phones from the contact index of {portal}")
+
+    def remember_missing(self, portal: str, phones: list[str]) -> None:
+        """Cache "no contact with this phone" for CONTACT_CACHE_NEGATIVE_TTL_SECONDS."""
+        for phone in phones:
+            self._cache.set(f"{portal}:{phone}", self._NOT_FOUND, ttl=settings.CONTACT_CACHE_NEGATIVE_TTL_SECONDS)
+
+    async def warm_up(self, bitrix_service: "Bitrix24Service") -> int:
+        """Index phones of every contact of the portal with a paged scan (50 contacts per call).
+
+        Returns:
+            Number of indexed phones
+        """
+        portal = bitrix_service.portal
+        scan_started = datetime.utcnow()
+        total = 0
+        after_id = 0
+        while True:
+            page = await bitrix_service.list_contact_phones(after_id)
+            if not page:
+                break
+            contacts: dict[str, int] = {}
+            for contact_id, phones in page:
+                for phone in phones:
+                    # Lowest contact ID wins, as in crm.duplicate.findbycomm lookups
+                    # (within the page here, across pages in remember)
+                    contacts.setdefault(phone, contact_id)
+            self.remember(portal, contacts, scan_started=scan_started)
+            total += len(contacts)
+            after_id = page[-1][0]
+        logger.info(f"Contact index for {portal} warmed up: {total} phones")
+        return total
+
+    def start_warm_up(self, bitrix_service: "Bitrix24Service") -> asyncio.Task:
+        """Run warm_up in the background (one scan per portal at a time)."""
+        portal = bitrix_service.portal
+        task = self._warm_up_tasks.get(portal)
+        if task is None or task.done():
+            task = asyncio.create_task(self._warm_up_safe(bitrix_service))
+            self._warm_up_tasks[portal] = task
+        return task
+
+    async def _warm_up_safe(self, bitrix_service: "Bitrix24Service") -> None:
+        try:
+            await self.warm_up(bitrix_service)
+        except Exception as e:
+            logger.warning(f"Contact index warm-up for {bitrix_service.portal} failed: {e}")
+
+    def stats(self) -> dict:
+        """Lookup counters and cache size."""
+        db = MainSessionLocal()
+        try:
+            indexed = db.query(ContactPhoneIndex.id).count()
+        finally:
+            db.close()
+        return {
+            "cache_entries": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "index_hits": self.index_hits,
+            "misses": self.misses,
+            "indexed_phones": indexed,
+            "warming_up": sorted(portal for portal, task in self._warm_up_tasks.items() if not task.done()),
+        }
+
+
+# Global instance
+contact_index_service = ContactIndexService()
@@ -1,22 +1,48 @@
 """Database service for managing workflow databases."""
+import logging
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.backend.core.config import settings
 from src.backend.models.lead import Base as LeadBase
 
+logger = logging.getLogger(__name__)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply WAL journal and sync pragmas to every new workflow DB connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.WORKFLOW_DB_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.WORKFLOW_DB_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
 
 class DatabaseService:
-    """Service for managing workflow databases."""
+    """Service for managing workflow databases.
+
+    Engines and session factories are cached per workflow in a bounded LRU
+    (WORKFLOW_ENGINE_CACHE_SIZE); the least recently used engine is disposed
+    when the cache is full, so connection pools don't pile up.
+    """
 
-    def __init__(self):
+    def __init__(self, max_engines: int | None = None):
         """Initialize database service."""
         self.workflows_dir = Path(settings.WORKFLOWS_DIR)
         self.workflows_dir.mkdir(parents=True, exist_ok=True)
+        self.max_engines = max_engines or settings.WORKFLOW_ENGINE_CACHE_SIZE
+        self._engines: OrderedDict[int, tuple[Engine, sessionmaker]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def get_workflow_db_path(self, workflow_id: int) -> Path:
         """Get path to workflow database file."""
@@ -24,11 +50,36 @@ class DatabaseService:
         workflow_dir.mkdir(parents=True, exist_ok=True)
         return workflow_dir / "database.db"
 
-    def get_workflow_engine(self, workflow_id: int):
+    def _get_cached(self, workflow_id: int) -> tuple[Engine, sessionmaker]:
+        """Return (engine, session factory) for the workflow, creating them on first use."""
+        with self._lock:
+            cached = self._engines.get(workflow_id)
+            if cached is not None:
+                self._engines.move_to_end(workflow_id)
+                self.hits += 1
+                return cached
+
+            self.misses += 1
+            db_path = self.get_workflow_db_path(workflow_id)
+            engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+            event.listen(engine, "connect", _set_sqlite_pragmas)
+            session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            self._engines[workflow_id] = (engine, session_factory)
+
+            evicted = []
+            while len(self._engines) > self.max_engines:
+                _, (old_engine, _) = self._engines.popitem(last=False)
+                evicted.append(old_engine)
+                self.evictions += 1
+
+        for old_engine in evicted:
+            # Checked-out connections stay usable and are closed when returned
+            old_engine.dispose()
+        return engine, session_factory
+
+    def get_workflow_engine(self, workflow_id: int) -> Engine:
         """Get SQLAlchemy engine for workflow database."""
-        db_path = self.get_workflow_db_path(workflow_id)
-        db_url = f"sqlite:///{db_path}"
-        return create_engine(db_url, connect_args={"check_same_thread": False})
+        return self._get_cached(workflow_id)[0]
 
     def init_workflow_db(self, workflow_id: int):
         """Initialize workflow database tables."""
@@ -38,24 +89,54 @@ class DatabaseService:
 
     def get_workflow_session(self, workflow_id: int) -> Generator[Session, None, None]:
         """Get database session for workflow."""
-        engine = self.get_workflow_engine(workflow_id)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        SessionLocal = self._get_cached(workflow_id)[1]
         db = SessionLocal()
         try:
             yield db
         finally:
             db.close()
 
+    def dispose_workflow_engine(self, workflow_id: int) -> None:
+        """Drop the cached engine of a workflow and close its pooled connections."""
+        with self._lock:
+            cached = self._engines.pop(workflow_id, None)
+        if cached is not None:
+            cached[0].dispose()
+
+    def dispose_all(self) -> None:
+        """Dispose every cached engine (application shutdown)."""
+        with self._lock:
+            engines = [engine for engine, _ in self._engines.values()]
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+
     def delete_workflow_db(self, workflow_id: int):
         """Delete workflow database."""
-        db_path = self.get_workflow_db_path(workflow_id)
-        if db_path.exists():
-            os.remove(db_path)
+        self.dispose_workflow_engine(workflow_id)
+        db_path = self.workflows_dir / str(workflow_id) / "database.db"
+        for path in (db_path, db_path.with_name("database.db-wal"), db_path.with_name("database.db-shm")):
+            if path.exists():
+                os.remove(path)
         workflow_dir = db_path.parent
         if workflow_dir.exists() and not any(workflow_dir.iterdir()):
             workflow_dir.rmdir()
 
+    def stats(self) -> dict:
+        """Engine cache counters and per-workflow pool usage."""
+        with self._lock:
+            engines = list(self._engines.items())
+        return {
+            "open_engines": len(engines),
+            "max_engines": self.max_engines,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "checked_out_connections": {
+                workflow_id: engine.pool.checkedout() for workflow_id, (engine, _) in engines
+            },
+        }
+
 
 # Global instance
 database_service = DatabaseService()
-
@@ -0,0 +1,392 @@
+"""Background CSV import of leads with batched Bitrix24 creation."""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from src.backend.core.config import settings
+from src.backend.core.database import MainSessionLocal
+from src.backend.models.import_job import UNFINISHED_IMPORT_STATUSES, ImportJob, ImportJobStatus
+from src.backend.models.lead import Lead
+from src.backend.models.lead_field import LeadField
+from src.backend.models.user import User
+from src.backend.models.workflow import Workflow
+from src.backend.models.workflow_field_mapping import WorkflowFieldMapping
+from src.backend.services.bitrix24 import Bitrix24Service
+from src.backend.services.database import database_service
+from src.backend.services.lead_index import LeadIndexService
+from src.backend.utils.csv_parser import iter_csv_leads
+from src.backend.utils.lead_fields import prepare_extra_fields
+
+logger = logging.getLogger(__name__)
+
+
+def _open_csv(file_path: str):
+    """Open a stored CSV file for streaming through iter_csv_leads."""
+    return open(file_path, encoding="utf-8", newline="")
+
+
+def _update_job(job_id: int, values: dict[Any, Any]) -> None:
+    """Update job columns in a short main database transaction.
+
+    Values may be SQL expressions (e.g. ImportJob.pushed_rows + 10), so
+    concurrent workers increment counters without lost updates.
+    """
+    db = MainSessionLocal()
+    try:
+        db.query(ImportJob).filter(ImportJob.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _get_field_mapping(db: Session, workflow: Workflow) -> dict[str, str]:
+    """Field name -> Bitrix24 field ID for the workflow entity type."""
+    mappings = db.query(WorkflowFieldMapping).filter(
+        WorkflowFieldMapping.workflow_id == workflow.id,
+        WorkflowFieldMapping.entity_type == workflow.entity_type,
+    ).all()
+    return {mapping.field_name: mapping.bitrix24_field_id for mapping in mappings}
+
+
+class LeadImportService:
+    """Runs CSV imports as resumable background jobs.
+
+    A job goes through two phases:
+    1. inserting - CSV rows are streamed from the stored file and saved in
+       chunks of CSV_IMPORT_CHUNK_SIZE (one transaction per chunk); every lead
+       keeps import_job_id/import_row, so a restart continues after the last
+       saved row.
+    2. pushing - leads of the job without a Bitrix24 ID are created in
+       Bitrix24 through `batch` calls of CSV_IMPORT_B24_BATCH_ROWS leads, with
+       CSV_IMPORT_B24_CONCURRENCY calls in flight.
+
+    Unfinished jobs are resumed on startup; the uploaded file is removed when
+    the job completes.
+    """
+
+    def __init__(self):
+        """Initialize import service."""
+        self.imports_dir = Path(settings.IMPORTS_DIR)
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def create_job(
+        self,
+        db: Session,
+        workflow: Workflow,
+        user: User | None,
+        content: bytes,
+        file_name: str | None,
+        column_mapping: dict[str, str] | None,
+        row_limit: int | None,
+    ) -> ImportJob:
+        """Store an uploaded CSV file and register an import job for it.
+
+        The whole file is validated (streamed, not loaded into memory) before
+        the job is created, so a bad row rejects the upload as before.
+
+        Raises:
+            ValueError: If the CSV is not valid UTF-8, misses required fields or has no leads
+        """
+        self.imports_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.imports_dir / f"{uuid.uuid4().hex}.csv"
+        file_path.write_bytes(content)
+
+        try:
+            with _open_csv(str(file_path)) as f:
+                total_rows = sum(1 for _ in islice(iter_csv_leads(f, column_mapping), row_limit))
+            if total_rows == 0:
+                raise ValueError("No leads found in CSV file")
+        except Exception:
+            os.remove(file_path)
+            raise
+
+        job = ImportJob(
+            workflow_id=workflow.id,
+            user_id=user.id if user else None,
+            status=ImportJobStatus.PENDING.value,
+            file_path=str(file_path),
+            file_name=file_name,
+            column_mapping=json.dumps(column_mapping, ensure_ascii=False) if column_mapping else None,
+            row_limit=row_limit,
+            total_rows=total_rows,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        logger.info(f"Import job {job.id}: {total_rows} rows queued for workflow {workflow.id}")
+        return job
+
+    def start(self, job_id: int) -> asyncio.Task:
+        """Run the job in the background (no-op if it is already running)."""
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self.run(job_id))
+            self._tasks[job_id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        return task
+
+    def is_running(self, job_id: int) -> bool:
+        """Check whether the job has a live background task."""
+        task = self._tasks.get(job_id)
+        return task is not None and not task.done()
+
+    def resume_unfinished(self) -> int:
+        """Restart jobs interrupted by a shutdown or crash.
+
+        Returns:
+            Number of resumed jobs
+        """
+        db = MainSessionLocal()
+        try:
+            job_ids = [
+                row[0]
+                for row in db.query(ImportJob.id).filter(
+                    ImportJob.status.in_([s.value for s in UNFINISHED_IMPORT_STATUSES])
+                )
+            ]
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self.start(job_id)
+        if job_ids:
+            logger.info(f"Resumed {len(job_ids)} unfinished import jobs")
+        return len(job_ids)
+
+    async def run(self, job_id: int) -> None:
+        """Run (or continue) an import job until it completes or fails."""
+        db = MainSessionLocal()
+        try:
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            if not job:
+                logger.warning(f"Import job {job_id} not found")
+                return
+            workflow = db.query(Workflow).filter(Workflow.id == job.workflow_id).first()
+            if not workflow:
+                _update_job(job_id, {
+                    ImportJob.status: ImportJobStatus.FAILED.value,
+                    ImportJob.error: "Workflow not found",
+                    ImportJob.finished_at: datetime.utcnow(),
+                })
+                return
+            field_mapping = _get_field_mapping(db, workflow)
+            column_mapping = json.loads(job.column_mapping) if job.column_mapping else None
+            file_path, row_limit, total_rows = job.file_path, job.row_limit, job.total_rows
+            db.expunge(workflow)
+        finally:
+            db.close()
+
+        try:
+            _update_job(job_id, {ImportJob.status: ImportJobStatus.INSERTING.value, ImportJob.error: None})
+            await asyncio.to_thread(
+                self._insert_rows,
+                job_id, workflow.id, file_path, column_mapping, row_limit, total_rows, field_mapping,
+            )
+
+            _update_job(job_id, {ImportJob.status: ImportJobStatus.PUSHING.value})
+            await self._push_leads(job_id, workflow, field_mapping)
+        except Exception as e:
+            logger.exception(f"Import job {job_id} failed")
+            # The stored file is kept, so the job can be resumed
+            _update_job(job_id, {
+                ImportJob.status: ImportJobStatus.FAILED.value,
+                ImportJob.error: str(e),
+                ImportJob.finished_at: datetime.utcnow(),
+            })
+            return
+
+        _update_job(job_id, {
+            ImportJob.status: ImportJobStatus.COMPLETED.value,
+            ImportJob.finished_at: datetime.utcnow(),
+        })
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        logger.info(f"Import job {job_id} completed")
+
+    def _insert_rows(
+        self,
+        job_id: int,
+        workflow_id: int,
+        file_path: str,
+        column_mapping: dict[str, str] | None,
+        row_limit: int | None,
+        total_rows: int,
+        field_mapping: dict[str, str],
+    ) -> None:
+        """Save CSV rows as leads in chunks, continuing after the last saved row (runs in a thread)."""
+        workflow_db = next(database_service.get_workflow_session(workflow_id))
+        try:
+            last_row = workflow_db.query(func.max(Lead.import_row)).filter(Lead.import_job_id == job_id).scalar()
+            next_row = 0 if last_row is None else last_row + 1
+            _update_job(job_id, {ImportJob.inserted_rows: next_row})
+            if next_row >= total_rows:
+                # All rows are saved; the file may already be gone (retry of a completed job)
+                return
+
+            chunk_size = settings.CSV_IMPORT_CHUNK_SIZE
+            with _open_csv(file_path) as f:
+                rows = islice(enumerate(iter_csv_leads(f, column_mapping)), next_row, row_limit)
+                while chunk := list(islice(rows, chunk_size)):
+                    leads: list[Lead] = []
+                    fields_per_lead: list[list[tuple[str, str]]] = []
+                    for row_index, lead_data in chunk:
+                        extra_fields_data = {k: v for k, v in lead_data.items() if k not in ["name", "phone"]}
+                        _, lead_fields_to_save = prepare_extra_fields(extra_fields_data, field_mapping)
+                        leads.append(Lead(
+                            phone=lead_data.get("phone", ""),
+                            name=lead_data.get("name", ""),
+                            status="NEW",
+                            import_job_id=job_id,
+                            import_row=row_index,
+                        ))
+                        fields_per_lead.append(lead_fields_to_save)
+
+                    # One flush assigns all lead IDs (multi-row INSERT ... RETURNING)
+                    workflow_db.add_all(leads)
+                    workflow_db.flush()
+                    workflow_db.add_all(
+                        LeadField(lead_id=lead.id, field_name=field_name, field_value=field_value)
+                        for lead, lead_fields in zip(leads, fields_per_lead)
+                        for field_name, field_value in lead_fields
+                    )
+                    workflow_db.commit()
+                    workflow_db.expunge_all()
+
+                    _update_job(job_id, {ImportJob.inserted_rows: chunk[-1][0] + 1})
+        finally:
+            workflow_db.close()
+
+    async def _push_leads(self, job_id: int, workflow: Workflow, field_mapping: dict[str, str]) -> None:
+        """Create job leads without a Bitrix24 ID in Bitrix24 using concurrent `batch` calls."""
+        workflow_db = next(database_service.get_workflow_session(workflow.id))
+        try:
+            pushed = workflow_db.query(func.count(Lead.id)).filter(
+                Lead.import_job_id == job_id,
+                Lead.bitrix24_lead_id.isnot(None),
+            ).scalar()
+        finally:
+            workflow_db.close()
+        # Leads that failed in a previous run are retried, so only this run's failures count
+        _update_job(job_id, {ImportJob.pushed_rows: pushed, ImportJob.failed_rows: 0})
+
+        if not workflow.bitrix24_webhook_url:
+            raise ValueError("Workflow has no Bitrix24 webhook URL")
+
+        bitrix_service = Bitrix24Service(workflow.bitrix24_webhook_url)
+        entity_type = workflow.entity_type or "lead"
+        batch_rows = settings.CSV_IMPORT_B24_BATCH_ROWS
+        cursor = {"after_id": 0}
+        cursor_lock = asyncio.Lock()
+
+        async def next_batch() -> list[dict[str, Any]]:
+            # Keyset pagination shared by all workers: each lead is taken once
+            async with cursor_lock:
+                items = self._load_pending(workflow.id, job_id, cursor["after_id"], batch_rows, field_mapping)
+                if items:
+                    cursor["after_id"] = items[-1]["lead_id"]
+                return items
+
+        async def worker() -> None:
+            while items := await next_batch():
+                try:
+                    outcome = await bitrix_service.create_entities_batch(
+                        entity_type,
+                        items,
+                        status_id=workflow.lead_status_id or "NEW",
+                        category_id=workflow.deal_category_id if workflow.deal_category_id is not None else 0,
+                        stage_id=workflow.deal_stage_id or "NEW",
+                    )
+                except Exception as e:
+                    logger.error(f"Import job {job_id}: Bitrix24 batch failed: {e}")
+                    outcome = [(None, str(e))] * len(items)
+
+                created = [
+                    (item["lead_id"], str(entity_id))
+                    for item, (entity_id, _) in zip(items, outcome)
+                    if entity_id
+                ]
+                for item, (entity_id, error) in zip(items, outcome):
+                    if not entity_id:
+                        logger.warning(f"Import job {job_id}: lead {item['lead_id']} not created in Bitrix24: {error}")
+                self._save_pushed(job_id, workflow.id, created, len(items) - len(created))
+
+        await asyncio.gather(*(worker() for _ in range(max(1, settings.CSV_IMPORT_B24_CONCURRENCY))))
+
+    def _load_pending(
+        self,
+        workflow_id: int,
+        job_id: int,
+        after_id: int,
+        limit: int,
+        field_mapping: dict[str, str],
+    ) -> list[dict[str, Any]]:
+        """Load the next leads of the job that are not in Bitrix24 yet, with their extra fields."""
+        workflow_db = next(database_service.get_workflow_session(workflow_id))
+        try:
+            leads = (
+                workflow_db.query(Lead.id, Lead.name, Lead.phone)
+                .filter(
+                    Lead.import_job_id == job_id,
+                    Lead.bitrix24_lead_id.is_(None),
+                    Lead.id > after_id,
+                )
+                .order_by(Lead.id)
+                .limit(limit)
+                .all()
+            )
+            if not leads:
+                return []
+
+            fields: dict[int, dict[str, str]] = {lead_id: {} for lead_id, _, _ in leads}
+            for lead_id, field_name, field_value in workflow_db.query(
+                LeadField.lead_id, LeadField.field_name, LeadField.field_value
+            ).filter(LeadField.lead_id.in_(fields)):
+                fields[lead_id][field_name] = field_value
+        finally:
+            workflow_db.close()
+
+        return [
+            {
+                "lead_id": lead_id,
+                "name": name,
+                "phone": phone,
+                "extra_fields": prepare_extra_fields(fields[lead_id], field_mapping)[0],
+            }
+            for lead_id, name, phone in leads
+        ]
+
+    def _save_pushed(self, job_id: int, workflow_id: int, created: list[tuple[int, str]], failed: int) -> None:
+        """Store Bitrix24 IDs of created leads, index them and advance job counters."""
+        if created:
+            workflow_db = next(database_service.get_workflow_session(workflow_id))
+            try:
+                workflow_db.execute(
+                    update(Lead),
+                    [{"id": lead_id, "bitrix24_lead_id": entity_id} for lead_id, entity_id in created],
+                )
+                workflow_db.commit()
+            finally:
+                workflow_db.close()
+
+            db = MainSessionLocal()
+            try:
+                LeadIndexService.add(db, workflow_id, [(entity_id, lead_id) for lead_id, entity_id in created])
+            finally:
+                db.close()
+
+        _update_job(job_id, {
+            ImportJob.pushed_rows: ImportJob.pushed_rows + len(created),
+            ImportJob.failed_rows: ImportJob.failed_rows + failed,
+        })
+
+
+# Global instance
+lead_import_service = LeadImportService()
@@ -0,0 +1,136 @@
+"""Global index of Bitrix24 entity IDs to workflow leads."""
+import logging
+from typing import Iterable
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.backend.models.lead import Lead
+from src.backend.models.lead_index import LeadIndex
+from src.backend.models.workflow import Workflow
+from src.backend.services.database import database_service
+
+logger = logging.getLogger(__name__)
+
+# Max IDs per IN (...) clause
+_CHUNK_SIZE = 500
+
+
+class LeadIndexService:
+    """Maintains the lead_index table in the main database.
+
+    The index mirrors Lead.bitrix24_lead_id of every workflow database. When a
+    workflow has several leads with the same Bitrix24 ID, the first one (lowest
+    lead ID) is indexed, matching the previous per-workflow `.first()` lookup.
+    """
+
+    @staticmethod
+    def add(db: Session, workflow_id: int, entries: Iterable[tuple[str, int]]) -> int:
+        """Index (bitrix24_entity_id, lead_id) pairs of a workflow; existing keys are kept.
+
+        Args:
+            db: Main database session
+            workflow_id: Workflow the leads belong to
+            entries: Pairs of Bitrix24 entity ID and local lead ID
+
+        Returns:
+            Number of entries added
+        """
+        pending: dict[str, int] = {}
+        for bitrix24_entity_id, lead_id in entries:
+            if bitrix24_entity_id:
+                pending.setdefault(str(bitrix24_entity_id), lead_id)
+        if not pending:
+            return 0
+
+        keys = list(pending)
+        for offset in range(0, len(keys), _CHUNK_SIZE):
+            chunk = keys[offset:offset + _CHUNK_SIZE]
+            for (existing,) in db.query(LeadIndex.bitrix24_entity_id).filter(
+                LeadIndex.workflow_id == workflow_id,
+                LeadIndex.bitrix24_entity_id.in_(chunk),
+            ):
+                pending.pop(existing, None)
+
+        db.add_all(
+            LeadIndex(bitrix24_entity_id=entity_id, workflow_id=workflow_id, lead_id=lead_id)
+            for entity_id, lead_id in pending.items()
+        )
+        db.commit()
+        return len(pending)
+
+    @staticmethod
+    def add_lead(db: Session, workflow_id: int, lead: Lead) -> None:
+        """Index a single lead if it has a Bitrix24 ID."""
+        if lead.bitrix24_lead_id:
+            LeadIndexService.add(db, workflow_id, [(lead.bitrix24_lead_id, lead.id)])
+
+    @staticmethod
+    def find(db: Session, bitrix24_entity_id: str, workflow_ids: list[int]) -> LeadIndex | None:
+        """Find the indexed lead for a Bitrix24 ID, preferring workflows in the given order."""
+        if not workflow_ids:
+            return None
+        entries = db.query(LeadIndex).filter(
+            LeadIndex.bitrix24_entity_id == str(bitrix24_entity_id),
+            LeadIndex.workflow_id.in_(workflow_ids),
+        ).all()
+        if not entries:
+            return None
+        order = {workflow_id: position for position, workflow_id in enumerate(workflow_ids)}
+        return min(entries, key=lambda entry: order[entry.workflow_id])
+
+    @staticmethod
+    def remove(db: Session, workflow_id: int, bitrix24_entity_id: str | None = None) -> None:
+        """Drop one entry, or every entry of the workflow when bitrix24_entity_id is None."""
+        query = db.query(LeadIndex).filter(LeadIndex.workflow_id == workflow_id)
+        if bitrix24_entity_id is not None:
+            query = query.filter(LeadIndex.bitrix24_entity_id == str(bitrix24_entity_id))
+        query.delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def rebuild(db: Session, workflow_ids: list[int] | None = None) -> int:
+        """Rebuild the index from workflow databases.
+
+        Args:
+            db: Main database session
+            workflow_ids: Workflows to reindex (all workflows if None)
+
+        Returns:
+            Number of indexed leads
+        """
+        if workflow_ids is None:
+            workflow_ids = [row[0] for row in db.query(Workflow.id).all()]
+
+        total = 0
+        for workflow_id in workflow_ids:
+            db.query(LeadIndex).filter(LeadIndex.workflow_id == workflow_id).delete(synchronize_session=False)
+            db.commit()
+
+            db_path = database_service.workflows_dir / str(workflow_id) / "database.db"
+            if not db_path.exists():
+                continue
+            workflow_db = next(database_service.get_workflow_session(workflow_id))
+            try:
+                rows = (
+                    workflow_db.query(Lead.bitrix24_lead_id, Lead.id)
+                    .filter(Lead.bitrix24_lead_id.isnot(None), Lead.bitrix24_lead_id != "")
+                    .order_by(Lead.id)
+                    .all()
+                )
+            except OperationalError as e:
+                logger.warning(f"Lead index: workflow {workflow_id} database not readable: {e}")
+                continue
+            finally:
+                workflow_db.close()
+            added = LeadIndexService.add(db, workflow_id, rows)
+            total += added
+            logger.info(f"Lead index: workflow {workflow_id} reindexed ({added} leads)")
+        return total
+
+    @staticmethod
+    def ensure_built(db: Session) -> None:
+        """Build the index on first start (empty table) so webhook routing can rely on it."""
+        if db.query(LeadIndex.id).first() is None:
+            total = LeadIndexService.rebuild(db)
+            logger.info(f"Lead index built: {total} leads")
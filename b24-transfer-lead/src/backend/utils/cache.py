@@ -17,14 +17,16 @@ def get_logger():
 class TTLCache:
     """Простой in-memory кэш с TTL (Time To Live)."""
 
-    def __init__(self, default_ttl: int = 86400):
+    def __init__(self, default_ttl: int = 86400, max_size: int | None = None):
         """Инициализация кэша.
 
         Args:
             default_ttl: Время жизни записей в секундах (по умолчанию 1 день = 86400)
+            max_size: Максимальное количество записей (при превышении удаляются самые старые); None - без ограничения
         """
         self._cache: dict[str, tuple[Any, float]] = {}
         self.default_ttl = default_ttl
+        self.max_size = max_size
 
     def get(self, key: str) -> Any | None:
         """Получить значение из кэша.
@@ -59,9 +61,18 @@ class TTLCache:
         """
         ttl = ttl or self.default_ttl
         expiry_time = time.time() + ttl
+        # Переустановка ключа переносит его в конец (порядок вставки = порядок вытеснения)
+        self._cache.pop(key, None)
         self._cache[key] = (value, expiry_time)
+        if self.max_size is not None:
+            while len(self._cache) > self.max_size:
+                del self._cache[next(iter(self._cache))]
         get_logger().debug(f"Cached value for key: {key} (TTL: {ttl}s)")
 
+    def __len__(self) -> int:
+        """Количество записей (включая истекшие, но еще не удаленные)."""
+        return len(self._cache)
+
     def clear(self) -> None:
         """Очистить весь кэш."""
         self._cache.clear()
@@ -1,7 +1,7 @@
 """CSV parser for leads."""
 import csv
 from io import StringIO
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 
 def get_csv_headers(csv_content: str) -> list[str]:
@@ -23,27 +23,25 @@ def get_csv_headers(csv_content: str) -> list[str]:
         raise ValueError(f"Invalid CSV format: {e}")
 
 
-def parse_csv_leads(csv_content: str, column_mapping: dict[str, str] | None = None) -> list[dict[str, Any]]:
-    """Parse CSV content and extract leads.
+def iter_csv_leads(
+    csv_lines: Iterable[str], column_mapping: dict[str, str] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Parse CSV rows lazily and yield leads one by one.
 
-    Expected CSV format:
-    - First row: headers (phone, name, and other columns)
-    - Subsequent rows: lead data
+    Same rules as parse_csv_leads, but rows are read from any iterable of lines
+    (e.g. an open file), so large files are never loaded into memory.
 
     Args:
-        csv_content: CSV file content as string
+        csv_lines: Iterable of CSV lines (file object, list of strings)
         column_mapping: Optional mapping from CSV column names to field names
-                        (e.g., {"Email": "email", "Company": "company"})
-                        If None, uses automatic detection for phone and name
 
-    Returns:
-        List of lead dictionaries with all columns preserved
+    Yields:
+        Lead dictionaries with all columns preserved
 
     Raises:
-        ValueError: If CSV format is invalid
+        ValueError: If a row misses required fields
     """
-    leads = []
-    reader = csv.DictReader(StringIO(csv_content))
+    reader = csv.DictReader(csv_lines)
 
     for row_num, row in enumerate(reader, start=2):  # Start from 2 (header is row 1)
         lead_data: dict[str, Any] = {}
@@ -94,10 +92,31 @@ def parse_csv_leads(csv_content: str, column_mapping: dict[str, str] | None = No
         if "phone" not in lead_data or "name" not in lead_data:
             raise ValueError(f"Row {row_num}: Missing required fields (phone, name)")
 
-        leads.append(lead_data)
+        yield lead_data
+
+
+def parse_csv_leads(csv_content: str, column_mapping: dict[str, str] | None = None) -> list[dict[str, Any]]:
+    """Parse CSV content and extract leads.
+
+    Expected CSV format:
+    - First row: headers (phone, name, and other columns)
+    - Subsequent rows: lead data
+
+    Args:
+        csv_content: CSV file content as string
+        column_mapping: Optional mapping from CSV column names to field names
+                        (e.g., {"Email": "email", "Company": "company"})
+                        If None, uses automatic detection for phone and name
+
+    Returns:
+        List of lead dictionaries with all columns preserved
+
+    Raises:
+        ValueError: If CSV format is invalid
+    """
+    leads = list(iter_csv_leads(StringIO(csv_content), column_mapping))
 
     if not leads:
         raise ValueError("No leads found in CSV file")
 
     return leads
-
@@ -0,0 +1,48 @@
+"""Mapping of extra lead fields to Bitrix24 fields."""
+from typing import Any
+
+STANDARD_FIELD_MAP: dict[str, str] = {
+    "comment": "COMMENTS",
+    "email": "EMAIL",
+    "company": "COMPANY_TITLE",
+}
+
+
+def prepare_extra_fields(
+    extra_fields_data: dict[str, Any],
+    field_mapping: dict[str, str],
+) -> tuple[dict[str, Any], list[tuple[str, str]]]:
+    """Prepare extra fields for Bitrix24 and for local storage.
+
+    Three categories of extra fields are supported:
+    1. Fields whose names start with ``UF_CRM_`` are already valid Bitrix24 user-field
+       IDs and are passed through directly. This allows the partner tracking system
+       to inject UF fields without requiring a WorkflowFieldMapping entry.
+    2. All other fields are resolved through *field_mapping* (WorkflowFieldMapping).
+    3. Standard fields (comment, email, company) are mapped to their Bitrix24
+       equivalents (COMMENTS, EMAIL, COMPANY_TITLE) automatically if no explicit
+       WorkflowFieldMapping exists.
+
+    Returns:
+        A tuple of (bitrix24_extra_fields, lead_fields_to_save).
+    """
+    bitrix24_extra_fields: dict[str, Any] = {}
+    lead_fields_to_save: list[tuple[str, str]] = []
+
+    for field_name, field_value in extra_fields_data.items():
+        if field_value is None:
+            continue
+        if field_name.startswith("UF_CRM_"):
+            # UF fields are already Bitrix24 field IDs -- pass through directly
+            bitrix24_extra_fields[field_name] = field_value
+            lead_fields_to_save.append((field_name, str(field_value)))
+        elif field_name in field_mapping:
+            bitrix24_field_id = field_mapping[field_name]
+            bitrix24_extra_fields[bitrix24_field_id] = field_value
+            lead_fields_to_save.append((field_name, str(field_value)))
+        elif field_name in STANDARD_FIELD_MAP:
+            bitrix24_field_id = STANDARD_FIELD_MAP[field_name]
+            bitrix24_extra_fields[bitrix24_field_id] = field_value
+            lead_fields_to_save.append((field_name, str(field_value)))
+
+    return bitrix24_extra_fields, lead_fields_to_save
@@ -607,6 +607,71 @@ def migrate_lead_deal_fields():
     print(f"Migration completed. Migrated {migrated_count} databases, skipped {skipped_count}.")
 
 
+def migrate_lead_import_fields():
+    """Migrate all workflow databases to add CSV import tracking fields (import_job_id, import_row) to leads table."""
+    workflows_dir = Path(settings.WORKFLOWS_DIR)
+
+    if not workflows_dir.exists():
+        print(f"Workflows directory {workflows_dir} does not exist. Skipping migration.")
+        return
+
+    print("Migrating workflow databases to add import fields...")
+
+    migrated_count = 0
+    skipped_count = 0
+
+    for workflow_dir in workflows_dir.iterdir():
+        if not workflow_dir.is_dir():
+            continue
+
+        db_path = workflow_dir / "database.db"
+        if not db_path.exists():
+            skipped_count += 1
+            continue
+
+        try:
+            conn = sqlite3.connect(str(db_path))
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='leads'")
+            if not cursor.fetchone():
+                conn.close()
+                skipped_count += 1
+                continue
+
+            cursor.execute("PRAGMA table_info(leads)")
+            columns = [row[1] for row in cursor.fetchall()]
+
+            columns_to_add = []
+            if "import_job_id" not in columns:
+                columns_to_add.append(("import_job_id", "INTEGER"))
+            if "import_row" not in columns:
+                columns_to_add.append(("import_row", "INTEGER"))
+
+            if not columns_to_add:
+                conn.close()
+                skipped_count += 1
+                continue
+
+            for column_name, column_def in columns_to_add:
+                cursor.execute(f"ALTER TABLE leads ADD COLUMN {column_name} {column_def}")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_leads_import_job_id ON leads (import_job_id)")
+
+            conn.commit()
+            conn.close()
+            migrated_count += 1
+            print(f"Migrated workflow database: {workflow_dir.name}")
+
+        except Exception as e:
+            print(f"Warning: Failed to migrate workflow database {workflow_dir.name}: {e}")
+            try:
+                conn.close()
+            except:
+                pass
+
+    print(f"Migration completed. Migrated {migrated_count} databases, skipped {skipped_count}.")
+
+
 if __name__ == "__main__":
     migrate_workflows_table()
     migrate_workflow_settings()
@@ -616,4 +681,4 @@ if __name__ == "__main__":
     migrate_lead_assigned_by_and_semantic()
     migrate_user_workflow_access()
     migrate_lead_deal_fields()
-
+    migrate_lead_import_fields()
@@ -0,0 +1,29 @@
+"""Rebuild the global lead index (lead_index table) from workflow databases.
+
+Usage: python -m src.backend.utils.rebuild_lead_index [--workflow-id ID ...]
+"""
+import argparse
+import logging
+
+from src.backend.core.database import MainSessionLocal, init_main_db
+from src.backend.services.lead_index import LeadIndexService
+
+
+def main():
+    """Reindex all workflows, or only the given ones."""
+    parser = argparse.ArgumentParser(description="Rebuild the global lead index")
+    parser.add_argument("--workflow-id", type=int, action="append", dest="workflow_ids")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_main_db()
+    db = MainSessionLocal()
+    try:
+        total = LeadIndexService.rebuild(db, args.workflow_ids)
+    finally:
+        db.close()
+    print(f"Indexed {total} leads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Fill the phone -> Bitrix24 contact index (contact_phone_index table) by scanning portal contacts.
+
+Usage: python -m src.backend.utils.warm_contact_index [--workflow-id ID ...]
+"""
+import argparse
+import asyncio
+import logging
+
+from src.backend.core.database import MainSessionLocal, init_main_db
+from src.backend.models import Workflow
+from src.backend.services.bitrix24 import Bitrix24Service
+from src.backend.services.contact_index import contact_index_service
+
+
+async def warm_up(workflow_ids: list[int] | None) -> int:
+    """Scan contacts of every portal used by the given workflows (all workflows if None)."""
+    db = MainSessionLocal()
+    try:
+        query = db.query(Workflow.bitrix24_webhook_url).filter(Workflow.bitrix24_webhook_url.isnot(None))
+        if workflow_ids:
+            query = query.filter(Workflow.id.in_(workflow_ids))
+        webhook_urls = {row[0] for row in query}
+    finally:
+        db.close()
+
+    # One scan per portal, even if several workflows share it
+    services = {service.portal: service for service in (Bitrix24Service(url) for url in webhook_urls)}
+    total = 0
+    for service in services.values():
+        total += await contact_index_service.warm_up(service)
+    return total
+
+
+def main():
+    """Warm up the contact index of all portals, or of the given workflows only."""
+    parser = argparse.ArgumentParser(description="Index Bitrix24 contact phones")
+    parser.add_argument("--workflow-id", type=int, action="append", dest="workflow_ids")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_main_db()
+    total = asyncio.run(warm_up(args.workflow_ids))
+    print(f"Indexed {total} phones")
+
+
+if __name__ == "__main__":
+    main()
@@ -136,79 +136,48 @@ export default function CSVUpload({ workflowId, onClose }: CSVUploadProps) {
     setLoading(true)
     setUploadProgress(0)
     setEstimatedTimeRemaining(null)
-    const startTimeValue = Date.now()
-    let uploadCompleted = false
-    let fileUploadProgress = 0
-    
-    // Симуляция прогресса обработки (начинается после загрузки файла)
-    let processingProgress = 50 // Начинаем с 50% после загрузки файла
-    const totalRows = processAllRows ? csvRowCount : rowsToProcess
-    // Оценка времени обработки: примерно 1-2 секунды на строку
-    const estimatedProcessingTime = totalRows * 1.5 // секунды
-    
-    const processingInterval = setInterval(() => {
-      if (!uploadCompleted) {
-        // Пока файл загружается, не трогаем прогресс обработки
-        return
-      }
-      
-      // После загрузки файла медленно увеличиваем прогресс обработки
-      const elapsed = (Date.now() - startTimeValue) / 1000
-      const processingElapsed = elapsed - (fileUploadProgress > 0 ? (fileUploadProgress / 50) * elapsed : 0)
-      
-      // Медленно увеличиваем прогресс от 50% до 95%
-      // Используем логарифмическую функцию для более реалистичного прогресса
-      if (processingProgress < 95) {
-        // Увеличиваем прогресс медленно, основываясь на прошедшем времени
-        const targetProgress = 50 + (45 * Math.min(processingElapsed / estimatedProcessingTime, 0.95))
-        processingProgress = Math.min(targetProgress, 95)
-        setUploadProgress(processingProgress)
-        
-        // Расчет оставшегося времени
-        if (processingElapsed > 0 && processingProgress < 95) {
-          const rate = (processingProgress - 50) / processingElapsed
-          if (rate > 0) {
-            const remaining = (95 - processingProgress) / rate
-            setEstimatedTimeRemaining(Math.max(0, Math.ceil(remaining)))
-          }
-        }
-      }
-    }, 100) // Обновляем каждые 100мс
+    let jobStartTime: number | null = null
+    let jobStartProgress = 0
 
     try {
       const limit = processAllRows ? null : rowsToProcess
-      await uploadCSV(workflowId, file, columnMapping, limit, (progress) => {
-        // Прогресс загрузки файла (0-50%)
-        fileUploadProgress = (progress.loaded / progress.total) * 50
-        setUploadProgress(fileUploadProgress)
-        
-        // Расчет оставшегося времени для загрузки
-        const elapsed = (Date.now() - startTimeValue) / 1000
-        if (progress.loaded > 0 && elapsed > 0) {
-          const rate = fileUploadProgress / elapsed
-          if (rate > 0) {
-            const remaining = (50 - fileUploadProgress) / rate
-            setEstimatedTimeRemaining(Math.max(0, Math.ceil(remaining)))
+      const job = await uploadCSV(
+        workflowId,
+        file,
+        columnMapping,
+        limit,
+        (progress) => {
+          // Загрузка файла на сервер (0-10%)
+          setUploadProgress((progress.loaded / progress.total) * 10)
+        },
+        (job) => {
+          // Фоновая обработка на сервере (10-100%): реальный прогресс задачи импорта
+          const overall = 10 + job.progress * 0.9
+          setUploadProgress(overall)
+
+          if (jobStartTime === null) {
+            jobStartTime = Date.now()
+            jobStartProgress = job.progress
+            return
+          }
+          // Расчет оставшегося времени по фактической скорости обработки
+          const elapsed = (Date.now() - jobStartTime) / 1000
+          const rate = (job.progress - jobStartProgress) / elapsed
+          if (elapsed > 0 && rate > 0) {
+            setEstimatedTimeRemaining(Math.max(0, Math.ceil((100 - job.progress) / rate)))
           }
         }
-      })
-      
-      // Файл загружен, начинаем обработку
-      uploadCompleted = true
-      processingProgress = 50
-      setUploadProgress(50)
-      
-      // Ждем завершения обработки на сервере
-      // Прогресс будет медленно увеличиваться до 95% пока идет обработка
-      
-      // После завершения обработки быстро завершаем до 100%
-      clearInterval(processingInterval)
+      )
+
       setUploadProgress(100)
       setEstimatedTimeRemaining(0)
-      
+      if (job.failed_rows > 0) {
+        alert(`Не удалось создать в Bitrix24: ${job.failed_rows} из ${job.total_rows}. Лиды сохранены, импорт можно повторить.`)
+      }
+
       // Небольшая задержка перед закрытием, чтобы пользователь увидел 100%
       await new Promise(resolve => setTimeout(resolve, 500))
-      
+
       setFile(null)
       setCsvHeaders([])
       setCsvRowCount(0)
@@ -217,7 +186,6 @@ export default function CSVUpload({ workflowId, onClose }: CSVUploadProps) {
       setRowsToProcess(1)
       onClose()
     } catch (error) {
-      clearInterval(processingInterval)
       alert('Ошибка при загрузке CSV файла')
     } finally {
       setLoading(false)
@@ -392,7 +360,7 @@ export default function CSVUpload({ workflowId, onClose }: CSVUploadProps) {
               </div>
               <div className="flex items-center justify-between mt-1">
                 <p className="text-xs text-gray-500">
-                  {uploadProgress < 50 
+                  {uploadProgress < 10
                     ? 'Загрузка файла на сервер...' 
                     : uploadProgress < 100
                     ? 'Обработка данных и создание лидов в Bitrix24...'
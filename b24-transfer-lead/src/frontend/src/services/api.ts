@@ -3,6 +3,7 @@ import type {
   User,
   Workflow,
   Lead,
+  ImportJob,
   CreateUserRequest,
   CreateWorkflowRequest,
   CreateLeadRequest,
@@ -191,8 +192,9 @@ export const leadsAPI = {
     file: File,
     columnMapping?: Record<string, string>,
     limit?: number | null,
-    onProgress?: (progress: { loaded: number; total: number }) => void
-  ): Promise<Lead[]> => {
+    onProgress?: (progress: { loaded: number; total: number }) => void,
+    onJobProgress?: (job: ImportJob) => void
+  ): Promise<ImportJob> => {
     const formData = new FormData()
     formData.append('file', file)
     if (columnMapping) {
@@ -201,7 +203,8 @@ export const leadsAPI = {
     if (limit !== undefined && limit !== null) {
       formData.append('limit', limit.toString())
     }
-    const response = await api.post<Lead[]>(`/workflows/${workflowId}/leads/upload`, formData, {
+    // Импорт идет фоновой задачей: загружаем файл и опрашиваем статус задачи
+    const response = await api.post<ImportJob>(`/workflows/${workflowId}/leads/import-jobs`, formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -214,6 +217,21 @@ export const leadsAPI = {
         }
       },
     })
+    let job = response.data
+    while (job.status !== 'completed' && job.status !== 'failed') {
+      onJobProgress?.(job)
+      await new Promise((resolve) => setTimeout(resolve, 1000))
+      job = await leadsAPI.getImportJob(workflowId, job.id)
+    }
+    onJobProgress?.(job)
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Import failed')
+    }
+    return job
+  },
+
+  getImportJob: async (workflowId: number, jobId: number): Promise<ImportJob> => {
+    const response = await api.get<ImportJob>(`/workflows/${workflowId}/leads/import-jobs/${jobId}`)
     return response.data
   },
 
@@ -1,5 +1,5 @@
 import { create } from 'zustand'
-import type { Lead } from '@/types'
+import type { ImportJob, Lead } from '@/types'
 import { leadsAPI } from '@/services/api'
 
 interface LeadsState {
@@ -8,7 +8,7 @@ interface LeadsState {
   currentWorkflowId: number | null
   fetchLeads: (workflowId: number) => Promise<void>
   createLead: (workflowId: number, phone: string, name: string, additionalFields?: Record<string, string>) => Promise<void>
-  uploadCSV: (workflowId: number, file: File, columnMapping?: Record<string, string>, limit?: number | null, onProgress?: (progress: { loaded: number; total: number }) => void) => Promise<void>
+  uploadCSV: (workflowId: number, file: File, columnMapping?: Record<string, string>, limit?: number | null, onProgress?: (progress: { loaded: number; total: number }) => void, onJobProgress?: (job: ImportJob) => void) => Promise<ImportJob>
 }
 
 export const useLeadsStore = create<LeadsState>((set, get) => ({
@@ -45,14 +45,14 @@ export const useLeadsStore = create<LeadsState>((set, get) => ({
     }
   },
 
-  uploadCSV: async (workflowId: number, file: File, columnMapping?: Record<string, string>, limit?: number | null, onProgress?: (progress: { loaded: number; total: number }) => void) => {
+  uploadCSV: async (workflowId: number, file: File, columnMapping?: Record<string, string>, limit?: number | null, onProgress?: (progress: { loaded: number; total: number }) => void, onJobProgress?: (job: ImportJob) => void) => {
     set({ loading: true })
     try {
-      const leads = await leadsAPI.uploadCSV(workflowId, file, columnMapping, limit, onProgress)
-      set((state) => ({
-        leads: [...state.leads, ...leads],
-        loading: false,
-      }))
+      const job = await leadsAPI.uploadCSV(workflowId, file, columnMapping, limit, onProgress, onJobProgress)
+      // Импорт мог создать тысячи лидов — перечитываем список целиком
+      const leads = await leadsAPI.list(workflowId)
+      set({ leads, loading: false })
+      return job
     } catch (error) {
       set({ loading: false })
       throw error
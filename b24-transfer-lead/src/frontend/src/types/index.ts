@@ -35,6 +35,22 @@ export interface Lead {
   fields?: LeadField[]
 }
 
+export interface ImportJob {
+  id: number
+  workflow_id: number
+  status: 'pending' | 'inserting' | 'pushing' | 'completed' | 'failed'
+  file_name: string | null
+  total_rows: number
+  inserted_rows: number
+  pushed_rows: number
+  failed_rows: number
+  progress: number  // 0-100: сохранение строк — первая половина, создание в Bitrix24 — вторая
+  error: string | null
+  created_at: string
+  updated_at: string
+  finished_at: string | null
+}
+
 export interface CreateUserRequest {
   username: string
   password: string
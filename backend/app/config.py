@@ -16,6 +16,15 @@ class Settings(BaseSettings):
     B24_INTERNAL_API_KEY: str = ""
     B24_WEBHOOK_URL: str = ""
 
+    # Shared HTTP client for b24-transfer-lead (keep-alive pool; GETs retried with jittered backoff)
+    B24_HTTP_MAX_CONNECTIONS: int = 50
+    B24_HTTP_MAX_KEEPALIVE: int = 20
+    B24_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    B24_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    B24_HTTP2: bool = False  # requires the h2 package (httpx[http2])
+    B24_HTTP_GET_RETRIES: int = 2
+    B24_HTTP_RETRY_BACKOFF_SECONDS: float = 0.2
+
     # Workflow defaults (applied to every new partner workflow)
     B24_ENTITY_TYPE: str = "lead"  # "lead" or "deal"
     B24_DEAL_CATEGORY_ID: str = ""  # funnel ID (int as string), empty = not set
@@ -23,6 +32,46 @@ class Settings(BaseSettings):
     B24_LEAD_STATUS_ID: str = "NEW"
     B24_FIELD_MAPPINGS: str = "[]"  # JSON array of field mappings
 
+    # Deal sync fan-out (partners synced concurrently, B24 calls throttled per portal)
+    DEAL_SYNC_WORKERS: int = 4
+    B24_PORTAL_RATE_PER_SECOND: float = 2.0
+    B24_PORTAL_BURST: float = 2.0
+
+    # Click ingestion (public redirects)
+    CLICK_QUEUE_MAX_SIZE: int = 10000
+    CLICK_BATCH_SIZE: int = 500
+    CLICK_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # Public link resolution cache
+    LINK_CACHE_MAX_SIZE: int = 10000
+    LINK_CACHE_TTL_SECONDS: float = 300.0
+
+    # Daily rollups (daily_link_stats / daily_partner_stats)
+    ROLLUP_COMPACT_INTERVAL_SECONDS: float = 60.0
+    ROLLUP_COMPACT_DEBOUNCE_SECONDS: float = 1.0
+
+    # Report PDF rendering (worker pool; max_concurrent renders, others wait up to the timeout)
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_MAX_CONCURRENT: int = 2
+    PDF_RENDER_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    PDF_RENDER_USE_PROCESSES: bool = True
+    PDF_STREAM_CHUNK_SIZE: int = 65536
+
+    # Generated report PDF cache (files under UPLOAD_DIR/report_cache)
+    REPORT_CACHE_MAX_BYTES: int = 200 * 1024 * 1024
+    REPORT_CACHE_TTL_SECONDS: float = 600.0
+
+    # Fail requests that load more than N rows through ORM relationships (0 = off, for tests)
+    RELATIONSHIP_LOAD_AUDIT_LIMIT: int = 0
+
+    # Notification / chat change feed (GET /api/notifications/changes long-poll)
+    CHANGE_FEED_MAX_WAIT_SECONDS: float = 25.0
+    CHANGE_FEED_MAX_EVENTS: int = 100
+    CHANGE_FEED_MAX_BULK_PARTNERS: int = 5000
+
+    # Service key of the Telegram bot for /api/internal/bot/* (X-Internal-API-Key; empty = disabled)
+    BOT_INTERNAL_API_KEY: str = ""
+
     # Reward
     DEFAULT_REWARD_PERCENTAGE: float = 10.0
 
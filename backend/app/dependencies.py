@@ -1,6 +1,7 @@
+import secrets
 from collections.abc import AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
@@ -54,3 +55,15 @@ async def get_admin_user(
             detail="Admin access required",
         )
     return current_user
+
+
+async def verify_bot_api_key(
+    x_internal_api_key: str | None = Header(None),
+) -> None:
+    """Service-to-service auth of the Telegram bot (X-Internal-API-Key == BOT_INTERNAL_API_KEY)."""
+    expected = get_settings().BOT_INTERNAL_API_KEY
+    if not expected or not x_internal_api_key or not secrets.compare_digest(x_internal_api_key, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal API key",
+        )
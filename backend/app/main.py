@@ -7,10 +7,17 @@ from fastapi.staticfiles import StaticFiles
 from app.config import get_settings
 from app.database import Base, engine
 from app.models import *  # noqa: F401,F403
-from app.routers import admin, analytics, auth, bitrix_settings, chat, clients, landings, links, notifications, payment_requests, public, reports, system_settings
+from app.routers import admin, analytics, auth, bitrix_settings, chat, clients, internal, landings, links, notifications, payment_requests, public, reports, system_settings
+from app.services.b24_http_client import start_b24_http, stop_b24_http
+from app.services.click_ingest_service import start_click_ingest, stop_click_ingest
+from app.services.pdf_render_service import start_pdf_renderer, stop_pdf_renderer
+from app.services.report_cache_service import clear_report_cache
+from app.services.rollup_service import start_rollup_task, stop_rollup_task
 from app.services.deal_sync_service import start_sync_task, stop_sync_task
 from app.utils.create_admin import ensure_admin_exists
-from app.utils.migrate_db import migrate_chat_file_fields, migrate_chat_messages_table, migrate_client_deal_id, migrate_client_deal_status_fields, migrate_client_payment_fields, migrate_link_utm_fields, migrate_notification_file_fields, migrate_notification_target_partner, migrate_partner_approval_fields, migrate_partner_b24_entity_fields, migrate_partner_b24_fields, migrate_partner_payment_details, migrate_partner_reward_percentage, migrate_partner_role_field, migrate_payment_request_details, migrate_system_settings_table
+from app.utils.query_plan_check import check_hot_query_plans
+from app.utils.relationship_audit import install_relationship_audit, relationship_audit_middleware
+from app.utils.migrate_db import migrate_chat_file_fields, migrate_chat_messages_table, migrate_client_deal_id, migrate_client_deal_status_fields, migrate_client_payment_fields, migrate_hot_query_indexes, migrate_link_utm_fields, migrate_notification_file_fields, migrate_notification_target_partner, migrate_partner_approval_fields, migrate_partner_b24_entity_fields, migrate_partner_b24_fields, migrate_partner_payment_details, migrate_partner_reward_percentage, migrate_partner_role_field, migrate_payment_request_details, migrate_system_settings_table
 
 
 @asynccontextmanager
@@ -33,10 +40,21 @@ async def lifespan(app: FastAPI):
     migrate_notification_file_fields()
     migrate_system_settings_table()
     migrate_partner_b24_entity_fields()
+    migrate_hot_query_indexes()
+    check_hot_query_plans()
     ensure_admin_exists()
+    start_b24_http()
+    rollup_task = start_rollup_task()
+    start_click_ingest()
+    start_pdf_renderer()
+    clear_report_cache()
     sync_task = start_sync_task()
     yield
     await stop_sync_task(sync_task)
+    await stop_click_ingest()
+    stop_pdf_renderer()
+    await stop_rollup_task(rollup_task)
+    await stop_b24_http()
 
 
 settings = get_settings()
@@ -49,8 +67,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+if settings.RELATIONSHIP_LOAD_AUDIT_LIMIT > 0:
+    install_relationship_audit()
+    app.middleware("http")(relationship_audit_middleware(settings.RELATIONSHIP_LOAD_AUDIT_LIMIT))
+
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 app.include_router(auth.router, prefix="/api")
@@ -66,6 +89,7 @@ app.include_router(public.router, prefix="/api")
 app.include_router(reports.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 app.include_router(system_settings.router, prefix="/api")
+app.include_router(internal.router, prefix="/api")
 
 
 @app.get("/")
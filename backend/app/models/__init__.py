@@ -7,6 +7,8 @@ from app.models.notification import Notification, NotificationRead
 from app.models.payment_request import PaymentRequest
 from app.models.chat_message import ChatMessage
 from app.models.system_setting import SystemSetting
+from app.models.daily_stats import DailyLinkStats, DailyPartnerStats
+from app.models.deal_sync_state import DealSyncState
 
 __all__ = [
     "Partner",
@@ -20,4 +22,7 @@ __all__ = [
     "PaymentRequest",
     "ChatMessage",
     "SystemSetting",
+    "DailyLinkStats",
+    "DailyPartnerStats",
+    "DealSyncState",
 ]
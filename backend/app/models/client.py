@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -8,6 +8,13 @@ from app.database import Base
 
 class Client(Base):
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("ix_clients_partner_id_created_at", "partner_id", "created_at"),
+        Index("ix_clients_created_at", "created_at"),
+        Index("ix_clients_partner_id_deal_id", "partner_id", "deal_id"),
+        Index("ix_clients_external_id", "external_id"),
+        Index("ix_clients_link_id", "link_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     partner_id: Mapped[int] = mapped_column(Integer, ForeignKey("partners.id"), nullable=False)
@@ -0,0 +1,54 @@
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DailyLinkStats(Base):
+    """Clicks per link per UTC day, maintained by the click ingest writer."""
+
+    __tablename__ = "daily_link_stats"
+    __table_args__ = (UniqueConstraint("link_id", "day", name="uq_daily_link_stats_link_day"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    link_id: Mapped[int] = mapped_column(Integer, ForeignKey("partner_links.id"), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    clicks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class DailyPartnerStats(Base):
+    """Client and payment request counters per partner per UTC day (by created_at).
+
+    Rebuilt for touched (partner, day) pairs by the rollup compactor.
+    """
+
+    __tablename__ = "daily_partner_stats"
+    __table_args__ = (UniqueConstraint("partner_id", "day", name="uq_daily_partner_stats_partner_day"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    partner_id: Mapped[int] = mapped_column(Integer, ForeignKey("partners.id"), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # Clients by source
+    clients_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    clients_form: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    clients_manual: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    clients_b24_sync: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Deals (see report_service status sets)
+    sales: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    deals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    won: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    lost: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    reward: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    paid_reward: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    # Payment requests
+    payment_requests_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payment_requests_approved: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payment_requests_rejected: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payment_requests_pending: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payment_requests_amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
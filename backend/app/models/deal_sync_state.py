@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DealSyncState(Base):
+    """Per-partner high-water mark of the incremental B24 deal sync."""
+
+    __tablename__ = "deal_sync_state"
+
+    partner_id: Mapped[int] = mapped_column(Integer, ForeignKey("partners.id"), primary_key=True)
+    # Max DATE_MODIFY seen (as returned by B24) and max deal ID
+    last_date_modify: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    max_deal_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Deal filter the watermark belongs to; a different filter starts a full resync
+    filter_signature: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
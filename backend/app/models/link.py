@@ -31,6 +31,7 @@ class PartnerLink(Base):
     utm_term: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     partner = relationship("Partner", back_populates="links")
-    clicks = relationship("LinkClick", back_populates="link", lazy="selectin")
-    clients = relationship("Client", back_populates="link", lazy="selectin")
+    # Unbounded collections: never loaded implicitly, use selectinload() or SQL aggregates
+    clicks = relationship("LinkClick", back_populates="link", lazy="raise")
+    clients = relationship("Client", back_populates="link", lazy="raise")
     landing = relationship("LandingPage", back_populates="links")
@@ -55,6 +55,7 @@ class Partner(Base):
     b24_entity_name: Mapped[str | None] = mapped_column(String(255), nullable=True, default=None)  # Cached display name
     phone: Mapped[str | None] = mapped_column(String(50), nullable=True, default=None)
 
-    links = relationship("PartnerLink", back_populates="partner", lazy="selectin")
-    clients = relationship("Client", back_populates="partner", lazy="selectin")
-    landings = relationship("LandingPage", back_populates="partner", lazy="selectin")
+    # Unbounded collections: never loaded implicitly, use selectinload() or SQL aggregates
+    links = relationship("PartnerLink", back_populates="partner", lazy="raise")
+    clients = relationship("Client", back_populates="partner", lazy="raise")
+    landings = relationship("LandingPage", back_populates="partner", lazy="raise")
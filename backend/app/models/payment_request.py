@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -8,6 +8,10 @@ from app.database import Base
 
 class PaymentRequest(Base):
     __tablename__ = "payment_requests"
+    __table_args__ = (
+        Index("ix_payment_requests_partner_id_status", "partner_id", "status"),
+        Index("ix_payment_requests_status", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     partner_id: Mapped[int] = mapped_column(Integer, ForeignKey("partners.id"), nullable=False)
@@ -25,6 +25,12 @@ from app.schemas.admin import (
 )
 from app.schemas.notification import NotificationListResponse, NotificationResponse
 from app.services import admin_service, auth_service, b24_entity_service, notification_service
+from app.services.b24_http_client import b24_http
+from app.services.change_notifier import change_notifier
+from app.services.click_ingest_service import click_ingestor
+from app.services.link_cache_service import link_cache
+from app.services.pdf_render_service import pdf_renderer
+from app.services.report_cache_service import report_cache
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -370,3 +376,54 @@ async def create_b24_company(
             "email": data.email,
         },
     )
+
+
+# --- Runtime metrics ---
+
+
+@router.get("/metrics/clicks")
+async def click_ingest_metrics(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """Click ingestion queue counters (depth, flushed, dropped)."""
+    return click_ingestor.stats()
+
+
+@router.get("/metrics/link-cache")
+async def link_cache_metrics(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """Public link resolution cache counters (size, hits, misses, evictions)."""
+    return link_cache.stats()
+
+
+@router.get("/metrics/pdf")
+async def pdf_render_metrics(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """PDF render pool counters (active, waiting, rendered, rejected)."""
+    return pdf_renderer.stats()
+
+
+@router.get("/metrics/report-cache")
+async def report_cache_metrics(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """Report PDF cache counters (entries, size, hits, misses, evictions)."""
+    return report_cache.stats()
+
+
+@router.get("/metrics/b24-http")
+async def b24_http_metrics(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """b24-transfer-lead HTTP pool counters (open/idle connections, requests, retries, errors)."""
+    return b24_http.stats()
+
+
+@router.get("/metrics/change-feed")
+async def change_feed_metrics(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """Notification change feed counters (waiting long-polls, published changes, wakeups)."""
+    return change_notifier.stats()
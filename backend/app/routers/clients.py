@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Query, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, get_db
 from app.models.partner import Partner
-from app.schemas.client import ClientCreateRequest, ClientResponse
+from app.schemas.client import ClientCreateRequest, ClientListItemResponse, ClientResponse
 from app.services.client_service import create_client_manual, get_client, get_clients
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
@@ -33,14 +35,40 @@ def _enrich_response(client) -> dict:
     return data
 
 
-@router.get("/", response_model=list[ClientResponse])
+@router.get("/", response_model=list[ClientResponse] | list[ClientListItemResponse])
 async def list_clients(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    after: str | None = Query(None, description="Курсор следующей страницы (заголовок X-Next-Cursor)"),
+    deal_status: str | None = Query(None, alias="status"),
+    is_paid: bool | None = None,
+    source: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    view: str = Query("full", pattern="^(full|light)$"),
     db: AsyncSession = Depends(get_db),
     current_user: Partner = Depends(get_current_user),
 ):
-    clients = await get_clients(db, current_user.id, skip, limit)
+    """Clients of the partner, newest first; X-Next-Cursor holds the `after` of the next page (absent on the last)."""
+    light = view == "light"
+    try:
+        clients, next_cursor = await get_clients(
+            db, current_user.id, skip, limit,
+            after=after,
+            deal_status=deal_status,
+            is_paid=is_paid,
+            source=source,
+            created_from=created_from,
+            created_to=created_to,
+            light=light,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if light:
+        return [ClientListItemResponse.model_validate(c) for c in clients]
     return [_enrich_response(c) for c in clients]
 
 
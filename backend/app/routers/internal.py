@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.dependencies import get_db, verify_bot_api_key
+from app.schemas.notification import BotChangesRequest, BotChangesResponse
+from app.services import change_feed_service
+
+router = APIRouter(prefix="/internal", tags=["internal"], dependencies=[Depends(verify_bot_api_key)])
+
+
+@router.post("/bot/changes", response_model=BotChangesResponse)
+async def bot_changes(
+    data: BotChangesRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Change feed of many partners in one long-poll (Telegram bot only)."""
+    if len(data.partners) > get_settings().CHANGE_FEED_MAX_BULK_PARTNERS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Слишком много партнёров в запросе")
+    try:
+        changes = await change_feed_service.wait_for_changes_bulk(
+            db, [(entry.partner_id, entry.since) for entry in data.partners], data.timeout,
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор")
+    return BotChangesResponse(changes=changes)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, get_db
@@ -23,10 +23,13 @@ router = APIRouter(prefix="/links", tags=["Links"])
 
 @router.get("/", response_model=list[LinkResponse])
 async def list_links(
+    skip: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=500),
+    sort_by: str = Query("created_at", pattern="^(created_at|clicks|clients)$"),
     db: AsyncSession = Depends(get_db),
     current_user: Partner = Depends(get_current_user),
 ):
-    return await get_links(db, current_user.id)
+    return await get_links(db, current_user.id, skip=skip, limit=limit, sort_by=sort_by)
 
 
 @router.post("/", response_model=LinkResponse, status_code=status.HTTP_201_CREATED)
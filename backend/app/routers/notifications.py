@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, get_db
 from app.models.partner import Partner
-from app.schemas.notification import PartnerNotificationListResponse, UnreadCountResponse
-from app.services import notification_service
+from app.schemas.notification import NotificationChangesResponse, PartnerNotificationListResponse, UnreadCountResponse
+from app.services import change_feed_service, notification_service
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -27,6 +27,20 @@ async def unread_count(
     return UnreadCountResponse(count=count)
 
 
+@router.get("/changes", response_model=NotificationChangesResponse)
+async def notification_changes(
+    since: str | None = Query(None, description="Курсор из предыдущего ответа; без него возвращается текущий курсор"),
+    timeout: float = Query(0, ge=0, description="Сколько секунд ждать изменений (long-poll)"),
+    db: AsyncSession = Depends(get_db),
+    user: Partner = Depends(get_current_user),
+):
+    partner_id = user.id
+    try:
+        return await change_feed_service.wait_for_changes(db, partner_id, since, timeout)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор")
+
+
 @router.post("/{notification_id}/read")
 async def read_notification(
     notification_id: int,
@@ -11,15 +11,16 @@ from sqlalchemy.orm import selectinload
 
 from app.config import get_settings
 from app.dependencies import get_db
-from app.models.click import LinkClick
 from app.models.client import Client
 from app.models.landing import LandingPage
-from app.models.link import PartnerLink
 from app.models.notification import Notification
 from app.models.partner import Partner
 from app.schemas.client import PublicFormRequest
+from app.services.b24_http_client import b24_http
+from app.services.change_notifier import change_notifier
+from app.services.click_ingest_service import click_ingestor
 from app.services.client_service import create_client_from_form
-from app.services.link_service import _build_url_with_utm
+from app.services.link_cache_service import LinkSnapshot, resolve_active_link
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +34,8 @@ _jinja_env = Environment(
 )
 
 
-async def _find_active_link(db: AsyncSession, link_code: str) -> PartnerLink:
-    result = await db.execute(
-        select(PartnerLink).where(
-            PartnerLink.link_code == link_code,
-            PartnerLink.is_active == True,  # noqa: E712
-        )
-    )
-    link = result.scalar_one_or_none()
+async def _find_active_link(db: AsyncSession, link_code: str) -> LinkSnapshot:
+    link = await resolve_active_link(db, link_code)
     if link is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,19 +44,13 @@ async def _find_active_link(db: AsyncSession, link_code: str) -> PartnerLink:
     return link
 
 
-async def _record_click(
-    db: AsyncSession,
-    link_id: int,
-    request: Request,
-) -> None:
-    click = LinkClick(
+def _record_click(link_id: int, request: Request) -> None:
+    click_ingestor.enqueue(
         link_id=link_id,
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent", ""),
         referer=request.headers.get("referer"),
     )
-    db.add(click)
-    await db.commit()
 
 
 @router.get("/r/{link_code}")
@@ -71,11 +60,10 @@ async def redirect_link(
     db: AsyncSession = Depends(get_db),
 ):
     link = await _find_active_link(db, link_code)
-    await _record_click(db, link.id, request)
+    _record_click(link.id, request)
 
     if link.link_type == "direct":
-        target = _build_url_with_utm(link.target_url, link)
-        return RedirectResponse(url=target, status_code=302)
+        return RedirectResponse(url=link.target_url, status_code=302)
 
     if link.link_type == "landing":
         return RedirectResponse(
@@ -142,7 +130,7 @@ async def landing_page(
     db: AsyncSession = Depends(get_db),
 ):
     link = await _find_active_link(db, link_code)
-    await _record_click(db, link.id, request)
+    _record_click(link.id, request)
 
     if link.link_type == "landing" and link.landing_id:
         result = await db.execute(
@@ -237,18 +225,18 @@ async def proxy_b24_webhook(
 
     target_url = f"{settings.B24_SERVICE_URL}/api/v1/webhook"
 
-    async with httpx.AsyncClient(timeout=120.0) as http_client:
-        try:
-            resp = await http_client.post(
-                target_url,
-                content=body,
-                headers={"content-type": content_type},
-            )
-        except httpx.RequestError:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail="Не удалось связаться с b24-transfer-lead",
-            )
+    try:
+        resp = await b24_http.post(
+            target_url,
+            content=body,
+            headers={"content-type": content_type},
+            timeout=120.0,
+        )
+    except httpx.RequestError:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Не удалось связаться с b24-transfer-lead",
+        )
 
     # Process extended response from b24-transfer-lead
     try:
@@ -323,6 +311,8 @@ async def proxy_b24_webhook(
                             db.add(notification)
 
                     await db.commit()
+                    if became_successful:
+                        change_notifier.publish(client_obj.partner_id)
                     logger.info(f"Updated client {client_obj.id} deal_status={deal_status}, deal_amount={client_obj.deal_amount}, partner_reward={client_obj.partner_reward}, became_successful={became_successful}")
     except Exception as e:
         logger.warning(f"Failed to process webhook response for client update: {e}")
@@ -1,18 +1,54 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.dependencies import get_admin_user, get_current_user, get_db
 from app.models.partner import Partner
 from app.schemas.report import AllPartnersReportResponse, PartnerReportResponse
-from app.services.pdf_service import generate_all_partners_report_pdf, generate_partner_report_pdf
+from app.services.pdf_render_service import PDFRenderBusy, render_all_partners_report_pdf, render_partner_report_pdf
+from app.services.report_cache_service import get_or_render_pdf
 from app.services.report_service import generate_all_partners_report, generate_partner_report
 
 router = APIRouter(tags=["reports"])
 
 
+def _iter_chunks(data: bytes, chunk_size: int):
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
+
+
+def _pdf_response(pdf_bytes: bytes) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_chunks(pdf_bytes, get_settings().PDF_STREAM_CHUNK_SIZE),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=report.pdf",
+            "Content-Length": str(len(pdf_bytes)),
+        },
+    )
+
+
+async def _render_pdf(render, report) -> bytes:
+    try:
+        return await render(report)
+    except PDFRenderBusy:
+        raise HTTPException(status_code=503, detail="Сервер занят формированием отчётов, попробуйте позже")
+
+
+async def _partner_pdf(db: AsyncSession, partner_id: int, date_from: date | None, date_to: date | None) -> bytes:
+    async def render() -> bytes:
+        report = await generate_partner_report(db, partner_id, date_from, date_to)
+        if not report:
+            raise HTTPException(status_code=404, detail="Партнёр не найден")
+        return await _render_pdf(render_partner_report_pdf, report)
+
+    return await get_or_render_pdf("partner", [partner_id], date_from, date_to, render)
+
+
 # --- Partner endpoints ---
 
 @router.get("/reports", response_model=PartnerReportResponse)
@@ -35,16 +71,8 @@ async def get_partner_report_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: Partner = Depends(get_current_user),
 ):
-    report = await generate_partner_report(db, current_user.id, date_from, date_to)
-    if not report:
-        raise HTTPException(status_code=404, detail="Партнёр не найден")
-
-    pdf_bytes = generate_partner_report_pdf(report)
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=report.pdf"},
-    )
+    pdf_bytes = await _partner_pdf(db, current_user.id, date_from, date_to)
+    return _pdf_response(pdf_bytes)
 
 
 # --- Admin endpoints ---
@@ -74,17 +102,13 @@ async def get_admin_report_pdf(
     ids = partner_ids or ([partner_id] if partner_id else None)
     if ids and len(ids) == 1:
         # Single partner PDF
-        report = await generate_partner_report(db, ids[0], date_from, date_to)
-        if not report:
-            raise HTTPException(status_code=404, detail="Партнёр не найден")
-        pdf_bytes = generate_partner_report_pdf(report)
+        pdf_bytes = await _partner_pdf(db, ids[0], date_from, date_to)
     else:
         # Multiple or all partners PDF
-        report = await generate_all_partners_report(db, date_from, date_to, ids)
-        pdf_bytes = generate_all_partners_report_pdf(report)
+        async def render() -> bytes:
+            report = await generate_all_partners_report(db, date_from, date_to, ids)
+            return await _render_pdf(render_all_partners_report_pdf, report)
 
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=report.pdf"},
-    )
+        pdf_bytes = await get_or_render_pdf("all_partners", ids, date_from, date_to, render)
+
+    return _pdf_response(pdf_bytes)
@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -120,8 +120,24 @@ async def update_default_links(
 @router.post("/sync/run-now")
 async def run_sync_now(
     background_tasks: BackgroundTasks,
+    wait: bool = Query(False),
     _admin: Partner = Depends(get_admin_user),
 ):
-    """Trigger manual sync cycle in the background."""
+    """Trigger manual sync cycle.
+
+    By default runs in the background; with ?wait=true waits for the cycle and
+    returns its summary (per-partner timings, p50/p95).
+    """
+    if wait:
+        report = await deal_sync_service.run_sync_cycle()
+        return {"success": True, "message": "Sync completed", "report": report}
     background_tasks.add_task(deal_sync_service.run_sync_cycle)
-    return {"success": True, "message": "Sync started"}
+    return {"success": True, "message": "Sync started", "last_report": deal_sync_service.last_cycle_report()}
+
+
+@router.get("/sync/last-report")
+async def get_last_sync_report(
+    _admin: Partner = Depends(get_admin_user),
+):
+    """Summary of the last completed sync cycle (per-partner timings, p50/p95)."""
+    return {"report": deal_sync_service.last_cycle_report()}
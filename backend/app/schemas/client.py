@@ -41,6 +41,22 @@ class ClientResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ClientListItemResponse(BaseModel):
+    """Light client list entry (GET /api/clients/?view=light)."""
+
+    id: int
+    name: str
+    source: str
+    created_at: datetime
+    is_paid: bool = False
+    deal_status: str | None = None
+    deal_status_name: str | None = None
+    deal_amount: float | None = None
+    partner_reward: float | None = None
+
+    model_config = {"from_attributes": True}
+
+
 class PublicFormRequest(BaseModel):
     name: str = Field(min_length=1)
     phone: str | None = None
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from app.schemas.chat import ChatMessageResponse
+
 
 class NotificationCreateRequest(BaseModel):
     title: str = Field(min_length=1, max_length=255)
@@ -40,3 +42,24 @@ class PartnerNotificationListResponse(BaseModel):
 
 class UnreadCountResponse(BaseModel):
     count: int
+
+
+class NotificationChangesResponse(BaseModel):
+    partner_id: int
+    cursor: str  # pass back as ?since= to get the next changes
+    notifications: list[PartnerNotificationResponse] = []
+    chat_messages: list[ChatMessageResponse] = []
+
+
+class BotChangesCursor(BaseModel):
+    partner_id: int
+    since: str | None = None  # None = start from the current cursor
+
+
+class BotChangesRequest(BaseModel):
+    partners: list[BotChangesCursor]
+    timeout: float = Field(0, ge=0)
+
+
+class BotChangesResponse(BaseModel):
+    changes: list[NotificationChangesResponse]  # same order as request.partners
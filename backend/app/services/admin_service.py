@@ -364,6 +364,10 @@ async def get_partner_detail(db: AsyncSession, partner_id: int) -> AdminPartnerD
     )
     clients = clients_result.scalars().all()
 
+    clients_count = (await db.execute(
+        select(func.count(Client.id)).where(Client.partner_id == partner_id)
+    )).scalar() or 0
+
     # Count clicks
     clicks_count = (await db.execute(
         select(func.count(LinkClick.id)).where(
@@ -393,7 +397,7 @@ async def get_partner_detail(db: AsyncSession, partner_id: int) -> AdminPartnerD
         phone=partner.phone,
         links_count=len(links),
         clicks_count=clicks_count,
-        clients_count=len(clients),
+        clients_count=clients_count,
         landings_count=landings_count,
         links=[
             {
@@ -1,11 +1,12 @@
 import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import timedelta
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.click import LinkClick
 from app.models.client import Client
+from app.models.daily_stats import DailyLinkStats, DailyPartnerStats
 from app.models.link import PartnerLink
 from app.models.partner import Partner
 from app.schemas.analytics import (
@@ -17,31 +18,37 @@ from app.schemas.analytics import (
     SummaryResponse,
 )
 from app.services.external_api import fetch_bitrix_stats as ext_fetch_bitrix_stats
+from app.utils.date_range import apply_day_range, utc_today
 
 logger = logging.getLogger(__name__)
 
 
 async def get_summary(db: AsyncSession, partner_id: int) -> SummaryResponse:
-    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    today = utc_today()
 
-    partner_links_sq = select(PartnerLink.id).where(PartnerLink.partner_id == partner_id).scalar_subquery()
-
-    total_clicks_q = select(func.count(LinkClick.id)).where(LinkClick.link_id.in_(
-        select(PartnerLink.id).where(PartnerLink.partner_id == partner_id)
-    ))
-    total_clicks = (await db.execute(total_clicks_q)).scalar() or 0
-
-    total_clients_q = select(func.count(Client.id)).where(Client.partner_id == partner_id)
-    total_clients = (await db.execute(total_clients_q)).scalar() or 0
-
-    clicks_today_q = total_clicks_q.where(LinkClick.created_at >= today_start)
-    clicks_today = (await db.execute(clicks_today_q)).scalar() or 0
-
-    clients_today_q = select(func.count(Client.id)).where(
-        Client.partner_id == partner_id,
-        Client.created_at >= today_start,
+    clicks_q = (
+        select(
+            func.coalesce(func.sum(DailyLinkStats.clicks), 0).label("total"),
+            func.coalesce(
+                func.sum(case((DailyLinkStats.day == today, DailyLinkStats.clicks), else_=0)), 0
+            ).label("today"),
+        )
+        .join(PartnerLink, PartnerLink.id == DailyLinkStats.link_id)
+        .where(PartnerLink.partner_id == partner_id)
     )
-    clients_today = (await db.execute(clients_today_q)).scalar() or 0
+    clicks = (await db.execute(clicks_q)).one()
+    total_clicks = clicks.total
+    clicks_today = clicks.today
+
+    clients_q = select(
+        func.coalesce(func.sum(DailyPartnerStats.clients_total), 0).label("total"),
+        func.coalesce(
+            func.sum(case((DailyPartnerStats.day == today, DailyPartnerStats.clients_total), else_=0)), 0
+        ).label("today"),
+    ).where(DailyPartnerStats.partner_id == partner_id)
+    clients = (await db.execute(clients_q)).one()
+    total_clients = clients.total
+    clients_today = clients.today
 
     conversion_rate = round(total_clients / total_clicks * 100, 2) if total_clicks > 0 else 0.0
 
@@ -107,21 +114,14 @@ async def get_link_clicks_by_day(
     if not link:
         return []
 
-    start_date = date.today() - timedelta(days=days - 1)
+    start_date = utc_today() - timedelta(days=days - 1)
 
-    query = (
-        select(
-            func.date(LinkClick.created_at).label("click_date"),
-            func.count(LinkClick.id).label("clicks"),
-        )
-        .where(
-            LinkClick.link_id == link_id,
-            func.date(LinkClick.created_at) >= start_date,
-        )
-        .group_by(func.date(LinkClick.created_at))
+    query = apply_day_range(
+        select(DailyLinkStats.day, DailyLinkStats.clicks).where(DailyLinkStats.link_id == link_id),
+        DailyLinkStats.day, start_date, None,
     )
     result = await db.execute(query)
-    rows = {str(row.click_date): row.clicks for row in result.all()}
+    rows = {str(row.day): row.clicks for row in result.all()}
 
     daily_data = []
     for i in range(days):
@@ -135,29 +135,22 @@ async def get_link_clicks_by_day(
 async def get_clients_stats_by_day(
     db: AsyncSession, partner_id: int, days: int = 30
 ) -> list[ClientStatsResponse]:
-    start_date = date.today() - timedelta(days=days - 1)
+    start_date = utc_today() - timedelta(days=days - 1)
 
-    query = (
+    query = apply_day_range(
         select(
-            func.date(Client.created_at).label("client_date"),
-            Client.source,
-            func.count(Client.id).label("cnt"),
-        )
-        .where(
-            Client.partner_id == partner_id,
-            func.date(Client.created_at) >= start_date,
-        )
-        .group_by(func.date(Client.created_at), Client.source)
+            DailyPartnerStats.day,
+            DailyPartnerStats.clients_form,
+            DailyPartnerStats.clients_manual,
+        ).where(DailyPartnerStats.partner_id == partner_id),
+        DailyPartnerStats.day, start_date, None,
     )
     result = await db.execute(query)
     rows = result.all()
 
     data_map: dict[str, dict[str, int]] = {}
     for row in rows:
-        day_str = str(row.client_date)
-        if day_str not in data_map:
-            data_map[day_str] = {"form": 0, "manual": 0}
-        data_map[day_str][row.source] = row.cnt
+        data_map[str(row.day)] = {"form": row.clients_form, "manual": row.clients_manual}
 
     daily_data = []
     for i in range(days):
@@ -2,9 +2,8 @@
 
 import logging
 
-import httpx
-
 from app.config import get_settings
+from app.services.b24_http_client import b24_http
 
 logger = logging.getLogger(__name__)
 
@@ -22,37 +21,33 @@ def _get_headers() -> dict[str, str]:
 async def search_contacts(workflow_id: int, query: str) -> list[dict]:
     """Search contacts by name in B24 via b24-transfer-lead."""
     url = f"{_get_base_url()}/api/v1/workflows/{workflow_id}/b24/contacts/search"
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.get(url, headers=_get_headers(), params={"query": query})
-        resp.raise_for_status()
-        return resp.json()
+    resp = await b24_http.get(url, headers=_get_headers(), params={"query": query}, timeout=15.0)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def search_companies(workflow_id: int, query: str) -> list[dict]:
     """Search companies by title in B24 via b24-transfer-lead."""
     url = f"{_get_base_url()}/api/v1/workflows/{workflow_id}/b24/companies/search"
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.get(url, headers=_get_headers(), params={"query": query})
-        resp.raise_for_status()
-        return resp.json()
+    resp = await b24_http.get(url, headers=_get_headers(), params={"query": query}, timeout=15.0)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def create_contact(workflow_id: int, data: dict) -> dict:
     """Create a contact in B24 via b24-transfer-lead."""
     url = f"{_get_base_url()}/api/v1/workflows/{workflow_id}/b24/contacts"
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(url, headers=_get_headers(), json=data)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await b24_http.post(url, headers=_get_headers(), json=data, timeout=15.0)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def create_company(workflow_id: int, data: dict) -> dict:
     """Create a company in B24 via b24-transfer-lead."""
     url = f"{_get_base_url()}/api/v1/workflows/{workflow_id}/b24/companies"
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(url, headers=_get_headers(), json=data)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await b24_http.post(url, headers=_get_headers(), json=data, timeout=15.0)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def get_deals_by_entity(
@@ -61,8 +56,14 @@ async def get_deals_by_entity(
     entity_id: int | None = None,
     field_id: str | None = None,
     field_value: str | None = None,
+    modified_since: str | None = None,
+    after_id: int | None = None,
 ) -> list[dict]:
-    """Get deals filtered by contact/company and/or UF field from B24."""
+    """Get deals filtered by contact/company and/or UF field from B24.
+
+    modified_since (B24 DATE_MODIFY string) limits the result to deals changed since then.
+    With after_id only one B24 page (up to 50 deals with ID > after_id, by ID) is returned.
+    """
     url = f"{_get_base_url()}/api/v1/workflows/{workflow_id}/b24/deals"
     params: dict[str, str | int] = {}
     if entity_type is not None:
@@ -73,8 +74,11 @@ async def get_deals_by_entity(
         params["field_id"] = field_id
     if field_value is not None:
         params["field_value"] = field_value
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        resp = await client.get(url, headers=_get_headers(), params=params)
-        resp.raise_for_status()
-        return resp.json()
+    if modified_since is not None:
+        params["modified_since"] = modified_since
+    if after_id is not None:
+        params["after_id"] = after_id
+
+    resp = await b24_http.get(url, headers=_get_headers(), params=params, timeout=30.0)
+    resp.raise_for_status()
+    return resp.json()
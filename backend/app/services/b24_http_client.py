@@ -0,0 +1,162 @@
+"""Shared keep-alive HTTP client for calls to b24-transfer-lead."""
+
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses worth retrying for idempotent requests
+RETRY_STATUSES = {502, 503, 504}
+
+
+class B24HttpClient:
+    """One pooled httpx.AsyncClient reused by every b24-transfer-lead call.
+
+    Connections are kept alive between requests instead of a fresh TCP
+    connect per call. Each call passes its own timeout; GET requests are
+    retried on transport errors and 502/503/504 with full-jitter exponential
+    backoff (other methods are sent once, they are not idempotent).
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_expiry: float,
+        connect_timeout: float,
+        http2: bool,
+        get_retries: int,
+        retry_backoff: float,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.http2 = http2
+        self.get_retries = get_retries
+        self.retry_backoff = retry_backoff
+        self._client: httpx.AsyncClient | None = None
+
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.request_seconds = 0.0
+
+    def start(self) -> None:
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(10.0, connect=self.connect_timeout),
+            http2=self.http2,
+        )
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _timeout(self, timeout: float) -> httpx.Timeout:
+        return httpx.Timeout(timeout, connect=min(self.connect_timeout, timeout))
+
+    async def request(self, method: str, url: str, *, timeout: float = 10.0, **kwargs) -> httpx.Response:
+        """Send a request through the pool; raises httpx.RequestError when the service is unreachable."""
+        if self._client is None:
+            self.start()
+
+        attempts = 1 + (self.get_retries if method == "GET" else 0)
+        for attempt in range(attempts):
+            started = time.monotonic()
+            self.requests += 1
+            try:
+                resp = await self._client.request(method, url, timeout=self._timeout(timeout), **kwargs)
+            except httpx.TransportError as e:
+                self.errors += 1
+                if attempt + 1 >= attempts:
+                    raise
+                logger.warning("b24-transfer-lead %s %s failed (%s), retrying", method, url, e)
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                    self.request_seconds += time.monotonic() - started
+                    return resp
+                self.errors += 1
+                logger.warning("b24-transfer-lead %s %s returned %s, retrying", method, url, resp.status_code)
+                await resp.aclose()
+
+            self.retries += 1
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * 2 ** attempt))
+        raise AssertionError("unreachable")
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def _pool_connections(self) -> tuple[int, int]:
+        """(open, idle) connections of the underlying httpcore pool."""
+        if self._client is None:
+            return 0, 0
+        pool = getattr(self._client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return len(connections), sum(1 for conn in connections if conn.is_idle())
+
+    def stats(self) -> dict:
+        open_connections, idle_connections = self._pool_connections()
+        completed = self.requests - self.errors
+        return {
+            "running": self._client is not None,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "open_connections": open_connections,
+            "idle_connections": idle_connections,
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "avg_request_ms": round(self.request_seconds / completed * 1000, 1) if completed > 0 else 0.0,
+        }
+
+
+def _create_client() -> B24HttpClient:
+    settings = get_settings()
+    return B24HttpClient(
+        max_connections=settings.B24_HTTP_MAX_CONNECTIONS,
+        max_keepalive=settings.B24_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.B24_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        connect_timeout=settings.B24_HTTP_CONNECT_TIMEOUT_SECONDS,
+        http2=settings.B24_HTTP2,
+        get_retries=settings.B24_HTTP_GET_RETRIES,
+        retry_backoff=settings.B24_HTTP_RETRY_BACKOFF_SECONDS,
+    )
+
+
+b24_http = _create_client()
+
+
+def start_b24_http() -> None:
+    """Open the shared b24-transfer-lead connection pool."""
+    b24_http.start()
+    logger.info("B24 HTTP client started (max %d connections)", b24_http.max_connections)
+
+
+async def stop_b24_http() -> None:
+    """Close pooled connections to b24-transfer-lead."""
+    await b24_http.stop()
+    logger.info("B24 HTTP client stopped")
@@ -1,8 +1,7 @@
 import logging
 
-import httpx
-
 from app.config import get_settings
+from app.services.b24_http_client import b24_http
 
 logger = logging.getLogger(__name__)
 
@@ -23,101 +22,101 @@ class B24IntegrationService:
         payload: dict = {"name": name}
         if bitrix24_webhook_url:
             payload["bitrix24_webhook_url"] = bitrix24_webhook_url
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                self._url("/workflows"),
-                headers=self.headers,
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.post(
+            self._url("/workflows"),
+            headers=self.headers,
+            json=payload,
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_workflow(self, workflow_id: int) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def delete_workflow(self, workflow_id: int) -> None:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.delete(
-                self._url(f"/workflows/{workflow_id}"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
+        resp = await b24_http.delete(
+            self._url(f"/workflows/{workflow_id}"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
 
     # --- Settings ---
 
     async def get_settings(self, workflow_id: int) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}/settings"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}/settings"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def update_settings(self, workflow_id: int, data: dict) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.put(
-                self._url(f"/workflows/{workflow_id}/settings"),
-                headers=self.headers,
-                json=data,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.put(
+            self._url(f"/workflows/{workflow_id}/settings"),
+            headers=self.headers,
+            json=data,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def generate_api_token(self, workflow_id: int) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                self._url(f"/workflows/{workflow_id}/settings/generate-token"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.post(
+            self._url(f"/workflows/{workflow_id}/settings/generate-token"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def create_field_mapping(self, workflow_id: int, mapping: dict) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                self._url(f"/workflows/{workflow_id}/fields/mapping"),
-                headers=self.headers,
-                json=mapping,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.post(
+            self._url(f"/workflows/{workflow_id}/fields/mapping"),
+            headers=self.headers,
+            json=mapping,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     # --- Bitrix24 data ---
 
     async def get_funnels(self, workflow_id: int) -> list:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}/settings/funnels"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}/settings/funnels"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_stages(self, workflow_id: int, category_id: int = 0) -> list:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}/settings/stages"),
-                headers=self.headers,
-                params={"category_id": category_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}/settings/stages"),
+            headers=self.headers,
+            params={"category_id": category_id},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_lead_statuses(self, workflow_id: int) -> list:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}/settings/lead-statuses"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}/settings/lead-statuses"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     # --- Leads ---
 
@@ -127,45 +126,84 @@ class B24IntegrationService:
         payload: dict = {"name": name, "phone": phone}
         if extra_fields:
             payload.update(extra_fields)
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                self._url(f"/workflows/{workflow_id}/leads"),
-                headers=self.headers,
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.post(
+            self._url(f"/workflows/{workflow_id}/leads"),
+            headers=self.headers,
+            json=payload,
+            timeout=120.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def import_lead(self, workflow_id: int, data: dict) -> dict:
         """Import a lead into b24-transfer-lead (local only, no B24 push)."""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                self._url(f"/workflows/{workflow_id}/leads/import"),
-                headers=self.headers,
-                json=data,
-            )
-            resp.raise_for_status()
-            return resp.json()
-
-    async def get_leads(self, workflow_id: int) -> list:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}/leads"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.post(
+            self._url(f"/workflows/{workflow_id}/leads/import"),
+            headers=self.headers,
+            json=data,
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def import_leads_batch(self, workflow_id: int, leads: list[dict]) -> dict:
+        """Import many leads into b24-transfer-lead in one request (local only, deduplicated by deal_id)."""
+        resp = await b24_http.post(
+            self._url(f"/workflows/{workflow_id}/leads/import/batch"),
+            headers=self.headers,
+            json={"leads": leads},
+            timeout=60.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def get_leads(
+        self,
+        workflow_id: int,
+        columns: list[str] | None = None,
+        status: list[str] | None = None,
+        deal_status: list[str] | None = None,
+        bitrix24_lead_id: str | None = None,
+        after_id: int | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """List workflow leads.
+
+        columns limits the returned keys (plus "fields" for additional fields);
+        without it every column and the additional fields are returned.
+        """
+        params: dict = {}
+        if columns:
+            params["columns"] = ",".join(columns)
+        if status:
+            params["status"] = status
+        if deal_status:
+            params["deal_status"] = deal_status
+        if bitrix24_lead_id is not None:
+            params["bitrix24_lead_id"] = bitrix24_lead_id
+        if after_id is not None:
+            params["after_id"] = after_id
+        if limit is not None:
+            params["limit"] = limit
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}/leads"),
+            headers=self.headers,
+            params=params,
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     # --- Stats ---
 
     async def get_conversion_stats(self, workflow_id: int) -> dict:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                self._url(f"/workflows/{workflow_id}/stats/conversion"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await b24_http.get(
+            self._url(f"/workflows/{workflow_id}/stats/conversion"),
+            headers=self.headers,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
 
 b24_service = B24IntegrationService()
@@ -0,0 +1,306 @@
+"""Change feed of new notifications and chat messages per partner (long-poll by cursor).
+
+Every read is set-based over a list of (partner_id, cursor) entries, so the
+per-partner endpoint and the bot's bulk endpoint share the same queries.
+"""
+
+import asyncio
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.chat_message import ChatMessage
+from app.models.notification import Notification, NotificationRead
+from app.models.partner import Partner
+from app.schemas.notification import NotificationChangesResponse, PartnerNotificationResponse
+from app.services.change_notifier import change_notifier
+from app.services.chat_service import _build_message_response
+from app.services.notification_service import _file_url
+
+# Max IDs per IN (...) clause
+_CHUNK_SIZE = 500
+
+
+def parse_cursor(since: str) -> tuple[int, int]:
+    """'<notification_id>:<chat_message_id>' → (notification_id, chat_message_id); ValueError if malformed."""
+    notification_part, chat_part = since.split(":")
+    notification_id, chat_message_id = int(notification_part), int(chat_part)
+    if notification_id < 0 or chat_message_id < 0:
+        raise ValueError(since)
+    return notification_id, chat_message_id
+
+
+def format_cursor(notification_id: int, chat_message_id: int) -> str:
+    return f"{notification_id}:{chat_message_id}"
+
+
+async def get_current_cursors(db: AsyncSession, partner_ids: list[int]) -> dict[int, str]:
+    """Cursors pointing past everything each partner can currently see."""
+    broadcast_id = (await db.execute(
+        select(func.max(Notification.id)).where(Notification.target_partner_id == None)  # noqa: E711
+    )).scalar() or 0
+    targeted: dict[int, int] = {}
+    chat: dict[int, int] = {}
+    unique_ids = list(dict.fromkeys(partner_ids))
+    for offset in range(0, len(unique_ids), _CHUNK_SIZE):
+        chunk = unique_ids[offset:offset + _CHUNK_SIZE]
+        targeted.update((await db.execute(
+            select(Notification.target_partner_id, func.max(Notification.id))
+            .where(Notification.target_partner_id.in_(chunk))
+            .group_by(Notification.target_partner_id)
+        )).all())
+        chat.update((await db.execute(
+            select(ChatMessage.partner_id, func.max(ChatMessage.id))
+            .where(ChatMessage.partner_id.in_(chunk), ChatMessage.sender_id != ChatMessage.partner_id)
+            .group_by(ChatMessage.partner_id)
+        )).all())
+    return {
+        partner_id: format_cursor(max(broadcast_id, targeted.get(partner_id, 0)), chat.get(partner_id, 0))
+        for partner_id in unique_ids
+    }
+
+
+async def get_current_cursor(db: AsyncSession, partner_id: int) -> str:
+    return (await get_current_cursors(db, [partner_id]))[partner_id]
+
+
+async def get_changes_bulk(
+    db: AsyncSession, entries: list[tuple[int, int, int]], limit: int,
+) -> list[NotificationChangesResponse]:
+    """Changes after the cursor of each (partner_id, notification_after, chat_message_after) entry.
+
+    Targeted notifications, broadcast notifications and chat messages come
+    from one windowed query each per chunk of active partners (ROW_NUMBER
+    per partner, at most `limit` rows after the partner's own cursor, passed
+    in as a CASE on the partner column), so one partner's cursor never
+    limits what another one gets. When a list is cut by a limit, the
+    entry's items stop at the cut, so the returned cursor never skips
+    anything. Results are in the order of `entries`; inactive partners get
+    no changes and are not queried.
+    """
+    # Lowest cursor per partner (the same partner may be listed more than once)
+    notification_after: dict[int, int] = {}
+    chat_message_after: dict[int, int] = {}
+    for partner_id, notification_id, chat_message_id in entries:
+        notification_after[partner_id] = min(notification_id, notification_after.get(partner_id, notification_id))
+        chat_message_after[partner_id] = min(chat_message_id, chat_message_after.get(partner_id, chat_message_id))
+    partner_ids = list(notification_after)
+
+    active: set[int] = set()
+    targeted: dict[int, list[Notification]] = {}
+    broadcast_ids: dict[int, list[int]] = {}
+    messages: dict[int, list[tuple[ChatMessage, Partner]]] = {}
+    for offset in range(0, len(partner_ids), _CHUNK_SIZE):
+        chunk = list((await db.execute(
+            select(Partner.id).where(
+                Partner.id.in_(partner_ids[offset:offset + _CHUNK_SIZE]),
+                Partner.is_active == True,  # noqa: E712
+            )
+        )).scalars())
+        if not chunk:
+            continue
+        active.update(chunk)
+
+        ranked = (
+            select(
+                Notification.id.label("notification_id"),
+                func.row_number().over(
+                    partition_by=Notification.target_partner_id, order_by=Notification.id,
+                ).label("rn"),
+            )
+            .where(
+                Notification.target_partner_id.in_(chunk),
+                Notification.id > case(
+                    {partner_id: notification_after[partner_id] for partner_id in chunk},
+                    value=Notification.target_partner_id,
+                ),
+            )
+            .subquery()
+        )
+        for notification in (await db.execute(
+            select(Notification)
+            .join(ranked, Notification.id == ranked.c.notification_id)
+            .where(ranked.c.rn <= limit)
+            .order_by(Notification.id)
+        )).scalars():
+            targeted.setdefault(notification.target_partner_id, []).append(notification)
+
+        # Broadcasts after each partner's own cursor (partners × broadcasts, windowed per partner)
+        ranked = (
+            select(
+                Partner.id.label("partner_id"),
+                Notification.id.label("notification_id"),
+                func.row_number().over(partition_by=Partner.id, order_by=Notification.id).label("rn"),
+            )
+            .join(Notification, and_(
+                Notification.target_partner_id == None,  # noqa: E711
+                Notification.id > case(
+                    {partner_id: notification_after[partner_id] for partner_id in chunk},
+                    value=Partner.id,
+                ),
+            ))
+            .where(Partner.id.in_(chunk))
+            .subquery()
+        )
+        for partner_id, notification_id in await db.execute(
+            select(ranked.c.partner_id, ranked.c.notification_id)
+            .where(ranked.c.rn <= limit)
+            .order_by(ranked.c.notification_id)
+        ):
+            broadcast_ids.setdefault(partner_id, []).append(notification_id)
+
+        # Only messages addressed to the partner (sent by an admin)
+        ranked = (
+            select(
+                ChatMessage.id.label("message_id"),
+                func.row_number().over(partition_by=ChatMessage.partner_id, order_by=ChatMessage.id).label("rn"),
+            )
+            .where(
+                ChatMessage.partner_id.in_(chunk),
+                ChatMessage.sender_id != ChatMessage.partner_id,
+                ChatMessage.id > case(
+                    {partner_id: chat_message_after[partner_id] for partner_id in chunk},
+                    value=ChatMessage.partner_id,
+                ),
+            )
+            .subquery()
+        )
+        for msg, sender in await db.execute(
+            select(ChatMessage, Partner)
+            .join(ranked, ChatMessage.id == ranked.c.message_id)
+            .join(Partner, Partner.id == ChatMessage.sender_id)
+            .where(ranked.c.rn <= limit)
+            .order_by(ChatMessage.id)
+        ):
+            messages.setdefault(msg.partner_id, []).append((msg, sender))
+
+    # Each broadcast is loaded once, however many partners get it
+    broadcasts: dict[int, Notification] = {}
+    unique_broadcast_ids = list({n_id for ids in broadcast_ids.values() for n_id in ids})
+    for offset in range(0, len(unique_broadcast_ids), _CHUNK_SIZE):
+        broadcasts.update((n.id, n) for n in (await db.execute(
+            select(Notification).where(Notification.id.in_(unique_broadcast_ids[offset:offset + _CHUNK_SIZE]))
+        )).scalars())
+
+    # Pick each entry's notifications first, then load read marks for exactly those
+    selected: list[list[Notification]] = []
+    for partner_id, after, _ in entries:
+        if partner_id not in active:
+            selected.append([])
+            continue
+        own = targeted.get(partner_id, [])
+        shared = [broadcasts[n_id] for n_id in broadcast_ids.get(partner_id, [])]
+        horizons = [items[-1].id for items in (own, shared) if len(items) >= limit]
+        items = sorted(
+            [n for n in own if n.id > after] + [n for n in shared if n.id > after],
+            key=lambda n: n.id,
+        )
+        if horizons:
+            items = [n for n in items if n.id <= min(horizons)]
+        selected.append(items[:limit])
+
+    read_pairs: set[tuple[int, int]] = set()
+    notification_ids = list({n.id for items in selected for n in items})
+    readers = list(dict.fromkeys(entry[0] for entry, items in zip(entries, selected) if items))
+    for offset in range(0, len(notification_ids), _CHUNK_SIZE):
+        id_chunk = notification_ids[offset:offset + _CHUNK_SIZE]
+        for reader_offset in range(0, len(readers), _CHUNK_SIZE):
+            read_pairs.update((await db.execute(
+                select(NotificationRead.partner_id, NotificationRead.notification_id).where(
+                    NotificationRead.notification_id.in_(id_chunk),
+                    NotificationRead.partner_id.in_(readers[reader_offset:reader_offset + _CHUNK_SIZE]),
+                )
+            )).all())
+
+    results = []
+    for (partner_id, after, chat_after), picked in zip(entries, selected):
+        notifications = [
+            PartnerNotificationResponse(
+                id=n.id,
+                title=n.title,
+                message=n.message,
+                created_at=n.created_at,
+                is_read=(partner_id, n.id) in read_pairs,
+                file_url=_file_url(n.file_path),
+                file_name=n.file_name,
+            )
+            for n in picked
+        ]
+        chat_messages = [
+            _build_message_response(msg, sender)
+            for msg, sender in messages.get(partner_id, [])
+            if partner_id in active and msg.id > chat_after
+        ]
+        results.append(NotificationChangesResponse(
+            partner_id=partner_id,
+            cursor=format_cursor(
+                notifications[-1].id if notifications else after,
+                chat_messages[-1].id if chat_messages else chat_after,
+            ),
+            notifications=notifications,
+            chat_messages=chat_messages,
+        ))
+    return results
+
+
+async def get_changes(
+    db: AsyncSession, partner_id: int, notification_after: int, chat_message_after: int, limit: int,
+) -> NotificationChangesResponse:
+    """Notifications and incoming chat messages of one partner with IDs above the cursor."""
+    return (await get_changes_bulk(db, [(partner_id, notification_after, chat_message_after)], limit))[0]
+
+
+async def wait_for_changes_bulk(
+    db: AsyncSession, entries: list[tuple[int, str | None]], timeout: float,
+) -> list[NotificationChangesResponse]:
+    """Long-poll over (partner_id, since) entries: return as soon as any entry has changes, or after timeout.
+
+    An entry without `since` gets the current cursor and no events, so a new
+    client starts from "now" instead of replaying the history; such a request
+    returns right away. The session is closed while waiting, so an idle
+    long-poll holds no database connection. Raises ValueError on a malformed
+    cursor.
+    """
+    parsed = [(partner_id, parse_cursor(since) if since is not None else None) for partner_id, since in entries]
+    settings = get_settings()
+    limit = settings.CHANGE_FEED_MAX_EVENTS
+
+    if any(cursor is None for _, cursor in parsed):
+        current = await get_current_cursors(db, [partner_id for partner_id, cursor in parsed if cursor is None])
+        changes = iter(await get_changes_bulk(
+            db, [(partner_id, *cursor) for partner_id, cursor in parsed if cursor is not None], limit,
+        ))
+        return [
+            NotificationChangesResponse(partner_id=partner_id, cursor=current[partner_id])
+            if cursor is None else next(changes)
+            for partner_id, cursor in parsed
+        ]
+
+    known = [(partner_id, *cursor) for partner_id, cursor in parsed]
+    partner_ids = list(dict.fromkeys(partner_id for partner_id, _ in parsed))
+    timeout = max(0.0, min(timeout, settings.CHANGE_FEED_MAX_WAIT_SECONDS))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    while True:
+        event = change_notifier.subscribe(partner_ids)
+        try:
+            changes = await get_changes_bulk(db, known, limit)
+            remaining = deadline - loop.time()
+            if remaining <= 0 or any(c.notifications or c.chat_messages for c in changes):
+                return changes
+            await db.close()
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            change_notifier.unsubscribe(partner_ids, event)
+
+
+async def wait_for_changes(
+    db: AsyncSession, partner_id: int, since: str | None, timeout: float,
+) -> NotificationChangesResponse:
+    """Long-poll the changes of one partner (see wait_for_changes_bulk)."""
+    return (await wait_for_changes_bulk(db, [(partner_id, since)], timeout))[0]
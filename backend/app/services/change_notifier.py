@@ -0,0 +1,60 @@
+"""In-process wake-up signals for change feed long-polls."""
+
+import asyncio
+
+
+class ChangeNotifier:
+    """In-process wake-up of long-poll requests waiting for a partner's changes.
+
+    Writers call publish() after committing a notification or chat message;
+    waiters subscribe() before reading the database, so a change committed
+    between the read and the wait still wakes them. Only signals are passed,
+    the data is always read from the database by cursor.
+    """
+
+    def __init__(self):
+        self._waiters: dict[int, set[asyncio.Event]] = {}
+        self.waiting = 0
+        self.published = 0
+        self.wakeups = 0
+
+    def subscribe(self, partner_ids: list[int]) -> asyncio.Event:
+        """One event woken by a change of any of the partners (the bot waits on many at once)."""
+        event = asyncio.Event()
+        for partner_id in partner_ids:
+            self._waiters.setdefault(partner_id, set()).add(event)
+        self.waiting += 1
+        return event
+
+    def unsubscribe(self, partner_ids: list[int], event: asyncio.Event) -> None:
+        for partner_id in partner_ids:
+            waiters = self._waiters.get(partner_id)
+            if waiters is None:
+                continue
+            waiters.discard(event)
+            if not waiters:
+                del self._waiters[partner_id]
+        self.waiting -= 1
+
+    def publish(self, partner_id: int | None) -> None:
+        """Wake waiters of one partner, or of every partner for a broadcast (partner_id=None)."""
+        self.published += 1
+        if partner_id is None:
+            events = {event for waiters in self._waiters.values() for event in waiters}
+        else:
+            events = self._waiters.get(partner_id, set())
+        for event in events:
+            if not event.is_set():
+                event.set()
+                self.wakeups += 1
+
+    def stats(self) -> dict:
+        return {
+            "waiting_partners": len(self._waiters),
+            "waiting_requests": self.waiting,
+            "published": self.published,
+            "wakeups": self.wakeups,
+        }
+
+
+change_notifier = ChangeNotifier()
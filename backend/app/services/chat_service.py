@@ -10,6 +10,7 @@ from app.config import get_settings
 from app.models.chat_message import ChatMessage
 from app.models.partner import Partner
 from app.schemas.chat import ChatConversationPreview, ChatMessageResponse
+from app.services.change_notifier import change_notifier
 
 ALLOWED_EXTENSIONS = {
     "jpg", "jpeg", "png", "gif", "webp",
@@ -225,6 +226,7 @@ async def send_message_admin(
     db.add(msg)
     await db.commit()
     await db.refresh(msg)
+    change_notifier.publish(partner_id)
     sender = (await db.execute(select(Partner).where(Partner.id == admin_id))).scalar_one()
     return _build_message_response(msg, sender)
 
@@ -256,6 +258,7 @@ async def send_message_with_file_admin(
     db.add(msg)
     await db.commit()
     await db.refresh(msg)
+    change_notifier.publish(partner_id)
     sender = (await db.execute(select(Partner).where(Partner.id == admin_id))).scalar_one()
     return _build_message_response(msg, sender)
 
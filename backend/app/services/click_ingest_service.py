@@ -0,0 +1,174 @@
+"""Buffered click ingestion: public redirects enqueue clicks, a background writer batches them into link_clicks."""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.click import LinkClick
+from app.services import rollup_service
+
+logger = logging.getLogger(__name__)
+
+
+class ClickIngestor:
+    """In-process bounded queue of LinkClick rows drained by one writer task.
+
+    Redirect handlers call enqueue() and never touch the database; the writer
+    flushes a batch when it reaches batch_size rows or flush_interval seconds
+    after its first row, whichever comes first.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict] | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def enqueue(
+        self,
+        link_id: int,
+        ip_address: str | None,
+        user_agent: str | None,
+        referer: str | None,
+    ) -> bool:
+        """Queue one click without blocking. Returns False if the click was dropped."""
+        if self._queue is None or self._stopping.is_set():
+            self.dropped += 1
+            logger.warning("Click ingestor is not running, dropped click for link %s", link_id)
+            return False
+
+        row = {
+            "link_id": link_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "referer": referer,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Click queue is full (%d), dropped click for link %s", self.max_size, link_id)
+            return False
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    async def _collect_batch(self) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._stopping.is_set():
+                # Shutting down: take whatever is already queued, don't wait for more
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    break
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write_batch(self, batch: list[dict]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(LinkClick).values(batch))
+                await rollup_service.add_link_clicks(db, batch)
+                await db.commit()
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error("Failed to flush %d clicks: %s", len(batch), e)
+            return
+        self.flushed += len(batch)
+        self.batches += 1
+
+    async def _run(self) -> None:
+        logger.info("Click ingest writer started")
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = await self._collect_batch()
+            if batch:
+                await self._write_batch(batch)
+        logger.info("Click ingest writer stopped")
+
+    def start(self) -> asyncio.Task:
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="click_ingest_writer")
+        return self._task
+
+    async def stop(self) -> None:
+        """Flush everything still queued and stop the writer."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await self._task
+        except Exception as e:
+            logger.error("Click ingest writer failed: %s", e)
+        self._task = None
+        self._queue = None
+
+
+def _create_ingestor() -> ClickIngestor:
+    settings = get_settings()
+    return ClickIngestor(
+        max_size=settings.CLICK_QUEUE_MAX_SIZE,
+        batch_size=settings.CLICK_BATCH_SIZE,
+        flush_interval=settings.CLICK_FLUSH_INTERVAL_SECONDS,
+    )
+
+
+click_ingestor = _create_ingestor()
+
+
+def start_click_ingest() -> asyncio.Task:
+    """Start the background click writer as an asyncio task."""
+    task = click_ingestor.start()
+    logger.info("Click ingest background task started")
+    return task
+
+
+async def stop_click_ingest() -> None:
+    """Flush pending clicks and stop the background writer."""
+    await click_ingestor.stop()
+    logger.info("Click ingest background task stopped")
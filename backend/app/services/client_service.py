@@ -1,7 +1,8 @@
 import logging
+from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -10,6 +11,7 @@ from app.models.link import PartnerLink
 from app.models.partner import Partner
 from app.schemas.client import ClientCreateRequest, PublicFormRequest
 from app.services.external_api import send_client_webhook
+from app.services.link_cache_service import LinkSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,7 @@ async def _send_webhook_and_update(
     db: AsyncSession,
     client: Client,
     partner: Partner,
-    link: PartnerLink | None,
+    link: PartnerLink | LinkSnapshot | None,
 ) -> None:
     client_data = {
         "name": client.name,
@@ -86,7 +88,7 @@ async def create_client_manual(
 
 
 async def create_client_from_form(
-    db: AsyncSession, link: PartnerLink, data: PublicFormRequest
+    db: AsyncSession, link: PartnerLink | LinkSnapshot, data: PublicFormRequest
 ) -> Client:
     partner = await db.get(Partner, link.partner_id)
 
@@ -110,18 +112,85 @@ async def create_client_from_form(
     return client
 
 
+_CURSOR_TIME_FORMAT = "%Y%m%d%H%M%S%f"
+
+# Columns of the light client list (view=light): no link join, no contact fields
+_LIGHT_COLUMNS = (
+    Client.id,
+    Client.name,
+    Client.source,
+    Client.created_at,
+    Client.is_paid,
+    Client.deal_status,
+    Client.deal_status_name,
+    Client.deal_amount,
+    Client.partner_reward,
+)
+
+
+def format_client_cursor(created_at: datetime, client_id: int) -> str:
+    """Keyset cursor of a client: '<created_at as YYYYMMDDHHMMSSffffff>_<id>' (no ':' — fits Telegram callback data)."""
+    return f"{created_at.strftime(_CURSOR_TIME_FORMAT)}_{client_id}"
+
+
+def parse_client_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of format_client_cursor; ValueError if malformed."""
+    created_part, id_part = cursor.split("_")
+    return datetime.strptime(created_part, _CURSOR_TIME_FORMAT), int(id_part)
+
+
 async def get_clients(
-    db: AsyncSession, partner_id: int, skip: int = 0, limit: int = 50
-) -> list[Client]:
-    result = await db.execute(
-        select(Client)
-        .options(selectinload(Client.link))
-        .where(Client.partner_id == partner_id)
-        .order_by(Client.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return list(result.scalars().all())
+    db: AsyncSession,
+    partner_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    *,
+    after: str | None = None,
+    deal_status: str | None = None,
+    is_paid: bool | None = None,
+    source: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    light: bool = False,
+) -> tuple[list, str | None]:
+    """A page of the partner's clients, newest first (created_at, id), and the cursor of the next page.
+
+    With `after` (a cursor from a previous page) the page continues right
+    after that client by keyset, so deep pages cost the same as the first;
+    otherwise `skip` is used as before. The next cursor is None on the last
+    page. light=True selects only _LIGHT_COLUMNS (rows instead of Client
+    objects, no link loading). Raises ValueError on a malformed cursor.
+    """
+    conditions = [Client.partner_id == partner_id]
+    if deal_status is not None:
+        conditions.append(Client.deal_status == deal_status)
+    if is_paid is not None:
+        conditions.append(Client.is_paid == is_paid)
+    if source is not None:
+        conditions.append(Client.source == source)
+    if created_from is not None:
+        conditions.append(Client.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(Client.created_at < created_to)
+    if after is not None:
+        after_created_at, after_id = parse_client_cursor(after)
+        conditions.append(or_(
+            Client.created_at < after_created_at,
+            and_(Client.created_at == after_created_at, Client.id < after_id),
+        ))
+
+    query = select(*_LIGHT_COLUMNS) if light else select(Client).options(selectinload(Client.link))
+    query = query.where(*conditions).order_by(Client.created_at.desc(), Client.id.desc()).limit(limit + 1)
+    if after is None and skip:
+        query = query.offset(skip)
+
+    result = await db.execute(query)
+    items = list(result.all() if light else result.scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = format_client_cursor(items[-1].created_at, items[-1].id)
+    return items, next_cursor
 
 
 async def get_client(
@@ -1,22 +1,62 @@
 """Background sync task: fetches deals from B24 and creates Client records."""
 
 import asyncio
+import json
 import logging
-from datetime import datetime, timezone
+import math
+import time
+from datetime import date, datetime, timezone
+from urllib.parse import urlsplit
 
-from sqlalchemy import select
+from sqlalchemy import Row, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.database import AsyncSessionLocal
 from app.models.client import Client
+from app.models.deal_sync_state import DealSyncState
 from app.models.partner import Partner
-from app.services import b24_entity_service, system_settings_service
+from app.services import b24_entity_service, rollup_service, system_settings_service
 from app.services.b24_integration_service import b24_service
+from app.utils.rate_limit import KeyedTokenBuckets
 
 logger = logging.getLogger(__name__)
 
 _sync_task: asyncio.Task | None = None
+_cycle_lock = asyncio.Lock()
+_last_cycle: dict | None = None
+
+# Bitrix24 allows ~2 requests/second per portal; partners on one portal share a bucket
+_portal_buckets = KeyedTokenBuckets(
+    rate=get_settings().B24_PORTAL_RATE_PER_SECOND,
+    capacity=get_settings().B24_PORTAL_BURST,
+)
+_portal_by_workflow: dict[int, str] = {}
+
+# Leads per b24-transfer-lead batch import request
+LEAD_IMPORT_BATCH_SIZE = 500
+
+# Deals per crm.deal.list page
+B24_PAGE_SIZE = 50
+
+
+async def _fetch_deals(workflow_id: int, deal_filter: dict, modified_since: str | None) -> list[dict]:
+    """All matching deals, one B24 page per request, each paced by the portal's token bucket."""
+    portal = await _portal_key(workflow_id)
+    deals: list[dict] = []
+    after_id = 0
+    while True:
+        await _portal_buckets.acquire(portal)
+        page = await b24_entity_service.get_deals_by_entity(
+            workflow_id=workflow_id,
+            modified_since=modified_since,
+            after_id=after_id,
+            **deal_filter,
+        )
+        deals.extend(page)
+        if len(page) < B24_PAGE_SIZE:
+            return deals
+        after_id = max(int(deal["id"]) for deal in page)
 
 
 async def sync_deals_for_partner(
@@ -52,43 +92,77 @@ async def sync_deals_for_partner(
 
     # When UF tracking field is configured, use it as primary filter (skip entity filter)
     # because CONTACT_ID/COMPANY_ID refers to the deal's customer, not the partner
+    deal_filter = {
+        "entity_type": partner.b24_entity_type if not has_uf_field else None,
+        "entity_id": partner.b24_entity_id if not has_uf_field else None,
+        "field_id": deal_field if has_uf_field else None,
+        "field_value": field_value if has_uf_field else None,
+    }
+    filter_signature = json.dumps(deal_filter, sort_keys=True)
+
+    # Incremental: only deals modified since the last seen DATE_MODIFY
+    state = await db.get(DealSyncState, partner.id)
+    modified_since = None
+    if state is not None and state.filter_signature == filter_signature:
+        modified_since = state.last_date_modify
+
     try:
-        deals = await b24_entity_service.get_deals_by_entity(
-            workflow_id=partner.workflow_id,
-            entity_type=partner.b24_entity_type if not has_uf_field else None,
-            entity_id=partner.b24_entity_id if not has_uf_field else None,
-            field_id=deal_field if has_uf_field else None,
-            field_value=field_value if has_uf_field else None,
-        )
+        deals = await _fetch_deals(partner.workflow_id, deal_filter, modified_since)
     except Exception as e:
         logger.error("Failed to fetch deals for partner %s: %s", partner.id, e)
         return 0
 
-    created_count = 0
+    # All known deals for the partner in one query (deal_id, plus external_id
+    # for clients synced before deal_id existed)
+    known_result = await db.execute(
+        select(
+            Client.id,
+            Client.deal_id,
+            Client.external_id,
+            Client.source,
+            Client.deal_status,
+            Client.deal_amount,
+            Client.is_paid,
+            Client.created_at,
+        ).where(Client.partner_id == partner.id)
+    )
+    # Updates are keyed by deal_id (and by external_id only for synced deals:
+    # form clients keep a B24 *lead* ID there); other external_id matches are skipped
+    known: dict[str, Row] = {}
+    legacy_external_ids: set[str] = set()
+    for row in known_result.all():
+        if row.external_id:
+            if row.source == "b24_sync":
+                known.setdefault(row.external_id, row)
+            else:
+                legacy_external_ids.add(row.external_id)
+        if row.deal_id:
+            known[row.deal_id] = row
+
+    pct = partner.reward_percentage
+    if pct is None:
+        pct = get_settings().DEFAULT_REWARD_PERCENTAGE
+    now = datetime.utcnow()
+
+    new_clients: list[dict] = []
+    lead_imports: list[dict] = []
+    client_updates: list[dict] = []
+    updated_days: set[date] = set()
+    seen_ids: set[str] = set()
+    max_date_modify = state.last_date_modify if modified_since else None
+    max_deal_id = state.max_deal_id if modified_since else None
+
     for deal in deals:
         deal_id_str = str(deal.get("id", ""))
-        if not deal_id_str:
+        if not deal_id_str or deal_id_str in seen_ids:
             continue
+        seen_ids.add(deal_id_str)
 
-        # Deduplicate by deal_id
-        existing = await db.execute(
-            select(Client).where(
-                Client.partner_id == partner.id,
-                Client.deal_id == deal_id_str,
-            )
-        )
-        if existing.scalar_one_or_none():
-            continue
-
-        # Also check by external_id for backward compatibility
-        existing_ext = await db.execute(
-            select(Client).where(
-                Client.partner_id == partner.id,
-                Client.external_id == deal_id_str,
-            )
-        )
-        if existing_ext.scalar_one_or_none():
-            continue
+        date_modify = deal.get("date_modify")
+        if date_modify and (max_date_modify is None or _parse_b24_datetime(date_modify) > _parse_b24_datetime(max_date_modify)):
+            max_date_modify = date_modify
+        if deal_id_str.isdigit():
+            max_deal_id = max(max_deal_id or 0, int(deal_id_str))
 
         # Calculate partner reward
         deal_amount = 0.0
@@ -99,104 +173,225 @@ async def sync_deals_for_partner(
 
         partner_reward = 0.0
         if deal_amount > 0:
-            pct = partner.reward_percentage
-            if pct is None:
-                pct = get_settings().DEFAULT_REWARD_PERCENTAGE
             partner_reward = round(deal_amount * pct / 100, 2)
 
         deal_title = deal.get("title") or f"Deal #{deal_id_str}"
         deal_stage = deal.get("stage_id")
 
-        client = Client(
-            partner_id=partner.id,
-            source="b24_sync",
-            name=deal_title,
-            deal_id=deal_id_str,
-            external_id=deal_id_str,
-            deal_amount=deal_amount,
-            partner_reward=partner_reward,
-            deal_status=deal_stage,
+        existing = known.get(deal_id_str)
+        if existing is None and deal_id_str in legacy_external_ids:
+            continue
+        if existing is not None:
+            # Known deal: pick up stage and amount changes
+            if existing.deal_status == deal_stage and (existing.deal_amount or 0.0) == deal_amount:
+                continue
+            change = {"id": existing.id, "deal_status": deal_stage, "deal_amount": deal_amount}
+            if not existing.is_paid:
+                # Paid rewards are settled; don't rewrite them
+                change["partner_reward"] = partner_reward
+            client_updates.append(change)
+            updated_days.add((existing.created_at or now).date())
+            continue
+
+        new_clients.append({
+            "partner_id": partner.id,
+            "source": "b24_sync",
+            "name": deal_title,
+            "deal_id": deal_id_str,
+            "external_id": deal_id_str,
+            "deal_amount": deal_amount,
+            "partner_reward": partner_reward,
+            "deal_status": deal_stage,
+            "created_at": now,
+        })
+        lead_imports.append({
+            "name": deal_title,
+            "phone": "",
+            "bitrix24_lead_id": deal_id_str,
+            "deal_id": deal_id_str,
+            "deal_amount": str(deal_amount) if deal_amount else None,
+            "deal_status": deal_stage,
+            "status": "PROCESSED",
+        })
+
+    created_count = len(new_clients)
+    if new_clients:
+        await db.execute(insert(Client), new_clients)
+        updated_days.add(now.date())
+    if client_updates:
+        # Bulk UPDATE by primary key
+        await db.execute(update(Client), client_updates)
+
+    if state is None:
+        state = DealSyncState(partner_id=partner.id)
+        db.add(state)
+    state.filter_signature = filter_signature
+    state.last_date_modify = max_date_modify
+    state.max_deal_id = max_deal_id
+    await db.commit()
+
+    if updated_days:
+        # Core/bulk statements bypass the ORM flush events that keep rollups current
+        rollup_service.mark_partner_days_dirty(partner.id, updated_days)
+    if created_count or client_updates:
+        logger.info(
+            "Synced partner %s: %d new deals, %d updated (%s)",
+            partner.id, created_count, len(client_updates),
+            f"modified since {modified_since}" if modified_since else "full",
         )
-        db.add(client)
-        created_count += 1
 
-        # Also create Lead in b24-transfer-lead
+    # Also create Leads in b24-transfer-lead
+    for offset in range(0, len(lead_imports), LEAD_IMPORT_BATCH_SIZE):
+        chunk = lead_imports[offset:offset + LEAD_IMPORT_BATCH_SIZE]
         try:
-            await b24_service.import_lead(
-                workflow_id=partner.workflow_id,
-                data={
-                    "name": deal_title,
-                    "phone": "",
-                    "bitrix24_lead_id": deal_id_str,
-                    "deal_id": deal_id_str,
-                    "deal_amount": str(deal_amount) if deal_amount else None,
-                    "deal_status": deal_stage,
-                    "status": "PROCESSED",
-                },
-            )
+            await b24_service.import_leads_batch(partner.workflow_id, chunk)
         except Exception as e:
             logger.warning(
-                "Failed to import lead to b24-transfer-lead for deal %s: %s",
-                deal_id_str, e,
+                "Failed to import %d leads to b24-transfer-lead for partner %s: %s",
+                len(chunk), partner.id, e,
             )
 
-    if created_count > 0:
-        await db.commit()
-        logger.info("Synced %d new deals for partner %s", created_count, partner.id)
-
     return created_count
 
 
+def _parse_b24_datetime(value: str) -> datetime:
+    """B24 DATE_MODIFY ("2024-01-05T12:00:00+03:00") as an aware datetime for comparison."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def _portal_key(workflow_id: int) -> str:
+    """Bitrix24 portal host behind a workflow, used to share its rate limit.
+
+    Only a portal resolved from the workflow settings is cached; after a
+    failed lookup the fallback is used for this call and the lookup is
+    retried next time.
+    """
+    portal = _portal_by_workflow.get(workflow_id)
+    if portal is not None:
+        return portal
+    try:
+        wf_settings = await b24_service.get_settings(workflow_id)
+    except Exception as e:
+        logger.debug("Could not resolve portal for workflow %s: %s", workflow_id, e)
+    else:
+        webhook_url = wf_settings.get("bitrix24_webhook_url") or get_settings().B24_WEBHOOK_URL
+        portal = (urlsplit(webhook_url).hostname if webhook_url else None) or "default"
+        _portal_by_workflow[workflow_id] = portal
+        return portal
+    webhook_url = get_settings().B24_WEBHOOK_URL
+    return (urlsplit(webhook_url).hostname if webhook_url else None) or "default"
+
+
+async def _sync_partner(partner_id: int, tracking_config: dict) -> dict:
+    """Sync one partner in its own session; failures are reported, never raised."""
+    started = time.monotonic()
+    result = {"partner_id": partner_id, "created": 0, "seconds": 0.0, "error": None}
+    try:
+        async with AsyncSessionLocal() as db:
+            partner = await db.get(Partner, partner_id)
+            if partner is None:
+                return result
+            result["created"] = await sync_deals_for_partner(db, partner, tracking_config)
+    except Exception as e:
+        result["error"] = str(e)
+        logger.error("Sync failed for partner %s: %s", partner_id, e)
+    finally:
+        result["seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
 async def run_sync_cycle() -> dict:
     """Run one sync cycle for all eligible partners.
 
-    Returns dict with sync results summary.
+    Partners are synced by DEAL_SYNC_WORKERS concurrent workers, each with its
+    own session; B24 calls are throttled per portal. Returns a summary with
+    per-partner timings and p50/p95 (also kept as last_cycle_report()).
     """
-    total_created = 0
-    total_partners = 0
-    errors = 0
-
-    async with AsyncSessionLocal() as db:
-        tracking_config = await system_settings_service.get_tracking_config(db)
-
-        # Get all partners with b24_entity_id
-        result = await db.execute(
-            select(Partner).where(
-                Partner.b24_entity_id.isnot(None),
-                Partner.b24_entity_type.isnot(None),
-                Partner.is_active == True,  # noqa: E712
+    global _last_cycle
+    settings = get_settings()
+
+    async with _cycle_lock:
+        cycle_started = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            tracking_config = await system_settings_service.get_tracking_config(db)
+
+            # Get all partners with b24_entity_id
+            result = await db.execute(
+                select(Partner.id).where(
+                    Partner.b24_entity_id.isnot(None),
+                    Partner.b24_entity_type.isnot(None),
+                    Partner.is_active == True,  # noqa: E712
+                )
             )
-        )
-        partners = result.scalars().all()
+            partner_ids = list(result.scalars().all())
 
-        for partner in partners:
-            total_partners += 1
-            try:
-                created = await sync_deals_for_partner(db, partner, tracking_config)
-                total_created += created
-            except Exception as e:
-                errors += 1
-                logger.error("Sync failed for partner %s: %s", partner.id, e)
-
-        # Update last run timestamp
-        await system_settings_service.set_setting(
-            db,
-            "b24_sync_last_run",
-            datetime.now(timezone.utc).isoformat(),
-        )
+        pending = iter(partner_ids)
+        results: list[dict] = []
+
+        async def worker() -> None:
+            for partner_id in pending:
+                results.append(await _sync_partner(partner_id, tracking_config))
+
+        workers = max(1, min(settings.DEAL_SYNC_WORKERS, len(partner_ids)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        async with AsyncSessionLocal() as db:
+            # Update last run timestamp
+            await system_settings_service.set_setting(
+                db,
+                "b24_sync_last_run",
+                datetime.now(timezone.utc).isoformat(),
+            )
+
+        total_created = sum(r["created"] for r in results)
+        errors = sum(1 for r in results if r["error"])
+        durations = sorted(r["seconds"] for r in results)
+        summary = {
+            "status": "completed",
+            "partners": len(results),
+            "created": total_created,
+            "errors": errors,
+            "workers": workers,
+            "duration_seconds": round(time.monotonic() - cycle_started, 3),
+            "timing": {
+                "p50_seconds": _percentile(durations, 50),
+                "p95_seconds": _percentile(durations, 95),
+                "max_seconds": durations[-1] if durations else 0.0,
+            },
+            # Slowest first
+            "partner_timings": sorted(results, key=lambda r: r["seconds"], reverse=True),
+        }
+        _last_cycle = summary
 
     logger.info(
-        "Sync cycle complete: %d partners processed, %d deals created, %d errors",
-        total_partners,
+        "Sync cycle complete: %d partners processed, %d deals created, %d errors in %.1fs (p50 %.2fs, p95 %.2fs)",
+        summary["partners"],
         total_created,
         errors,
+        summary["duration_seconds"],
+        summary["timing"]["p50_seconds"],
+        summary["timing"]["p95_seconds"],
     )
-    return {
-        "status": "completed",
-        "partners": total_partners,
-        "created": total_created,
-        "errors": errors,
-    }
+    return summary
+
+
+def last_cycle_report() -> dict | None:
+    """Summary of the most recent completed sync cycle, if any."""
+    return _last_cycle
 
 
 async def sync_loop() -> None:
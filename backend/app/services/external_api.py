@@ -77,7 +77,13 @@ async def fetch_bitrix_stats(partner_code: str, workflow_id: int | None = None)
         return {"success": False, "error": "Bitrix24 не настроен (нет workflow)"}
 
     try:
-        leads = await b24_service.get_leads(workflow_id)
+        leads = await b24_service.get_leads(
+            workflow_id,
+            columns=[
+                "id", "name", "bitrix24_lead_id", "status", "deal_status_name", "deal_amount",
+                "created_at", "assigned_by_name", "status_semantic_id",
+            ],
+        )
         conversion = await b24_service.get_conversion_stats(workflow_id)
 
         # Build status name map from Bitrix24 lead statuses
@@ -131,16 +137,24 @@ async def check_client_status(
         return {"error": "Bitrix24 не настроен (нет workflow)"}
 
     try:
-        leads = await b24_service.get_leads(workflow_id)
-        for lead in leads:
-            b24_id = str(lead.get("bitrix24_lead_id") or lead.get("id", ""))
-            if b24_id == external_id:
-                return {
-                    "found": True,
-                    "status": lead.get("status"),
-                    "status_semantic_id": lead.get("status_semantic_id"),
-                }
-        return {"found": False}
+        columns = ["id", "bitrix24_lead_id", "status", "status_semantic_id"]
+        leads = await b24_service.get_leads(workflow_id, columns=columns, bitrix24_lead_id=external_id)
+        if not leads and external_id.isdigit() and int(external_id) > 0:
+            # Leads not pushed to Bitrix24 are identified by their local ID
+            leads = [
+                lead
+                for lead in await b24_service.get_leads(
+                    workflow_id, columns=columns, after_id=int(external_id) - 1, limit=1
+                )
+                if not lead.get("bitrix24_lead_id") and str(lead.get("id")) == external_id
+            ]
+        if not leads:
+            return {"found": False}
+        return {
+            "found": True,
+            "status": leads[0].get("status"),
+            "status_semantic_id": leads[0].get("status_semantic_id"),
+        }
     except Exception as e:
         logger.error("Client status check failed: %s", e)
         return {"error": str(e)}
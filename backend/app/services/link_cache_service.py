@@ -0,0 +1,130 @@
+"""In-memory cache of active PartnerLink lookups for public redirect endpoints."""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.link import PartnerLink
+from app.services.link_service import _build_url_with_utm
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class LinkSnapshot:
+    """Immutable view of an active link: everything the public endpoints need."""
+
+    id: int
+    link_code: str
+    link_type: str
+    target_url: str | None  # UTM parameters already applied
+    landing_id: int | None
+    partner_id: int
+
+
+class LinkResolutionCache:
+    """LRU cache of link_code → LinkSnapshot with a per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[LinkSnapshot, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, link_code: str) -> LinkSnapshot | None:
+        entry = self._entries.get(link_code)
+        if entry is None:
+            self.misses += 1
+            return None
+        snapshot, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[link_code]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(link_code)
+        self.hits += 1
+        return snapshot
+
+    def put(self, snapshot: LinkSnapshot) -> None:
+        self._entries[snapshot.link_code] = (snapshot, time.monotonic() + self.ttl)
+        self._entries.move_to_end(snapshot.link_code)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, link_code: str) -> None:
+        if self._entries.pop(link_code, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def _create_cache() -> LinkResolutionCache:
+    settings = get_settings()
+    return LinkResolutionCache(
+        max_size=settings.LINK_CACHE_MAX_SIZE,
+        ttl=settings.LINK_CACHE_TTL_SECONDS,
+    )
+
+
+link_cache = _create_cache()
+
+
+async def resolve_active_link(db: AsyncSession, link_code: str) -> LinkSnapshot | None:
+    """Return a snapshot of the active link, hitting the database only on a cache miss."""
+    snapshot = link_cache.get(link_code)
+    if snapshot is not None:
+        return snapshot
+
+    result = await db.execute(
+        select(
+            PartnerLink.id,
+            PartnerLink.link_code,
+            PartnerLink.link_type,
+            PartnerLink.target_url,
+            PartnerLink.landing_id,
+            PartnerLink.partner_id,
+            PartnerLink.utm_source,
+            PartnerLink.utm_medium,
+            PartnerLink.utm_campaign,
+            PartnerLink.utm_content,
+            PartnerLink.utm_term,
+        ).where(
+            PartnerLink.link_code == link_code,
+            PartnerLink.is_active == True,  # noqa: E712
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    snapshot = LinkSnapshot(
+        id=row.id,
+        link_code=row.link_code,
+        link_type=row.link_type,
+        target_url=_build_url_with_utm(row.target_url, row) if row.target_url else None,
+        landing_id=row.landing_id,
+        partner_id=row.partner_id,
+    )
+    link_cache.put(snapshot)
+    return snapshot
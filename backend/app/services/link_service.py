@@ -33,6 +33,12 @@ def _build_url_with_utm(base_url: str, link: PartnerLink) -> str:
     return urlunparse(parsed._replace(query=new_query))
 
 
+def _invalidate_link_cache(link_code: str) -> None:
+    from app.services.link_cache_service import link_cache
+
+    link_cache.invalidate(link_code)
+
+
 async def create_link(
     db: AsyncSession, partner_id: int, data: LinkCreateRequest
 ) -> PartnerLink:
@@ -77,43 +83,79 @@ async def create_link(
     return link
 
 
-async def get_links(db: AsyncSession, partner_id: int) -> list[dict]:
-    result = await db.execute(
-        select(PartnerLink)
+def _links_with_counts_query(partner_id: int):
+    """PartnerLink rows with click/client counters from grouped subqueries (one round trip)."""
+    partner_link_ids = select(PartnerLink.id).where(PartnerLink.partner_id == partner_id)
+    clicks_sq = (
+        select(LinkClick.link_id, func.count(LinkClick.id).label("clicks_count"))
+        .where(LinkClick.link_id.in_(partner_link_ids))
+        .group_by(LinkClick.link_id)
+        .subquery()
+    )
+    clients_sq = (
+        select(Client.link_id, func.count(Client.id).label("clients_count"))
+        .where(Client.link_id.in_(partner_link_ids))
+        .group_by(Client.link_id)
+        .subquery()
+    )
+    clicks_count = func.coalesce(clicks_sq.c.clicks_count, 0).label("clicks_count")
+    clients_count = func.coalesce(clients_sq.c.clients_count, 0).label("clients_count")
+    query = (
+        select(PartnerLink, clicks_count, clients_count)
+        .outerjoin(clicks_sq, PartnerLink.id == clicks_sq.c.link_id)
+        .outerjoin(clients_sq, PartnerLink.id == clients_sq.c.link_id)
         .where(PartnerLink.partner_id == partner_id)
-        .order_by(PartnerLink.created_at.desc())
     )
-    links = result.scalars().all()
+    return query, clicks_count, clients_count
+
+
+def _link_to_dict(link: PartnerLink, clicks_count: int, clients_count: int) -> dict:
+    return {
+        "id": link.id,
+        "partner_id": link.partner_id,
+        "title": link.title,
+        "link_type": link.link_type,
+        "link_code": link.link_code,
+        "target_url": link.target_url,
+        "landing_id": link.landing_id,
+        "is_active": link.is_active,
+        "created_at": link.created_at,
+        "clicks_count": clicks_count or 0,
+        "clients_count": clients_count or 0,
+        "utm_source": link.utm_source,
+        "utm_medium": link.utm_medium,
+        "utm_campaign": link.utm_campaign,
+        "utm_content": link.utm_content,
+        "utm_term": link.utm_term,
+    }
 
-    enriched = []
-    for link in links:
-        clicks_count = await db.scalar(
-            select(func.count(LinkClick.id)).where(LinkClick.link_id == link.id)
-        )
-        clients_count = await db.scalar(
-            select(func.count(Client.id)).where(Client.link_id == link.id)
-        )
-        enriched.append(
-            {
-                "id": link.id,
-                "partner_id": link.partner_id,
-                "title": link.title,
-                "link_type": link.link_type,
-                "link_code": link.link_code,
-                "target_url": link.target_url,
-                "landing_id": link.landing_id,
-                "is_active": link.is_active,
-                "created_at": link.created_at,
-                "clicks_count": clicks_count or 0,
-                "clients_count": clients_count or 0,
-                "utm_source": link.utm_source,
-                "utm_medium": link.utm_medium,
-                "utm_campaign": link.utm_campaign,
-                "utm_content": link.utm_content,
-                "utm_term": link.utm_term,
-            }
-        )
-    return enriched
+
+async def get_links(
+    db: AsyncSession,
+    partner_id: int,
+    skip: int = 0,
+    limit: int | None = None,
+    sort_by: str = "created_at",
+) -> list[dict]:
+    query, clicks_count, clients_count = _links_with_counts_query(partner_id)
+
+    if sort_by == "clicks":
+        query = query.order_by(clicks_count.desc(), PartnerLink.id.desc())
+    elif sort_by == "clients":
+        query = query.order_by(clients_count.desc(), PartnerLink.id.desc())
+    else:
+        query = query.order_by(PartnerLink.created_at.desc(), PartnerLink.id.desc())
+
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
+    return [
+        _link_to_dict(row[0], row.clicks_count, row.clients_count)
+        for row in result.all()
+    ]
 
 
 async def get_link(db: AsyncSession, partner_id: int, link_id: int) -> PartnerLink:
@@ -135,31 +177,15 @@ async def get_link(db: AsyncSession, partner_id: int, link_id: int) -> PartnerLi
 async def get_link_with_counts(
     db: AsyncSession, partner_id: int, link_id: int
 ) -> dict:
-    link = await get_link(db, partner_id, link_id)
-    clicks_count = await db.scalar(
-        select(func.count(LinkClick.id)).where(LinkClick.link_id == link.id)
-    )
-    clients_count = await db.scalar(
-        select(func.count(Client.id)).where(Client.link_id == link.id)
-    )
-    return {
-        "id": link.id,
-        "partner_id": link.partner_id,
-        "title": link.title,
-        "link_type": link.link_type,
-        "link_code": link.link_code,
-        "target_url": link.target_url,
-        "landing_id": link.landing_id,
-        "is_active": link.is_active,
-        "created_at": link.created_at,
-        "clicks_count": clicks_count or 0,
-        "clients_count": clients_count or 0,
-        "utm_source": link.utm_source,
-        "utm_medium": link.utm_medium,
-        "utm_campaign": link.utm_campaign,
-        "utm_content": link.utm_content,
-        "utm_term": link.utm_term,
-    }
+    query, _, _ = _links_with_counts_query(partner_id)
+    result = await db.execute(query.where(PartnerLink.id == link_id))
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ссылка не найдена",
+        )
+    return _link_to_dict(row[0], row.clicks_count, row.clients_count)
 
 
 async def update_link(
@@ -172,6 +198,7 @@ async def update_link(
         setattr(link, field, value)
 
     await db.commit()
+    _invalidate_link_cache(link.link_code)
     await db.refresh(link)
     return link
 
@@ -180,6 +207,7 @@ async def delete_link(db: AsyncSession, partner_id: int, link_id: int) -> None:
     link = await get_link(db, partner_id, link_id)
     link.is_active = False
     await db.commit()
+    _invalidate_link_cache(link.link_code)
 
 
 async def get_embed_code(
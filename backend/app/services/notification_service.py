@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.models.notification import Notification, NotificationRead
+from app.services.change_notifier import change_notifier
 from app.schemas.notification import (
     NotificationResponse,
     PartnerNotificationResponse,
@@ -77,6 +78,7 @@ async def create_notification(
     db.add(notification)
     await db.commit()
     await db.refresh(notification)
+    change_notifier.publish(target_partner_id)
 
     return NotificationResponse(
         id=notification.id,
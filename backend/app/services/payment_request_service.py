@@ -16,6 +16,7 @@ from app.schemas.payment_request import (
     PaymentRequestCreate,
     PaymentRequestResponse,
 )
+from app.services.change_notifier import change_notifier
 
 
 def _build_deal_url(external_id: str | None, deal_id: str | None = None) -> str | None:
@@ -263,5 +264,6 @@ async def process_request(
     db.add(notification)
 
     await db.commit()
+    change_notifier.publish(pr.partner_id)
     await db.refresh(pr)
     return await _build_response(db, pr, include_clients=True)
@@ -0,0 +1,138 @@
+"""Report PDF rendering off the event loop, in a bounded worker pool."""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.config import get_settings
+from app.schemas.report import AllPartnersReportResponse, PartnerReportResponse
+from app.services.pdf_service import preload_fonts, render_report_pdf
+
+logger = logging.getLogger(__name__)
+
+
+class PDFRenderBusy(Exception):
+    """No render slot became free within the queue timeout."""
+
+
+class PDFRenderPool:
+    """Runs pdf_service in worker processes (or threads) with at most max_concurrent renders.
+
+    Each worker parses the report fonts once (preload_fonts initializer).
+    Requests beyond the limit wait up to queue_timeout seconds for a slot,
+    then fail with PDFRenderBusy so exports can't pile up behind each other.
+    """
+
+    def __init__(self, workers: int, max_concurrent: int, queue_timeout: float, use_processes: bool):
+        self.workers = workers
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._waiting = 0
+
+        self.rendered = 0
+        self.rejected = 0
+        self.failed = 0
+        self.render_seconds = 0.0
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=preload_fonts,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="pdf_render",
+                initializer=preload_fonts,
+            )
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, kind: str, report: PartnerReportResponse | AllPartnersReportResponse) -> bytes:
+        if self._executor is None:
+            self.start()
+
+        payload = report.model_dump()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PDFRenderBusy() from None
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+        started = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            pdf_bytes = await loop.run_in_executor(self._executor, render_report_pdf, kind, payload)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._active -= 1
+            self._slots.release()
+        self.rendered += 1
+        self.render_seconds += time.monotonic() - started
+        return pdf_bytes
+
+    def stats(self) -> dict:
+        return {
+            "running": self._executor is not None,
+            "mode": "process" if self.use_processes else "thread",
+            "workers": self.workers,
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "waiting": self._waiting,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "avg_render_ms": round(self.render_seconds / self.rendered * 1000, 1) if self.rendered else 0.0,
+        }
+
+
+def _create_pool() -> PDFRenderPool:
+    settings = get_settings()
+    return PDFRenderPool(
+        workers=settings.PDF_RENDER_WORKERS,
+        max_concurrent=settings.PDF_RENDER_MAX_CONCURRENT,
+        queue_timeout=settings.PDF_RENDER_QUEUE_TIMEOUT_SECONDS,
+        use_processes=settings.PDF_RENDER_USE_PROCESSES,
+    )
+
+
+pdf_renderer = _create_pool()
+
+
+async def render_partner_report_pdf(report: PartnerReportResponse) -> bytes:
+    return await pdf_renderer.render("partner", report)
+
+
+async def render_all_partners_report_pdf(report: AllPartnersReportResponse) -> bytes:
+    return await pdf_renderer.render("all_partners", report)
+
+
+def start_pdf_renderer() -> None:
+    """Spin up the PDF worker pool."""
+    pdf_renderer.start()
+    logger.info("PDF render pool started (%d workers)", pdf_renderer.workers)
+
+
+def stop_pdf_renderer() -> None:
+    """Wait for in-flight renders and shut the PDF worker pool down."""
+    pdf_renderer.stop()
+    logger.info("PDF render pool stopped")
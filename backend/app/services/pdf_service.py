@@ -1,7 +1,10 @@
+import copy
 from datetime import datetime
+from io import BytesIO
 
+from fontTools import ttLib
 from fpdf import FPDF
-from fpdf.fonts import FontFace
+from fpdf.fonts import FontFace, SubsetMap, TTFFont
 
 from app.schemas.report import (
     AllPartnersReportResponse,
@@ -10,6 +13,13 @@ from app.schemas.report import (
 )
 
 FONT_PATH = "/usr/share/fonts/truetype/dejavu/"
+REPORT_FONTS = (
+    ("DejaVu", "", "DejaVuSans.ttf"),
+    ("DejaVu", "B", "DejaVuSans-Bold.ttf"),
+)
+
+# Parsed fonts, filled once per process (PDF worker): fontkey -> (template, raw file bytes)
+_font_templates: dict[str, tuple[TTFFont, bytes]] = {}
 
 
 def _format_period(date_from, date_to) -> str:
@@ -36,6 +46,39 @@ def _today_str() -> str:
     return datetime.utcnow().strftime("%d.%m.%Y")
 
 
+def _load_font_template(family: str, style: str, filename: str) -> tuple[TTFFont, bytes]:
+    fontkey = f"{family.lower()}{style}"
+    cached = _font_templates.get(fontkey)
+    if cached is None:
+        probe = FPDF()
+        probe.add_font(family, style, FONT_PATH + filename)
+        with open(FONT_PATH + filename, "rb") as f:
+            data = f.read()
+        cached = _font_templates[fontkey] = (probe.fonts[fontkey], data)
+    return cached
+
+
+def preload_fonts() -> None:
+    """Parse the report fonts once for this process (PDF worker initializer)."""
+    for family, style, filename in REPORT_FONTS:
+        _load_font_template(family, style, filename)
+
+
+def _add_cached_font(pdf: FPDF, family: str, style: str, filename: str) -> None:
+    """add_font() without re-parsing the TTF: copy the parsed template.
+
+    Metrics, cmap and glyph ids are shared read-only; the document gets its own
+    TTFont handle and subset map because fpdf2 subsets them in place on output().
+    """
+    template, data = _load_font_template(family, style, filename)
+    font = copy.copy(template)
+    font.i = len(pdf.fonts) + 1
+    font.ttfont = ttLib.TTFont(BytesIO(data), recalcTimestamp=False, fontNumber=0, lazy=True)
+    font.missing_glyphs = []
+    font.subset = SubsetMap(font)
+    pdf.fonts[template.fontkey] = font
+
+
 class ReportPDF(FPDF):
     """Subclass with formal header/footer for legal-style documents."""
 
@@ -46,8 +89,8 @@ class ReportPDF(FPDF):
 
     def _ensure_fonts(self):
         if not self._header_ready:
-            self.add_font("DejaVu", "", FONT_PATH + "DejaVuSans.ttf")
-            self.add_font("DejaVu", "B", FONT_PATH + "DejaVuSans-Bold.ttf")
+            for family, style, filename in REPORT_FONTS:
+                _add_cached_font(self, family, style, filename)
             self._header_ready = True
 
     def header(self):
@@ -290,3 +333,12 @@ def generate_all_partners_report_pdf(report: AllPartnersReportResponse) -> bytes
     _render_signature_block(pdf)
 
     return bytes(pdf.output())
+
+
+def render_report_pdf(kind: str, report: dict) -> bytes:
+    """PDF worker entry point: kind is "partner" or "all_partners", report is the model_dump()."""
+    if kind == "partner":
+        return generate_partner_report_pdf(PartnerReportResponse.model_validate(report))
+    if kind == "all_partners":
+        return generate_all_partners_report_pdf(AllPartnersReportResponse.model_validate(report))
+    raise ValueError(f"Unknown report kind: {kind}")
@@ -0,0 +1,215 @@
+"""Disk cache of generated report PDFs, keyed by report parameters and partner data versions."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date
+from typing import Awaitable, Callable
+
+from app.config import get_settings
+from app.utils.date_range import utc_today
+
+logger = logging.getLogger(__name__)
+
+
+class ReportDataVersions:
+    """Per-partner counters bumped whenever a partner's clients, payments or payment requests change.
+
+    Versions live in memory; the random epoch makes keys from a previous
+    process run unreachable, so a restart can't serve stale artifacts.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex
+        self._versions: dict[int, int] = {}
+        self._global = 0
+
+    def bump(self, partner_ids) -> None:
+        for partner_id in partner_ids:
+            self._versions[partner_id] = self._versions.get(partner_id, 0) + 1
+            self._global += 1
+
+    def bump_all(self) -> None:
+        self.epoch = uuid.uuid4().hex
+        self._versions.clear()
+        self._global = 0
+
+    def version_for(self, partner_ids: list[int] | None) -> str:
+        if not partner_ids:
+            # All-partners report depends on every partner
+            return f"{self.epoch}:{self._global}"
+        parts = ",".join(f"{pid}.{self._versions.get(pid, 0)}" for pid in sorted(set(partner_ids)))
+        return f"{self.epoch}:{parts}"
+
+
+class ReportArtifactCache:
+    """Size-bounded LRU of PDF files under `directory`, with a per-entry TTL."""
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float, secret: str):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._secret = secret.encode()
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()  # key -> (size, expires_at)
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def make_key(
+        self,
+        kind: str,
+        partner_ids: list[int] | None,
+        date_from: date | None,
+        date_to: date | None,
+        data_version: str,
+    ) -> str:
+        # HMAC: files sit under UPLOAD_DIR, which is served statically
+        payload = json.dumps(
+            [
+                kind,
+                sorted(set(partner_ids)) if partner_ids else None,
+                date_from.isoformat() if date_from else None,
+                date_to.isoformat() if date_to else None,
+                data_version,
+                utc_today().isoformat(),  # the PDF header carries the generation date
+            ]
+        )
+        return hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _drop(self, key: str) -> None:
+        size, _ = self._entries.pop(key)
+        self._size -= size
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[1]:
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        try:
+            data = await asyncio.to_thread(_read_file, self._path(key))
+        except OSError as e:
+            logger.warning("Report cache file %s unreadable: %s", key, e)
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    async def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        try:
+            await asyncio.to_thread(_write_file, self._path(key), data)
+        except OSError as e:
+            logger.warning("Failed to store report artifact %s: %s", key, e)
+            return
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[0]
+        self._entries[key] = (len(data), time.monotonic() + self.ttl)
+        self._size += len(data)
+        self.stores += 1
+        while self._size > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every artifact, including files left over from a previous run."""
+        self._entries.clear()
+        self._size = 0
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".pdf") or name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_file(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _create_cache() -> ReportArtifactCache:
+    settings = get_settings()
+    return ReportArtifactCache(
+        directory=os.path.join(settings.UPLOAD_DIR, "report_cache"),
+        max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+        ttl=settings.REPORT_CACHE_TTL_SECONDS,
+        secret=settings.SECRET_KEY,
+    )
+
+
+report_data_versions = ReportDataVersions()
+report_cache = _create_cache()
+
+
+def bump_partner_versions(partner_ids) -> None:
+    """Invalidate cached reports that cover any of these partners."""
+    report_data_versions.bump(partner_ids)
+
+
+async def get_or_render_pdf(
+    kind: str,
+    partner_ids: list[int] | None,
+    date_from: date | None,
+    date_to: date | None,
+    render: Callable[[], Awaitable[bytes]],
+) -> bytes:
+    """Return the cached PDF for these parameters, or render, store and return it."""
+    key = report_cache.make_key(
+        kind, partner_ids, date_from, date_to, report_data_versions.version_for(partner_ids)
+    )
+    cached = await report_cache.get(key)
+    if cached is not None:
+        return cached
+
+    pdf_bytes = await render()
+    await report_cache.put(key, pdf_bytes)
+    return pdf_bytes
+
+
+def clear_report_cache() -> None:
+    """Remove artifacts left by a previous run (their data versions are gone)."""
+    report_cache.clear()
+    logger.info("Report PDF cache cleared (%s)", report_cache.directory)
@@ -1,14 +1,13 @@
 import logging
 from datetime import date
 
-from sqlalchemy import case, func, or_, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.click import LinkClick
 from app.models.client import Client
+from app.models.daily_stats import DailyLinkStats, DailyPartnerStats
 from app.models.link import PartnerLink
 from app.models.partner import Partner
-from app.models.payment_request import PaymentRequest
 from app.schemas.report import (
     AllPartnersReportResponse,
     AllPartnersReportRow,
@@ -16,6 +15,7 @@ from app.schemas.report import (
     PartnerReportResponse,
 )
 from app.services.b24_integration_service import b24_service
+from app.utils.date_range import apply_datetime_range, apply_day_range
 
 logger = logging.getLogger(__name__)
 
@@ -25,46 +25,36 @@ WON_STATUSES = {"WON", "C:WON"}
 LOST_STATUSES = {"LOSE", "C:LOSE"}
 
 
-def _apply_date_filter(query, column, date_from: date | None, date_to: date | None):
-    if date_from:
-        query = query.where(func.date(column) >= date_from)
-    if date_to:
-        query = query.where(func.date(column) <= date_to)
-    return query
-
-
-async def _compute_partner_metrics(
-    db: AsyncSession, partner_id: int, date_from: date | None, date_to: date | None
-) -> PartnerReportMetrics:
-    # Base client query with date filter
-    base_q = select(Client).where(Client.partner_id == partner_id)
-    base_q = _apply_date_filter(base_q, Client.created_at, date_from, date_to)
-
-    result = await db.execute(base_q)
-    clients = list(result.scalars().all())
+def _partner_stats_columns() -> list:
+    """SUM() columns over daily_partner_stats, shared by the single- and all-partner reports."""
+    return [
+        func.coalesce(func.sum(DailyPartnerStats.clients_total), 0).label("leads"),
+        func.coalesce(func.sum(DailyPartnerStats.sales), 0).label("sales"),
+        func.coalesce(func.sum(DailyPartnerStats.deals), 0).label("deals"),
+        func.coalesce(func.sum(DailyPartnerStats.won), 0).label("won"),
+        func.coalesce(func.sum(DailyPartnerStats.lost), 0).label("lost"),
+        func.coalesce(func.sum(DailyPartnerStats.amount), 0).label("amount"),
+        func.coalesce(func.sum(DailyPartnerStats.reward), 0).label("reward"),
+        func.coalesce(func.sum(DailyPartnerStats.paid_reward), 0).label("paid_reward"),
+        func.coalesce(func.sum(DailyPartnerStats.payment_requests_total), 0).label("pr_total"),
+        func.coalesce(func.sum(DailyPartnerStats.payment_requests_approved), 0).label("pr_approved"),
+        func.coalesce(func.sum(DailyPartnerStats.payment_requests_rejected), 0).label("pr_rejected"),
+        func.coalesce(func.sum(DailyPartnerStats.payment_requests_pending), 0).label("pr_pending"),
+        func.coalesce(func.sum(DailyPartnerStats.payment_requests_amount), 0).label("pr_amount"),
+    ]
 
-    total_leads = len(clients)
-    total_sales = sum(1 for c in clients if c.deal_amount and c.deal_amount > 0)
-    total_deal_amount = sum(c.deal_amount or 0 for c in clients)
-    total_commission = sum(c.partner_reward or 0 for c in clients)
-    paid_commission = sum(c.partner_reward or 0 for c in clients if c.is_paid)
-    unpaid_commission = sum(c.partner_reward or 0 for c in clients if not c.is_paid and c.partner_reward)
-    leads_in_progress = sum(
-        1 for c in clients
-        if c.deal_status not in FINAL_DEAL_STATUSES or c.deal_status is None
-    )
 
-    # Conversion metrics
-    total_deals = sum(
-        1 for c in clients
-        if c.deal_status is not None or (c.deal_amount and c.deal_amount > 0)
-    )
-    total_successful_deals = sum(
-        1 for c in clients if c.deal_status in WON_STATUSES
-    )
-    total_lost_deals = sum(
-        1 for c in clients if c.deal_status in LOST_STATUSES
-    )
+def _metrics_from_stats(stats, total_clicks: int) -> PartnerReportMetrics:
+    """Build report metrics from one row of _partner_stats_columns() sums."""
+    total_leads = stats.leads or 0
+    total_deals = stats.deals or 0
+    total_successful_deals = stats.won or 0
+    total_lost_deals = stats.lost or 0
+    amount = stats.amount or 0
+    reward = stats.reward or 0
+    paid_reward = stats.paid_reward or 0
+    # FINAL_DEAL_STATUSES is exactly WON_STATUSES | LOST_STATUSES
+    leads_in_progress = total_leads - total_successful_deals - total_lost_deals
     conversion_leads_to_deals = round(
         (total_deals / total_leads * 100) if total_leads > 0 else 0.0, 1
     )
@@ -72,41 +62,20 @@ async def _compute_partner_metrics(
         (total_successful_deals / total_deals * 100) if total_deals > 0 else 0.0, 1
     )
 
-    # Clicks
-    clicks_q = select(func.count(LinkClick.id)).where(
-        LinkClick.link_id.in_(
-            select(PartnerLink.id).where(PartnerLink.partner_id == partner_id)
-        )
-    )
-    clicks_q = _apply_date_filter(clicks_q, LinkClick.created_at, date_from, date_to)
-    total_clicks = (await db.execute(clicks_q)).scalar() or 0
-
-    # Payment requests
-    pr_q = select(PaymentRequest).where(PaymentRequest.partner_id == partner_id)
-    pr_q = _apply_date_filter(pr_q, PaymentRequest.created_at, date_from, date_to)
-    pr_result = await db.execute(pr_q)
-    payment_requests = list(pr_result.scalars().all())
-
-    pr_total = len(payment_requests)
-    pr_approved = sum(1 for pr in payment_requests if pr.status == "approved")
-    pr_rejected = sum(1 for pr in payment_requests if pr.status == "rejected")
-    pr_pending = sum(1 for pr in payment_requests if pr.status == "pending")
-    pr_amount = sum(pr.total_amount for pr in payment_requests)
-
     return PartnerReportMetrics(
         total_leads=total_leads,
-        total_sales=total_sales,
-        total_deal_amount=round(total_deal_amount, 2),
-        total_commission=round(total_commission, 2),
-        paid_commission=round(paid_commission, 2),
-        unpaid_commission=round(unpaid_commission, 2),
+        total_sales=stats.sales or 0,
+        total_deal_amount=round(amount, 2),
+        total_commission=round(reward, 2),
+        paid_commission=round(paid_reward, 2),
+        unpaid_commission=round(reward - paid_reward, 2),
         leads_in_progress=leads_in_progress,
         total_clicks=total_clicks,
-        payment_requests_total=pr_total,
-        payment_requests_approved=pr_approved,
-        payment_requests_rejected=pr_rejected,
-        payment_requests_pending=pr_pending,
-        payment_requests_amount=round(pr_amount, 2),
+        payment_requests_total=stats.pr_total or 0,
+        payment_requests_approved=stats.pr_approved or 0,
+        payment_requests_rejected=stats.pr_rejected or 0,
+        payment_requests_pending=stats.pr_pending or 0,
+        payment_requests_amount=round(stats.pr_amount or 0, 2),
         total_deals=total_deals,
         total_successful_deals=total_successful_deals,
         total_lost_deals=total_lost_deals,
@@ -115,6 +84,27 @@ async def _compute_partner_metrics(
     )
 
 
+def _clicks_query(date_from: date | None, date_to: date | None):
+    q = select(func.coalesce(func.sum(DailyLinkStats.clicks), 0).label("clicks")).join(
+        PartnerLink, PartnerLink.id == DailyLinkStats.link_id
+    )
+    return apply_day_range(q, DailyLinkStats.day, date_from, date_to)
+
+
+async def _compute_partner_metrics(
+    db: AsyncSession, partner_id: int, date_from: date | None, date_to: date | None
+) -> PartnerReportMetrics:
+    # Client and payment request counters from the daily rollup
+    stats_q = select(*_partner_stats_columns()).where(DailyPartnerStats.partner_id == partner_id)
+    stats_q = apply_day_range(stats_q, DailyPartnerStats.day, date_from, date_to)
+    stats = (await db.execute(stats_q)).one()
+
+    clicks_q = _clicks_query(date_from, date_to).where(PartnerLink.partner_id == partner_id)
+    total_clicks = (await db.execute(clicks_q)).scalar() or 0
+
+    return _metrics_from_stats(stats, total_clicks)
+
+
 async def _build_lead_status_maps(workflow_id: int) -> tuple[dict[str, str], dict[str, str]]:
     """Fetch leads from b24-transfer-lead and build status lookup maps.
 
@@ -124,7 +114,10 @@ async def _build_lead_status_maps(workflow_id: int) -> tuple[dict[str, str], dic
     by_ext_id: dict[str, str] = {}
     by_phone: dict[str, str] = {}
     try:
-        leads = await b24_service.get_leads(workflow_id)
+        leads = await b24_service.get_leads(
+            workflow_id,
+            columns=["id", "bitrix24_lead_id", "phone", "status", "deal_status_name"],
+        )
 
         # Resolve lead status IDs to names
         status_name_map: dict[str, str] = {}
@@ -177,7 +170,7 @@ async def _get_partner_clients_detail(
     db: AsyncSession, partner_id: int, date_from: date | None, date_to: date | None
 ) -> list[dict]:
     q = select(Client).where(Client.partner_id == partner_id).order_by(Client.created_at.desc())
-    q = _apply_date_filter(q, Client.created_at, date_from, date_to)
+    q = apply_datetime_range(q, Client.created_at, date_from, date_to)
 
     result = await db.execute(q)
     clients = list(result.scalars().all())
@@ -230,23 +223,48 @@ async def generate_partner_report(
 async def generate_all_partners_report(
     db: AsyncSession, date_from: date | None, date_to: date | None, partner_ids: list[int] | None = None
 ) -> AllPartnersReportResponse:
+    # One grouped pass: partners LEFT JOIN per-partner rollup sums and click sums
+    stats_sq = select(DailyPartnerStats.partner_id, *_partner_stats_columns()).group_by(
+        DailyPartnerStats.partner_id
+    )
+    stats_sq = apply_day_range(stats_sq, DailyPartnerStats.day, date_from, date_to)
+    clicks_sq = _clicks_query(date_from, date_to).add_columns(PartnerLink.partner_id).group_by(
+        PartnerLink.partner_id
+    )
+    if partner_ids:
+        stats_sq = stats_sq.where(DailyPartnerStats.partner_id.in_(partner_ids))
+        clicks_sq = clicks_sq.where(PartnerLink.partner_id.in_(partner_ids))
+    stats_sq = stats_sq.subquery()
+    clicks_sq = clicks_sq.subquery()
+
+    query = (
+        select(
+            Partner.id,
+            Partner.name,
+            Partner.email,
+            *[c for c in stats_sq.c if c.key != "partner_id"],
+            clicks_sq.c.clicks,
+        )
+        .outerjoin(stats_sq, stats_sq.c.partner_id == Partner.id)
+        .outerjoin(clicks_sq, clicks_sq.c.partner_id == Partner.id)
+        .order_by(Partner.created_at.desc())
+    )
     if partner_ids:
-        partners_q = select(Partner).where(Partner.id.in_(partner_ids)).order_by(Partner.created_at.desc())
+        query = query.where(Partner.id.in_(partner_ids))
     else:
-        partners_q = select(Partner).where(Partner.role == "partner").order_by(Partner.created_at.desc())
+        query = query.where(Partner.role == "partner")
 
-    result = await db.execute(partners_q)
-    partners = list(result.scalars().all())
+    result = await db.execute(query)
 
     rows: list[AllPartnersReportRow] = []
     totals = PartnerReportMetrics()
 
-    for p in partners:
-        metrics = await _compute_partner_metrics(db, p.id, date_from, date_to)
+    for row in result.all():
+        metrics = _metrics_from_stats(row, row.clicks or 0)
         rows.append(AllPartnersReportRow(
-            partner_id=p.id,
-            partner_name=p.name,
-            partner_email=p.email,
+            partner_id=row.id,
+            partner_name=row.name,
+            partner_email=row.email,
             metrics=metrics,
         ))
 
@@ -0,0 +1,343 @@
+"""Daily rollups of clicks, clients and payment requests for analytics and reports.
+
+- daily_link_stats is updated incrementally: the click ingest writer calls
+  add_link_clicks() in the same transaction as the raw INSERT.
+- daily_partner_stats depends on mutable client fields (deal status, amount,
+  reward, is_paid), so committed Client/PaymentRequest changes mark their
+  (partner_id, day) as dirty and a background compactor rebuilds those rows.
+- backfill_rollups() rebuilds both tables from the raw data; it runs once
+  automatically and can be forced with `python -m app.utils.backfill_rollups`.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import case, delete, event, func, insert, inspect, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.click import LinkClick
+from app.models.client import Client
+from app.models.daily_stats import DailyLinkStats, DailyPartnerStats
+from app.models.payment_request import PaymentRequest
+from app.services import system_settings_service
+from app.services.report_cache_service import bump_partner_versions, report_data_versions
+from app.services.report_service import LOST_STATUSES, WON_STATUSES
+from app.utils.date_range import apply_datetime_range
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_SETTING_KEY = "rollups_backfilled_at"
+
+_CLIENT_COUNTERS = (
+    "clients_total",
+    "clients_form",
+    "clients_manual",
+    "clients_b24_sync",
+    "sales",
+    "deals",
+    "won",
+    "lost",
+    "amount",
+    "reward",
+    "paid_reward",
+)
+_PAYMENT_REQUEST_COUNTERS = (
+    "payment_requests_total",
+    "payment_requests_approved",
+    "payment_requests_rejected",
+    "payment_requests_pending",
+    "payment_requests_amount",
+)
+_PARTNER_COUNTERS = _CLIENT_COUNTERS + _PAYMENT_REQUEST_COUNTERS
+
+_dirty: set[tuple[int, date]] = set()
+_wakeup: asyncio.Event | None = None
+_compactor_task: asyncio.Task | None = None
+
+
+# --- Dirty tracking ---
+
+
+def _row_day(value: datetime | None) -> date:
+    return (value or datetime.utcnow()).date()
+
+
+def _collect_dirty_keys(session: Session, flush_context) -> None:
+    keys: set[tuple[int, date]] = session.info.setdefault("rollup_dirty", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, (Client, PaymentRequest)):
+            continue
+        if obj.partner_id is not None:
+            keys.add((obj.partner_id, _row_day(obj.created_at)))
+        # Rows moved to another partner/day must also clear their old bucket
+        state = inspect(obj)
+        old_partner_ids = state.attrs.partner_id.history.deleted or [obj.partner_id]
+        old_created = state.attrs.created_at.history.deleted or [obj.created_at]
+        for partner_id in old_partner_ids:
+            for created_at in old_created:
+                if partner_id is not None:
+                    keys.add((partner_id, _row_day(created_at)))
+
+
+def _publish_dirty_keys(session: Session) -> None:
+    keys = session.info.pop("rollup_dirty", None)
+    if keys:
+        _dirty.update(keys)
+        bump_partner_versions({partner_id for partner_id, _ in keys})
+        if _wakeup is not None:
+            _wakeup.set()
+
+
+def _discard_dirty_keys(session: Session, previous_transaction) -> None:
+    session.info.pop("rollup_dirty", None)
+
+
+def install_rollup_tracking() -> None:
+    """Register session listeners that mark touched partner days as dirty (idempotent)."""
+    if event.contains(Session, "after_flush", _collect_dirty_keys):
+        return
+    event.listen(Session, "after_flush", _collect_dirty_keys)
+    event.listen(Session, "after_commit", _publish_dirty_keys)
+    event.listen(Session, "after_soft_rollback", _discard_dirty_keys)
+
+
+def mark_partner_days_dirty(partner_id: int, days: set[date]) -> None:
+    """Mark partner days changed outside the ORM unit of work (bulk statements)."""
+    _dirty.update((partner_id, d) for d in days)
+    bump_partner_versions([partner_id])
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+# --- Incremental click rollup ---
+
+
+async def add_link_clicks(db: AsyncSession, rows: list[dict]) -> None:
+    """Add a batch of raw click rows to daily_link_stats (caller commits)."""
+    counts: dict[tuple[int, date], int] = defaultdict(int)
+    for row in rows:
+        counts[(row["link_id"], _row_day(row.get("created_at")))] += 1
+
+    stmt = sqlite_insert(DailyLinkStats).values(
+        [{"link_id": link_id, "day": day, "clicks": clicks} for (link_id, day), clicks in counts.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyLinkStats.link_id, DailyLinkStats.day],
+        set_={"clicks": DailyLinkStats.clicks + stmt.excluded.clicks},
+    )
+    await db.execute(stmt)
+
+
+# --- Partner rollup aggregation ---
+
+
+async def _aggregate_partner_days(
+    db: AsyncSession,
+    partner_id: int | None = None,
+    day_from: date | None = None,
+    day_to: date | None = None,
+) -> dict[tuple[int, date], dict]:
+    """Aggregate raw clients and payment requests into per (partner, day) counters."""
+    buckets: dict[tuple[int, date], dict] = defaultdict(lambda: dict.fromkeys(_PARTNER_COUNTERS, 0))
+
+    def _scope(query, model):
+        if partner_id is not None:
+            query = query.where(model.partner_id == partner_id)
+        return apply_datetime_range(query, model.created_at, day_from, day_to)
+
+    client_day = func.date(Client.created_at)
+    clients_q = _scope(
+        select(
+            Client.partner_id,
+            client_day.label("day"),
+            func.count(Client.id).label("clients_total"),
+            func.sum(case((Client.source == "form", 1), else_=0)).label("clients_form"),
+            func.sum(case((Client.source == "manual", 1), else_=0)).label("clients_manual"),
+            func.sum(case((Client.source == "b24_sync", 1), else_=0)).label("clients_b24_sync"),
+            func.sum(case((Client.deal_amount > 0, 1), else_=0)).label("sales"),
+            func.sum(
+                case((or_(Client.deal_status.isnot(None), Client.deal_amount > 0), 1), else_=0)
+            ).label("deals"),
+            func.sum(case((Client.deal_status.in_(WON_STATUSES), 1), else_=0)).label("won"),
+            func.sum(case((Client.deal_status.in_(LOST_STATUSES), 1), else_=0)).label("lost"),
+            func.coalesce(func.sum(Client.deal_amount), 0).label("amount"),
+            func.coalesce(func.sum(Client.partner_reward), 0).label("reward"),
+            func.coalesce(
+                func.sum(case((Client.is_paid == True, Client.partner_reward), else_=0)), 0  # noqa: E712
+            ).label("paid_reward"),
+        ).group_by(Client.partner_id, client_day),
+        Client,
+    )
+    for row in (await db.execute(clients_q)).mappings():
+        bucket = buckets[(row["partner_id"], date.fromisoformat(row["day"]))]
+        for key in _CLIENT_COUNTERS:
+            bucket[key] = row[key] or 0
+
+    pr_day = func.date(PaymentRequest.created_at)
+    pr_q = _scope(
+        select(
+            PaymentRequest.partner_id,
+            pr_day.label("day"),
+            func.count(PaymentRequest.id).label("payment_requests_total"),
+            func.sum(case((PaymentRequest.status == "approved", 1), else_=0)).label("payment_requests_approved"),
+            func.sum(case((PaymentRequest.status == "rejected", 1), else_=0)).label("payment_requests_rejected"),
+            func.sum(case((PaymentRequest.status == "pending", 1), else_=0)).label("payment_requests_pending"),
+            func.coalesce(func.sum(PaymentRequest.total_amount), 0).label("payment_requests_amount"),
+        ).group_by(PaymentRequest.partner_id, pr_day),
+        PaymentRequest,
+    )
+    for row in (await db.execute(pr_q)).mappings():
+        bucket = buckets[(row["partner_id"], date.fromisoformat(row["day"]))]
+        for key in _PAYMENT_REQUEST_COUNTERS:
+            bucket[key] = row[key] or 0
+
+    return buckets
+
+
+def _partner_rows(buckets: dict[tuple[int, date], dict]) -> list[dict]:
+    return [
+        {"partner_id": partner_id, "day": day, **counters}
+        for (partner_id, day), counters in buckets.items()
+    ]
+
+
+async def recompute_partner_days(db: AsyncSession, partner_id: int, days: set[date]) -> None:
+    """Rebuild daily_partner_stats for one partner over the span of the given days (caller commits)."""
+    day_from, day_to = min(days), max(days)
+    buckets = await _aggregate_partner_days(db, partner_id, day_from, day_to)
+    await db.execute(
+        delete(DailyPartnerStats).where(
+            DailyPartnerStats.partner_id == partner_id,
+            DailyPartnerStats.day >= day_from,
+            DailyPartnerStats.day <= day_to,
+        )
+    )
+    rows = _partner_rows(buckets)
+    if rows:
+        await db.execute(insert(DailyPartnerStats), rows)
+
+
+async def compact_dirty() -> int:
+    """Rebuild all partner days marked dirty since the last run. Returns the number of partners touched."""
+    if not _dirty:
+        return 0
+    pending = set(_dirty)
+    _dirty.difference_update(pending)
+
+    by_partner: dict[int, set[date]] = defaultdict(set)
+    for partner_id, day in pending:
+        by_partner[partner_id].add(day)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            for partner_id, days in by_partner.items():
+                await recompute_partner_days(db, partner_id, days)
+            await db.commit()
+    except Exception:
+        # Keep the keys so the next run retries them
+        _dirty.update(pending)
+        raise
+    # Reports read the rollups: anything cached before this rebuild is stale
+    bump_partner_versions(by_partner)
+    return len(by_partner)
+
+
+async def backfill_rollups(db: AsyncSession) -> dict:
+    """Rebuild daily_link_stats and daily_partner_stats from raw tables."""
+    click_day = func.date(LinkClick.created_at)
+    await db.execute(delete(DailyLinkStats))
+    await db.execute(
+        insert(DailyLinkStats).from_select(
+            ["link_id", "day", "clicks"],
+            select(LinkClick.link_id, click_day, func.count(LinkClick.id)).group_by(
+                LinkClick.link_id, click_day
+            ),
+        )
+    )
+
+    await db.execute(delete(DailyPartnerStats))
+    rows = _partner_rows(await _aggregate_partner_days(db))
+    if rows:
+        await db.execute(insert(DailyPartnerStats), rows)
+
+    await db.commit()
+    report_data_versions.bump_all()
+    try:
+        await system_settings_service.set_setting(db, BACKFILL_SETTING_KEY, datetime.utcnow().isoformat())
+    except IntegrityError:
+        # A concurrent backfill (CLI vs. server start) recorded the key first
+        await db.rollback()
+
+    link_rows = await db.scalar(select(func.count(DailyLinkStats.id)))
+    logger.info("Rollups backfilled: %d link-day rows, %d partner-day rows", link_rows or 0, len(rows))
+    return {"link_days": link_rows or 0, "partner_days": len(rows)}
+
+
+# --- Background compactor ---
+
+
+async def compactor_loop() -> None:
+    """Rebuild dirty partner days shortly after commits, and at least every interval."""
+    global _wakeup
+    settings = get_settings()
+    _wakeup = asyncio.Event()
+    logger.info("Rollup compactor started")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            if not await system_settings_service.get_setting(db, BACKFILL_SETTING_KEY):
+                await backfill_rollups(db)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("Initial rollup backfill failed: %s", e, exc_info=True)
+
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.ROLLUP_COMPACT_INTERVAL_SECONDS)
+            # Let bursts of commits coalesce into one rebuild
+            await asyncio.sleep(settings.ROLLUP_COMPACT_DEBOUNCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        try:
+            await compact_dirty()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Rollup compaction failed: %s", e, exc_info=True)
+
+
+def start_rollup_task() -> asyncio.Task:
+    """Install dirty tracking and start the compactor as an asyncio task."""
+    global _compactor_task
+    install_rollup_tracking()
+    _compactor_task = asyncio.create_task(compactor_loop(), name="rollup_compactor")
+    logger.info("Rollup compactor background task started")
+    return _compactor_task
+
+
+async def stop_rollup_task(task: asyncio.Task | None = None) -> None:
+    """Cancel the compactor and flush whatever is still dirty."""
+    global _compactor_task, _wakeup
+    t = task or _compactor_task
+    if t and not t.done():
+        t.cancel()
+        try:
+            await t
+        except asyncio.CancelledError:
+            pass
+    try:
+        await compact_dirty()
+    except Exception as e:
+        logger.error("Final rollup compaction failed: %s", e)
+    _compactor_task = None
+    _wakeup = None
+    logger.info("Rollup compactor background task stopped")
@@ -0,0 +1,25 @@
+"""Rebuild daily rollup tables from raw clicks, clients and payment requests.
+
+Usage (from backend/): python -m app.utils.backfill_rollups
+"""
+
+import asyncio
+import logging
+
+from app.database import AsyncSessionLocal, Base, engine
+from app.models import *  # noqa: F401,F403
+from app.services.rollup_service import backfill_rollups
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        result = await backfill_rollups(db)
+    print(f"Rollups rebuilt: {result['link_days']} link-day rows, {result['partner_days']} partner-day rows")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Benchmark: func.date() day filter vs half-open datetime range on clients.created_at.
+
+Builds a throwaway in-memory SQLite database with the app schema, fills it
+with synthetic clients and prints the query plan and timing of the
+all-partners "clients per partner for a period" query in both forms.
+
+Usage (from backend/): python -m app.utils.bench_date_filter [--rows 200000] [--days 7]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app.database import Base
+from app.models import *  # noqa: F401,F403
+from app.models.client import Client
+from app.utils.date_range import apply_datetime_range
+
+
+def _legacy_date_filter(query, column, date_from: date, date_to: date):
+    return query.where(func.date(column) >= date_from).where(func.date(column) <= date_to)
+
+
+def _seed(conn, rows: int, partners: int, span_days: int) -> None:
+    now = datetime.utcnow()
+    batch = []
+    for i in range(rows):
+        batch.append({
+            "partner_id": random.randint(1, partners),
+            "source": "form",
+            "name": f"Client {i}",
+            "is_paid": False,
+            "created_at": now - timedelta(seconds=random.randint(0, span_days * 86400)),
+        })
+        if len(batch) == 10000:
+            conn.execute(insert(Client), batch)
+            batch.clear()
+    if batch:
+        conn.execute(insert(Client), batch)
+    conn.execute(text("ANALYZE"))
+
+
+def _run(conn, label: str, query, repeat: int) -> None:
+    compiled = query.compile(conn, compile_kwargs={"literal_binds": True})
+    plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = conn.execute(query).all()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+
+    print(f"{label}:")
+    print(f"  plan:  {'; '.join(plan)}")
+    print(f"  rows:  {sum(row.clients for row in result)} clients in {len(result)} partners")
+    print(f"  time:  {elapsed:.2f} ms/query (avg of {repeat})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--partners", type=int, default=200)
+    parser.add_argument("--span-days", type=int, default=730)
+    parser.add_argument("--days", type=int, default=7, help="length of the queried period")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    date_to = datetime.utcnow().date()
+    date_from = date_to - timedelta(days=args.days - 1)
+    base = select(Client.partner_id, func.count(Client.id).label("clients"))
+
+    with engine.begin() as conn:
+        _seed(conn, args.rows, args.partners, args.span_days)
+        print(f"{args.rows} clients over {args.span_days} days, period {date_from} – {date_to}\n")
+
+        legacy = _legacy_date_filter(base, Client.created_at, date_from, date_to)
+        _run(conn, "func.date(created_at) BETWEEN", legacy.group_by(Client.partner_id), args.repeat)
+
+        ranged = apply_datetime_range(base, Client.created_at, date_from, date_to)
+        _run(conn, "created_at >= start AND created_at < end", ranged.group_by(Client.partner_id), args.repeat)
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Date-range predicates for report and analytics queries.
+
+Timestamps are stored as naive UTC (datetime.utcnow), so a calendar day
+[date_from, date_to] becomes the half-open range
+[date_from 00:00 UTC, date_to + 1 day 00:00 UTC) on the raw column. Comparing
+the column directly (instead of func.date(column)) lets SQLite use indexes.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+
+def utc_today() -> date:
+    """Current calendar day in UTC — the day timestamps are bucketed by."""
+    return datetime.now(timezone.utc).date()
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def day_range_bounds(
+    date_from: date | None, date_to: date | None
+) -> tuple[datetime | None, datetime | None]:
+    """Turn inclusive UTC day bounds into half-open [start, end) naive UTC datetimes.
+
+    datetime arguments are taken as exact instants (aware ones converted to UTC).
+    """
+    start = end = None
+    if date_from is not None:
+        if isinstance(date_from, datetime):
+            start = _to_utc_naive(date_from)
+        else:
+            start = datetime.combine(date_from, time.min)
+    if date_to is not None:
+        if isinstance(date_to, datetime):
+            end = _to_utc_naive(date_to)
+        else:
+            end = datetime.combine(date_to + timedelta(days=1), time.min)
+    return start, end
+
+
+def apply_datetime_range(query, column, date_from: date | None, date_to: date | None):
+    """Filter a DateTime column to the UTC days [date_from, date_to] as `start <= column < end`."""
+    start, end = day_range_bounds(date_from, date_to)
+    if start is not None:
+        query = query.where(column >= start)
+    if end is not None:
+        query = query.where(column < end)
+    return query
+
+
+def apply_day_range(query, column, date_from: date | None, date_to: date | None):
+    """Inclusive filter on a Date column (rollup `day`)."""
+    if date_from is not None:
+        query = query.where(column >= date_from)
+    if date_to is not None:
+        query = query.where(column <= date_to)
+    return query
@@ -339,3 +339,39 @@ def migrate_system_settings_table() -> None:
         logger.info("Ensured system_settings table exists")
     except Exception as e:
         logger.error("Migration (system_settings table) failed: %s", e)
+
+
+# Composite indexes for the hot query shapes (also declared in the models'
+# __table_args__; create_all does not add indexes to existing tables).
+HOT_QUERY_INDEXES = (
+    ("ix_link_clicks_link_id_created_at", "link_clicks", "link_id, created_at"),
+    ("ix_clients_partner_id_created_at", "clients", "partner_id, created_at"),
+    ("ix_clients_created_at", "clients", "created_at"),
+    ("ix_clients_partner_id_deal_id", "clients", "partner_id, deal_id"),
+    ("ix_clients_external_id", "clients", "external_id"),
+    ("ix_clients_link_id", "clients", "link_id"),
+    ("ix_notifications_target_partner_id", "notifications", "target_partner_id"),
+    ("ix_notification_reads_partner_id_notification_id", "notification_reads", "partner_id, notification_id"),
+    ("ix_payment_requests_partner_id_status", "payment_requests", "partner_id, status"),
+    ("ix_payment_requests_status", "payment_requests", "status"),
+    ("ix_chat_messages_partner_id_sender_id_is_read", "chat_messages", "partner_id, sender_id, is_read"),
+)
+
+
+def migrate_hot_query_indexes() -> None:
+    db_path = _get_sync_db_path()
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        for name, table, columns in HOT_QUERY_INDEXES:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,))
+            if cursor.fetchone() is None:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+                logger.info("Created index %s on %s(%s)", name, table, columns)
+
+        cursor.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        logger.error("Migration (hot query indexes) failed: %s", e)
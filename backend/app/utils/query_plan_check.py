@@ -0,0 +1,127 @@
+"""Startup check of SQLite query plans for the hot query shapes.
+
+Runs EXPLAIN QUERY PLAN for every registered query, logs the plan and warns
+when SQLite falls back to a full table scan (a "SCAN <table>" step without an
+index). Keep HOT_QUERIES in sync with the filters the services actually use.
+"""
+
+import logging
+import sqlite3
+
+from app.utils.migrate_db import _get_sync_db_path
+
+logger = logging.getLogger(__name__)
+
+# (name, sql, params) — params are placeholders, only the plan matters
+HOT_QUERIES: tuple[tuple[str, str, tuple], ...] = (
+    (
+        "link clicks by day",
+        "SELECT date(created_at), count(id) FROM link_clicks "
+        "WHERE link_id = ? AND created_at >= ? AND created_at < ? GROUP BY date(created_at)",
+        (1, "2024-01-01", "2024-02-01"),
+    ),
+    (
+        "partner clients by period",
+        "SELECT id FROM clients WHERE partner_id = ? AND created_at >= ? AND created_at < ?",
+        (1, "2024-01-01", "2024-02-01"),
+    ),
+    (
+        "clients by period (all partners)",
+        "SELECT partner_id, count(id) FROM clients WHERE created_at >= ? AND created_at < ? GROUP BY partner_id",
+        ("2024-01-01", "2024-02-01"),
+    ),
+    (
+        "client lookup by deal id",
+        "SELECT id FROM clients WHERE partner_id = ? AND deal_id = ?",
+        (1, "1"),
+    ),
+    (
+        "client lookup by external id",
+        "SELECT id FROM clients WHERE external_id = ?",
+        ("1",),
+    ),
+    (
+        "clients per link",
+        "SELECT link_id, count(id) FROM clients WHERE link_id IN (?, ?) GROUP BY link_id",
+        (1, 2),
+    ),
+    (
+        "partner notifications",
+        "SELECT id FROM notifications WHERE target_partner_id IS NULL OR target_partner_id = ? "
+        "ORDER BY created_at DESC",
+        (1,),
+    ),
+    (
+        "notification read marks",
+        "SELECT notification_id FROM notification_reads WHERE partner_id = ?",
+        (1,),
+    ),
+    (
+        "notification read mark lookup",
+        "SELECT id FROM notification_reads WHERE notification_id = ? AND partner_id = ?",
+        (1, 1),
+    ),
+    (
+        "partner payment requests by status",
+        "SELECT id FROM payment_requests WHERE partner_id = ? AND status = ?",
+        (1, "pending"),
+    ),
+    (
+        "payment requests by status",
+        "SELECT id FROM payment_requests WHERE status = ? ORDER BY created_at DESC",
+        ("pending",),
+    ),
+    (
+        "unread chat messages for partner",
+        "SELECT count(id) FROM chat_messages WHERE partner_id = ? AND sender_id != ? AND is_read = 0",
+        (1, 1),
+    ),
+    (
+        "unread chat messages from partner",
+        "SELECT count(id) FROM chat_messages WHERE partner_id = ? AND sender_id = ? AND is_read = 0",
+        (1, 1),
+    ),
+    (
+        "partner daily stats",
+        "SELECT sum(clients_total) FROM daily_partner_stats WHERE partner_id = ? AND day >= ? AND day <= ?",
+        (1, "2024-01-01", "2024-01-31"),
+    ),
+    (
+        "link daily stats",
+        "SELECT day, clicks FROM daily_link_stats WHERE link_id = ? AND day >= ? AND day <= ?",
+        (1, "2024-01-01", "2024-01-31"),
+    ),
+)
+
+
+def _is_table_scan(detail: str) -> bool:
+    # "SCAN clients" is a full scan; "SCAN clients USING (COVERING) INDEX ..." walks an index
+    return detail.startswith("SCAN ") and "USING" not in detail and "CONSTANT ROW" not in detail
+
+
+def check_hot_query_plans() -> list[str]:
+    """Log EXPLAIN QUERY PLAN for HOT_QUERIES; return names of queries that scan a table."""
+    db_path = _get_sync_db_path()
+    scanning: list[str] = []
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        for name, sql, params in HOT_QUERIES:
+            try:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                details = [row[-1] for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.warning("Query plan check (%s) failed: %s", name, e)
+                continue
+
+            logger.info("Query plan (%s): %s", name, "; ".join(details))
+            scans = [detail for detail in details if _is_table_scan(detail)]
+            if scans:
+                scanning.append(name)
+                logger.warning("Query plan (%s) uses a table scan: %s", name, "; ".join(scans))
+
+        conn.close()
+    except Exception as e:
+        logger.error("Query plan check failed: %s", e)
+    return scanning
@@ -0,0 +1,87 @@
+"""Guard against handlers pulling large row sets through ORM relationships.
+
+Enabled by RELATIONSHIP_LOAD_AUDIT_LIMIT > 0 (intended for tests and staging):
+every HTTP request counts the ORM objects loaded via relationship loaders
+(selectinload, lazy loads, ...) and fails with RelationshipLoadLimitExceeded
+as soon as the count passes the limit.
+"""
+
+import logging
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+_AUDIT_OPTION = "_relationship_load_audit"
+
+
+class RelationshipLoadLimitExceeded(RuntimeError):
+    pass
+
+
+class _RequestLoadCounter:
+    def __init__(self, path: str, limit: int):
+        self.path = path
+        self.limit = limit
+        self.rows = 0
+        self.by_entity: dict[str, int] = {}
+
+
+_current_counter: ContextVar[_RequestLoadCounter | None] = ContextVar(
+    "relationship_load_counter", default=None
+)
+_installed = False
+
+
+def _mark_relationship_load(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_relationship_load and _current_counter.get() is not None:
+        orm_execute_state.update_execution_options(**{_AUDIT_OPTION: True})
+
+
+def _count_loaded_instance(target, context) -> None:
+    counter = _current_counter.get()
+    if counter is None or not context.execution_options.get(_AUDIT_OPTION):
+        return
+    entity = type(target).__name__
+    counter.rows += 1
+    counter.by_entity[entity] = counter.by_entity.get(entity, 0) + 1
+    if counter.rows > counter.limit:
+        raise RelationshipLoadLimitExceeded(
+            f"{counter.path} loaded more than {counter.limit} rows through relationships: "
+            f"{counter.by_entity}"
+        )
+
+
+def install_relationship_audit() -> None:
+    """Register the ORM event listeners (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, "do_orm_execute", _mark_relationship_load)
+    event.listen(Base, "load", _count_loaded_instance, propagate=True)
+    _installed = True
+    logger.info("Relationship load audit enabled")
+
+
+def relationship_audit_middleware(limit: int):
+    """Build an HTTP middleware that scopes a load counter to each request."""
+
+    async def middleware(request, call_next):
+        counter = _RequestLoadCounter(request.url.path, limit)
+        token = _current_counter.set(counter)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_counter.reset(token)
+        if counter.rows:
+            logger.debug(
+                "%s loaded %d rows through relationships: %s",
+                counter.path, counter.rows, counter.by_entity,
+            )
+        return response
+
+    return middleware
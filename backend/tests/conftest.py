@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings are read at import time; tests use their own in-memory databases
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
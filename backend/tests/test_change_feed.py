@@ -0,0 +1,66 @@
+"""Regression tests for the set-based change feed (get_changes_bulk)."""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models import *  # noqa: F401,F403
+from app.models.notification import Notification
+from app.models.partner import Partner
+from app.services.change_feed_service import get_changes, get_changes_bulk
+
+LIMIT = 50
+
+
+async def _seed(db) -> None:
+    db.add_all([
+        Partner(id=1, email="admin@x.io", password_hash="-", name="Admin", partner_code="ADMIN", role="admin"),
+        Partner(id=2, email="inactive@x.io", password_hash="-", name="Inactive", partner_code="P2", is_active=False),
+        Partner(id=3, email="active@x.io", password_hash="-", name="Active", partner_code="P3"),
+        Partner(id=4, email="other@x.io", password_hash="-", name="Other", partner_code="P4"),
+    ])
+    await db.flush()
+    db.add_all([Notification(id=i, title=f"b{i}", message="m", created_by=1) for i in range(1, 201)])
+    db.add(Notification(id=201, title="own", message="m", created_by=1, target_partner_id=3))
+    await db.commit()
+
+
+async def _run(check) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        await _seed(db)
+        await check(db)
+    await engine.dispose()
+
+
+def test_lagging_cursor_does_not_stall_other_partners():
+    """An inactive partner pinned at 0:0 must not cut off partners further ahead."""
+    async def check(db):
+        inactive, active, other = await get_changes_bulk(db, [(2, 0, 0), (3, 150, 0), (4, 0, 0)], LIMIT)
+        alone = await get_changes(db, 3, 150, 0, LIMIT)
+
+        assert inactive.notifications == [] and inactive.cursor == "0:0"
+        assert [n.id for n in active.notifications] == list(range(151, 201))
+        assert [n.id for n in active.notifications] == [n.id for n in alone.notifications]
+        assert [n.id for n in other.notifications] == list(range(1, LIMIT + 1))
+
+    asyncio.run(_run(check))
+
+
+def test_targeted_notification_reached_after_broadcasts():
+    """Paging by the returned cursor in a mixed-cursor batch reaches the partner's own notification."""
+    async def check(db):
+        cursor = "150:0"
+        seen = []
+        for _ in range(3):
+            notification_after, chat_after = map(int, cursor.split(":"))
+            changes = (await get_changes_bulk(db, [(2, 0, 0), (3, notification_after, chat_after)], LIMIT))[1]
+            seen += [n.id for n in changes.notifications]
+            cursor = changes.cursor
+        assert seen == list(range(151, 202))
+        assert cursor == "201:0"
+
+    asyncio.run(_run(check))
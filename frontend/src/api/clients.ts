@@ -37,6 +37,36 @@ export async function getClients(skip = 0, limit = 50): Promise<Client[]> {
   return response.data
 }
 
+export interface ClientFilters {
+  status?: string
+  is_paid?: boolean
+  source?: Client['source']
+  created_from?: string
+  created_to?: string
+}
+
+export type ClientListItem = Pick<
+  Client,
+  'id' | 'name' | 'source' | 'created_at' | 'is_paid' | 'deal_status' | 'deal_status_name' | 'deal_amount' | 'partner_reward'
+>
+
+export interface ClientPage {
+  items: ClientListItem[]
+  nextCursor: string | null
+}
+
+/** One page of the light client list; pass nextCursor back as `after` for the next page. */
+export async function getClientsPage(
+  filters: ClientFilters = {},
+  after: string | null = null,
+  limit = 100,
+): Promise<ClientPage> {
+  const response = await apiClient.get<ClientListItem[]>('/clients/', {
+    params: { ...filters, limit, view: 'light', ...(after ? { after } : {}) },
+  })
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] ?? null }
+}
+
 export async function getClient(id: number): Promise<Client> {
   const response = await apiClient.get<Client>(`/clients/${id}`)
   return response.data
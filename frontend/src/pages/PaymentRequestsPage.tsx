@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { getClients, type Client } from '@/api/clients'
+import { getClientsPage, type ClientListItem } from '@/api/clients'
 import {
   getPartnerPaymentRequests,
   createPaymentRequest,
@@ -29,7 +29,7 @@ export default function PaymentRequestsPage() {
   const [requests, setRequests] = useState<PaymentRequestResponse[]>([])
   const [loading, setLoading] = useState(true)
   const [showModal, setShowModal] = useState(false)
-  const [clients, setClients] = useState<Client[]>([])
+  const [clients, setClients] = useState<ClientListItem[]>([])
   const [selectedIds, setSelectedIds] = useState<Set<number>>(new Set())
   const [comment, setComment] = useState('')
   const [creating, setCreating] = useState(false)
@@ -60,16 +60,14 @@ export default function PaymentRequestsPage() {
 
   const openModal = async () => {
     try {
-      const allClients: Client[] = []
-      let skip = 0
-      const batchSize = 100
-      while (true) {
-        const batch = await getClients(skip, batchSize)
-        allClients.push(...batch)
-        if (batch.length < batchSize) break
-        skip += batchSize
-      }
-      const eligible = allClients.filter(c => c.partner_reward !== null && c.partner_reward > 0 && !c.is_paid)
+      const unpaid: ClientListItem[] = []
+      let after: string | null = null
+      do {
+        const page = await getClientsPage({ is_paid: false }, after)
+        unpaid.push(...page.items)
+        after = page.nextCursor
+      } while (after)
+      const eligible = unpaid.filter(c => c.partner_reward !== null && c.partner_reward > 0)
       setClients(eligible)
       setSelectedIds(new Set())
       setComment('')
@@ -6,6 +6,32 @@ from bot.config import settings
 
 logger = logging.getLogger(__name__)
 
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client for every backend call, so keep-alive connections are reused.
+
+    Timeouts are passed per request.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=settings.BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.BACKEND_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class APIClient:
     def __init__(self, access_token: str = "", refresh_token: str = ""):
@@ -27,30 +53,30 @@ class APIClient:
         if not self.refresh_token:
             return False
         try:
-            async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.post(
-                    f"{self.base_url}/auth/refresh",
-                    json={"refresh_token": self.refresh_token},
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    self.access_token = data["access_token"]
-                    self.refresh_token = data["refresh_token"]
-                    if self._on_tokens_refreshed:
-                        await self._on_tokens_refreshed(self.access_token, self.refresh_token)
-                    return True
+            resp = await get_http_client().post(
+                f"{self.base_url}/auth/refresh",
+                json={"refresh_token": self.refresh_token},
+                timeout=15,
+            )
+            if resp.status_code == 200:
+                data = resp.json()
+                self.access_token = data["access_token"]
+                self.refresh_token = data["refresh_token"]
+                if self._on_tokens_refreshed:
+                    await self._on_tokens_refreshed(self.access_token, self.refresh_token)
+                return True
         except Exception as e:
             logger.error(f"Token refresh failed: {e}")
         return False
 
     async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
         url = f"{self.base_url}{path}"
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.request(method, url, headers=self._headers(), **kwargs)
-            if resp.status_code == 401 and self.refresh_token:
-                if await self._refresh_tokens():
-                    resp = await client.request(method, url, headers=self._headers(), **kwargs)
-            return resp
+        client = get_http_client()
+        resp = await client.request(method, url, headers=self._headers(), **kwargs)
+        if resp.status_code == 401 and self.refresh_token:
+            if await self._refresh_tokens():
+                resp = await client.request(method, url, headers=self._headers(), **kwargs)
+        return resp
 
     async def get(self, path: str, **kwargs) -> httpx.Response:
         return await self.request("GET", path, **kwargs)
@@ -71,13 +97,13 @@ class APIClient:
         if self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
         files = {"file": (filename, file_bytes)}
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.post(url, headers=headers, files=files, data=data or {})
-            if resp.status_code == 401 and self.refresh_token:
-                if await self._refresh_tokens():
-                    headers["Authorization"] = f"Bearer {self.access_token}"
-                    resp = await client.post(url, headers=headers, files=files, data=data or {})
-            return resp
+        client = get_http_client()
+        resp = await client.post(url, headers=headers, files=files, data=data or {}, timeout=60)
+        if resp.status_code == 401 and self.refresh_token:
+            if await self._refresh_tokens():
+                headers["Authorization"] = f"Bearer {self.access_token}"
+                resp = await client.post(url, headers=headers, files=files, data=data or {}, timeout=60)
+        return resp
 
     async def get_json(self, path: str, **kwargs) -> Optional[dict | list]:
         resp = await self.get(path, **kwargs)
@@ -86,14 +112,10 @@ class APIClient:
         return None
 
     async def get_bytes(self, path: str, **kwargs) -> Optional[bytes]:
-        url = f"{self.base_url}{path}"
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.request("GET", url, headers=self._headers(), **kwargs)
-            if resp.status_code == 401 and self.refresh_token:
-                if await self._refresh_tokens():
-                    resp = await client.request("GET", url, headers=self._headers(), **kwargs)
-            if resp.status_code == 200:
-                return resp.content
+        kwargs.setdefault("timeout", 60)
+        resp = await self.request("GET", path, **kwargs)
+        if resp.status_code == 200:
+            return resp.content
         return None
 
     async def get_raw_bytes(self, path: str) -> Optional[bytes]:
@@ -104,8 +126,7 @@ class APIClient:
         # self.base_url is like "http://backend:8000/api" — strip /api
         root_url = self.base_url.rsplit("/api", 1)[0]
         url = f"{root_url}{path}"
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.get(url)
-            if resp.status_code == 200:
-                return resp.content
+        resp = await get_http_client().get(url, timeout=60)
+        if resp.status_code == 200:
+            return resp.content
         return None
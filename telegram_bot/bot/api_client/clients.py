@@ -6,18 +6,38 @@ async def get_clients(api: APIClient, skip: int = 0, limit: int = 50) -> Optiona
     return await api.get_json(f"/clients/?skip={skip}&limit={limit}")
 
 
-async def get_all_clients(api: APIClient) -> list:
-    """Fetch all clients by paginating with max limit=100."""
+async def get_clients_page(
+    api: APIClient, after: Optional[str] = None, limit: int = 10, **filters,
+) -> Optional[tuple[list, Optional[str]]]:
+    """One page of clients (light view: id, name, source, status, amounts) and the cursor of the next page.
+
+    filters: status, is_paid, source, created_from, created_to (None values are not sent).
+    """
+    params = {"limit": limit, "view": "light"}
+    params.update((key, value) for key, value in filters.items() if value is not None)
+    if after:
+        params["after"] = after
+    resp = await api.get("/clients/", params=params)
+    if resp.status_code != 200:
+        return None
+    return resp.json(), resp.headers.get("X-Next-Cursor")
+
+
+async def get_all_clients(api: APIClient, **filters) -> Optional[list]:
+    """Fetch all clients matching the filters (light view) page by page with max limit=100.
+
+    Returns None if a page request fails (an empty list means no matching clients).
+    """
     all_clients = []
-    skip = 0
+    after = None
     while True:
-        batch = await api.get_json(f"/clients/?skip={skip}&limit=100")
-        if not batch:
-            break
+        page = await get_clients_page(api, after, limit=100, **filters)
+        if page is None:
+            return None
+        batch, after = page
         all_clients.extend(batch)
-        if len(batch) < 100:
+        if not after:
             break
-        skip += 100
     return all_clients
 
 
@@ -0,0 +1,24 @@
+import logging
+from typing import Optional
+
+from bot.api_client.base import get_http_client
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def get_changes(partners: list[dict], timeout: int = 0) -> Optional[list]:
+    """Long-poll new notifications and chat messages of many partners at once (service key auth).
+
+    partners: [{"partner_id": ..., "since": cursor or None}]; the result has one entry per item, in order.
+    """
+    resp = await get_http_client().post(
+        f"{settings.api_base_url}/internal/bot/changes",
+        json={"partners": partners, "timeout": timeout},
+        headers={"X-Internal-API-Key": settings.BOT_INTERNAL_API_KEY},
+        timeout=timeout + 15,
+    )
+    if resp.status_code == 200:
+        return resp.json().get("changes", [])
+    logger.error(f"Bulk change feed request failed: {resp.status_code} {resp.text[:200]}")
+    return None
@@ -16,6 +16,14 @@ async def get_unread_count(api: APIClient) -> int:
     return 0
 
 
+async def get_changes(api: APIClient, since: Optional[str], timeout: int = 0) -> Optional[dict]:
+    """Long-poll new notifications and chat messages after the cursor (no cursor = get the current one)."""
+    params = {"timeout": timeout}
+    if since:
+        params["since"] = since
+    return await api.get_json("/notifications/changes", params=params, timeout=timeout + 15)
+
+
 async def mark_as_read(api: APIClient, notif_id: int) -> bool:
     resp = await api.post(f"/notifications/{notif_id}/read")
     return resp.status_code == 200
@@ -5,7 +5,21 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: str
     BACKEND_URL: str = "http://backend:8003"
     PUBLIC_BASE_URL: str = "http://localhost:8003"
-    NOTIFICATION_POLL_INTERVAL: int = 60
+    NOTIFICATION_POLL_INTERVAL: int = 60  # retry delay after a failed change feed request
+    NOTIFICATION_LONG_POLL_TIMEOUT: int = 25
+    NOTIFICATION_SESSION_SCAN_INTERVAL: int = 5
+    BACKEND_MAX_CONNECTIONS: int = 200  # shared HTTP client pool (long-polls hold a connection while waiting)
+    BACKEND_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    BOT_STATE_DB_PATH: str = "data/bot_state.db"  # sessions and change feed cursors (survive restarts)
+    SESSION_CACHE_SIZE: int = 1000  # sessions kept in memory in front of the state DB
+    BOT_INTERNAL_API_KEY: str = ""  # enables the bulk change feed (one request for all users)
+    NOTIFICATION_PUSH_WORKERS: int = 16
+    NOTIFICATION_READ_MARK_WORKERS: int = 4
+    NOTIFICATION_FILE_CACHE_SIZE: int = 64  # notifications whose file (file_id or bytes) is kept
+    TELEGRAM_GLOBAL_RATE: float = 25.0  # messages per second across all chats (Telegram allows ~30)
+    TELEGRAM_CHAT_RATE: float = 1.0  # messages per second to one chat
+    TELEGRAM_CHAT_BURST: float = 3.0
+    TELEGRAM_SEND_RETRIES: int = 2  # retries after a 429 (flood limit)
 
     @property
     def api_base_url(self) -> str:
@@ -13,37 +13,54 @@ from bot.utils.formatters import format_client_detail
 
 router = Router()
 
-_clients_cache: dict[int, list] = {}
+CLIENTS_PER_PAGE = 10
+
+# Cursor of each visited page per user: [None (first page), cursor of page 2, ...]
+_page_cursors: dict[int, list[str | None]] = {}
+
+
+async def _load_page(api_client: APIClient, tg_user_id: int, page: int) -> tuple[list, int, bool] | None:
+    """Load only the clients of one page; returns (clients, page, has_next).
+
+    Pages are reached by cursor, so an unknown page (e.g. after a restart) starts over from the first.
+    """
+    cursors = _page_cursors.get(tg_user_id, [None])
+    if page >= len(cursors):
+        cursors, page = [None], 0
+    result = await clients_api.get_clients_page(api_client, cursors[page], limit=CLIENTS_PER_PAGE)
+    if result is None:
+        return None
+    clients, next_cursor = result
+    _page_cursors[tg_user_id] = cursors[:page + 1] + ([next_cursor] if next_cursor else [])
+    return clients, page, next_cursor is not None
 
 
 @router.message(F.text == "👥 Клиенты")
 async def show_clients(message: Message, api_client: APIClient, session: UserSession):
-    clients = await clients_api.get_clients(api_client)
-    if clients is None:
+    _page_cursors.pop(message.from_user.id, None)
+    loaded = await _load_page(api_client, message.from_user.id, 0)
+    if loaded is None:
         await message.answer("Не удалось загрузить клиентов.")
         return
+    clients, page, has_next = loaded
     if not clients:
         from aiogram.utils.keyboard import InlineKeyboardBuilder
         builder = InlineKeyboardBuilder()
         builder.button(text="➕ Добавить клиента", callback_data=ClientCB(action="create"))
         await message.answer("У вас пока нет клиентов.", reply_markup=builder.as_markup())
         return
-    _clients_cache[message.from_user.id] = clients
-    await message.answer("👥 <b>Ваши клиенты:</b>", reply_markup=clients_list_keyboard(clients, 0))
+    await message.answer("👥 <b>Ваши клиенты:</b>", reply_markup=clients_list_keyboard(clients, page, has_next))
 
 
 @router.callback_query(PaginationCB.filter(F.section == "clients"))
 async def paginate_clients(callback: CallbackQuery, callback_data: PaginationCB, api_client: APIClient, session: UserSession):
     await callback.answer()
-    clients = _clients_cache.get(callback.from_user.id)
-    if not clients:
-        clients = await clients_api.get_clients(api_client)
-        if clients:
-            _clients_cache[callback.from_user.id] = clients
-    if not clients:
+    loaded = await _load_page(api_client, callback.from_user.id, callback_data.page)
+    if not loaded or not loaded[0]:
         await callback.message.edit_text("Не удалось загрузить клиентов.")
         return
-    await callback.message.edit_reply_markup(reply_markup=clients_list_keyboard(clients, callback_data.page))
+    clients, page, has_next = loaded
+    await callback.message.edit_reply_markup(reply_markup=clients_list_keyboard(clients, page, has_next))
 
 
 @router.callback_query(ClientCB.filter(F.action == "detail"))
@@ -62,8 +62,8 @@ async def payment_detail(callback: CallbackQuery, callback_data: PaymentCB, api_
 @router.callback_query(PaymentCB.filter(F.action == "create"))
 async def start_create_payment(callback: CallbackQuery, state: FSMContext, api_client: APIClient, session: UserSession):
     await callback.answer()
-    all_clients = await clients_api.get_all_clients(api_client)
-    if not all_clients:
+    all_clients = await clients_api.get_all_clients(api_client, is_paid=False)
+    if all_clients is None:
         await callback.message.answer("Не удалось загрузить клиентов.")
         return
 
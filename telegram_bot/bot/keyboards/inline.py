@@ -81,14 +81,11 @@ def links_list_keyboard(links: list[dict], page: int = 0) -> InlineKeyboardMarku
     return builder.as_markup()
 
 
-def clients_list_keyboard(clients: list[dict], page: int = 0) -> InlineKeyboardMarkup:
+def clients_list_keyboard(clients: list[dict], page: int = 0, has_next: bool = False) -> InlineKeyboardMarkup:
+    """One page of clients as loaded from the API (the total is not known with cursor pagination)."""
     builder = InlineKeyboardBuilder()
-    per_page = 10
-    start = page * per_page
-    end = start + per_page
-    page_items = clients[start:end]
 
-    for c in page_items:
+    for c in clients:
         source = "📝" if c.get("source") == "form" else "✋"
         builder.button(
             text=f"{source} {c['name']}",
@@ -98,9 +95,8 @@ def clients_list_keyboard(clients: list[dict], page: int = 0) -> InlineKeyboardM
     nav = []
     if page > 0:
         nav.append(("⬅️", PaginationCB(section="clients", page=page - 1)))
-    total_pages = max(1, (len(clients) + per_page - 1) // per_page)
-    nav.append((f"{page + 1}/{total_pages}", PaginationCB(section="clients", page=page)))
-    if end < len(clients):
+    nav.append((f"{page + 1}", PaginationCB(section="clients", page=page)))
+    if has_next:
         nav.append(("➡️", PaginationCB(section="clients", page=page + 1)))
 
     if len(nav) > 1:
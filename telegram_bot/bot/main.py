@@ -7,10 +7,12 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.types import ErrorEvent
 
+from bot.api_client.base import close_http_client
 from bot.config import settings
 from bot.middlewares.auth import AuthMiddleware
 from bot.handlers import start, auth, dashboard, analytics, links, clients, reports, payment_requests, chat, notifications, profile
 from bot.services.notification_poller import poll_notifications
+from bot.services.state_store import state_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -66,6 +68,8 @@ async def main():
             await poller_task
         except asyncio.CancelledError:
             pass
+        await close_http_client()
+        state_store.close()
 
 
 if __name__ == "__main__":
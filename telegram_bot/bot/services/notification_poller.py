@@ -2,118 +2,278 @@ import asyncio
 import logging
 from aiogram import Bot
 
-from bot.services.session_manager import get_all_sessions, get_api_client
+from bot.services.session_manager import (
+    get_all_sessions,
+    get_api_client,
+    get_login_ids,
+    get_session,
+    get_session_ids,
+    is_current,
+)
+from bot.services.state_store import state_store
 from bot.services import chat_tracker
+from bot.api_client import internal as internal_api
 from bot.api_client import notifications as notif_api
 from bot.api_client import chat as chat_api
+from bot.services.telegram_sender import attachment_cache, telegram_sender
 from bot.config import settings
-from aiogram.types import BufferedInputFile
-from bot.utils.formatters import format_notification_push, format_chat_page, get_notification_file_type
+from bot.utils.formatters import format_notification_push, format_chat_page
 from bot.keyboards.inline import chat_pagination_keyboard
 
 logger = logging.getLogger(__name__)
 
-# Track known notification IDs per user so we only push truly new ones
-_known_notif_ids: dict[int, set[int]] = {}
-_prev_chat_counts: dict[int, int] = {}
+# Change feed cursor per user ("<notification_id>:<chat_message_id>", a copy of the state store's) and its long-poll task
+_cursors: dict[int, str] = {}
+_watchers: dict[int, asyncio.Task] = {}
+
+# Deliveries waiting per user (session, notifications, chat messages) and users waiting for a push worker.
+# A user is queued at most once, so one worker at a time pushes to them, in order.
+_pending: dict[int, list[tuple]] = {}
+_push_queue: asyncio.Queue[int] = asyncio.Queue()
+# Pushed notifications to mark as read (tg_user_id, notification_id), off the push path
+_read_queue: asyncio.Queue[tuple[int, int]] = asyncio.Queue()
 
 
 def clear_user_state(tg_user_id: int) -> None:
     """Clear polling state for a user (call on logout)."""
-    _known_notif_ids.pop(tg_user_id, None)
-    _prev_chat_counts.pop(tg_user_id, None)
+    _cursors.pop(tg_user_id, None)
+    state_store.delete_cursor(tg_user_id)
+    task = _watchers.pop(tg_user_id, None)
+    if task is not None:
+        task.cancel()
 
 
 async def poll_notifications(bot: Bot):
-    interval = settings.NOTIFICATION_POLL_INTERVAL
-    logger.info(f"Notification poller started (interval: {interval}s)")
+    """Push new notifications and chat messages of logged-in users to Telegram.
+
+    With BOT_INTERNAL_API_KEY set, one bulk long-poll covers every session
+    (POST /api/internal/bot/changes); otherwise each session long-polls its
+    own GET /api/notifications/changes. Either way an idle user costs no
+    backend queries, only a parked request per NOTIFICATION_LONG_POLL_TIMEOUT.
 
+    Cursors are kept in the state store, so after a restart the poller
+    continues where it stopped and pushes what arrived meanwhile.
+
+    Received changes are pushed by NOTIFICATION_PUSH_WORKERS workers in
+    parallel (one user per worker at a time), within Telegram's send limits
+    (see telegram_sender), so a broadcast to many users is not sent one user
+    after another.
+    """
+    mode = "bulk" if settings.BOT_INTERNAL_API_KEY else "per-user"
+    logger.info(
+        f"Notification poller started ({mode} long-poll: {settings.NOTIFICATION_LONG_POLL_TIMEOUT}s, "
+        f"{settings.NOTIFICATION_PUSH_WORKERS} push workers)"
+    )
+    _cursors.update(state_store.load_cursors())
+    workers = [asyncio.create_task(_push_worker(bot)) for _ in range(settings.NOTIFICATION_PUSH_WORKERS)]
+    workers += [asyncio.create_task(_read_mark_worker()) for _ in range(settings.NOTIFICATION_READ_MARK_WORKERS)]
+    try:
+        if settings.BOT_INTERNAL_API_KEY:
+            await _poll_bulk(bot)
+        else:
+            await _supervise_watchers(bot)
+    except asyncio.CancelledError:
+        for task in [*_watchers.values(), *workers]:
+            task.cancel()
+        _watchers.clear()
+        logger.info(
+            f"Notification poller stopped (telegram: {telegram_sender.stats()}, attachments: {attachment_cache.stats()})"
+        )
+
+
+async def _poll_bulk(bot: Bot):
+    """Long-poll the change feed of all sessions in one request per round."""
+    scan_interval = settings.NOTIFICATION_SESSION_SCAN_INTERVAL
     while True:
         try:
-            await asyncio.sleep(interval)
-            sessions = get_all_sessions()
+            users = list(get_all_sessions().items())
+            if not users:
+                await asyncio.sleep(scan_interval)
+                continue
 
-            for tg_user_id, session in sessions.items():
-                try:
-                    api = get_api_client(tg_user_id)
-                    if not api:
-                        continue
-
-                    # --- Notifications: send full content ---
-                    notifications = await notif_api.get_notifications(api)
-                    if notifications is not None:
-                        known = _known_notif_ids.get(tg_user_id)
-                        all_ids = {n.get("id") for n in notifications if n.get("id")}
-
-                        if known is None:
-                            # First poll after login — just record existing IDs
-                            _known_notif_ids[tg_user_id] = all_ids
-                        else:
-                            new_notifs = [
-                                n for n in notifications
-                                if n.get("id") and n["id"] not in known and not n.get("is_read")
-                            ]
-                            for notif in new_notifs:
-                                try:
-                                    text = format_notification_push(notif)
-                                    file_sent = False
-
-                                    if notif.get("file_url") and notif.get("file_name"):
-                                        try:
-                                            file_bytes = await api.get_raw_bytes(notif["file_url"])
-                                            if file_bytes:
-                                                input_file = BufferedInputFile(file_bytes, filename=notif["file_name"])
-                                                ftype = get_notification_file_type(notif["file_name"])
-                                                caption = text if len(text) <= 1024 else None
-                                                if ftype == "image":
-                                                    await bot.send_photo(tg_user_id, input_file, caption=caption, parse_mode="HTML")
-                                                elif ftype == "video":
-                                                    await bot.send_video(tg_user_id, input_file, caption=caption, parse_mode="HTML")
-                                                else:
-                                                    await bot.send_document(tg_user_id, input_file, caption=caption, parse_mode="HTML")
-                                                if not caption:
-                                                    await bot.send_message(tg_user_id, text, parse_mode="HTML")
-                                                file_sent = True
-                                        except Exception as e:
-                                            logger.error(f"Failed to send notification file to {tg_user_id}: {e}")
-
-                                    if not file_sent:
-                                        await bot.send_message(tg_user_id, text, parse_mode="HTML")
-
-                                    await notif_api.mark_as_read(api, notif["id"])
-                                except Exception as e:
-                                    logger.error(f"Failed to push notification {notif.get('id')} to {tg_user_id}: {e}")
-                            _known_notif_ids[tg_user_id] = all_ids
-
-                    # --- Chat ---
-                    chat_count = await chat_api.get_unread_count(api)
-                    prev_chat = _prev_chat_counts.get(tg_user_id, 0)
-
-                    if chat_count > prev_chat:
-                        if chat_tracker.is_in_chat(tg_user_id):
-                            chat_id = chat_tracker.get_chat_id(tg_user_id)
-                            if chat_id:
-                                await _push_chat_update(bot, tg_user_id, chat_id, api, session)
-                        else:
-                            new_count = chat_count - prev_chat
-                            await bot.send_message(
-                                tg_user_id,
-                                f"💬 У вас {new_count} новых сообщений в чате!",
-                            )
-
-                    _prev_chat_counts[tg_user_id] = chat_count
+            entries = [{"partner_id": session.partner_id, "since": _cursors.get(tg_user_id)} for tg_user_id, session in users]
+            request = asyncio.create_task(
+                internal_api.get_changes(entries, timeout=settings.NOTIFICATION_LONG_POLL_TIMEOUT)
+            )
+            polled = {tg_user_id for tg_user_id, _ in users}
+            try:
+                while not request.done():
+                    await asyncio.wait({request}, timeout=scan_interval)
+                    # Restart the long-poll right away when someone logs in, so their cursor starts now
+                    if not request.done() and any(tg_user_id not in polled for tg_user_id in get_session_ids()):
+                        request.cancel()
+            finally:
+                if not request.done():
+                    request.cancel()
+            if request.cancelled():
+                continue
 
-                except Exception as e:
-                    logger.error(f"Polling error for user {tg_user_id}: {e}")
+            changes = request.result()
+            if changes is None:
+                await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
+                continue
+
+            advanced = {}
+            login_ids = get_login_ids()
+            for (tg_user_id, session), user_changes in zip(users, changes):
+                # Skip users who logged out (or in again) while the request was running
+                if login_ids.get(tg_user_id) != session.login_id:
+                    continue
+                if _accept_changes(tg_user_id, session, user_changes):
+                    advanced[tg_user_id] = _cursors[tg_user_id]
+            state_store.save_cursors(advanced)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Notification poller error: {e}")
+            await asyncio.sleep(5)
 
+
+async def _supervise_watchers(bot: Bot):
+    """Keep one change-feed watcher task per logged-in user."""
+    interval = settings.NOTIFICATION_SESSION_SCAN_INTERVAL
+    while True:
+        try:
+            sessions = set(get_session_ids())
+            for tg_user_id in sessions:
+                task = _watchers.get(tg_user_id)
+                if task is None or task.done():
+                    _watchers[tg_user_id] = asyncio.create_task(_watch_user(bot, tg_user_id))
+            for tg_user_id in list(_watchers):
+                if tg_user_id not in sessions:
+                    clear_user_state(tg_user_id)
+            await asyncio.sleep(interval)
         except asyncio.CancelledError:
-            logger.info("Notification poller stopped")
-            break
+            raise
         except Exception as e:
             logger.error(f"Notification poller error: {e}")
             await asyncio.sleep(5)
 
 
+async def _watch_user(bot: Bot, tg_user_id: int):
+    """Long-poll the change feed of one user and push new notifications and chat messages."""
+    while True:
+        session = get_session(tg_user_id)
+        api = get_api_client(tg_user_id)
+        if not session or not api:
+            return
+
+        try:
+            changes = await notif_api.get_changes(
+                api, _cursors.get(tg_user_id), timeout=settings.NOTIFICATION_LONG_POLL_TIMEOUT,
+            )
+            if changes is None:
+                # Backend unavailable or tokens expired — retry later
+                await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
+                continue
+            if _accept_changes(tg_user_id, session, changes):
+                state_store.save_cursors({tg_user_id: _cursors[tg_user_id]})
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Polling error for user {tg_user_id}: {e}")
+            await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
+
+
+def _accept_changes(tg_user_id: int, session, changes: dict) -> bool:
+    """Advance the user's cursor and queue their new unread notifications and chat messages for pushing.
+
+    Returns whether the cursor changed (and has to be saved).
+    """
+    previous = _cursors.get(tg_user_id)
+    _cursors[tg_user_id] = changes["cursor"]
+    # The first response after login only sets the starting cursor
+    if previous is None:
+        return True
+
+    notifications = [n for n in changes.get("notifications", []) if not n.get("is_read")]
+    new_messages = [m for m in changes.get("chat_messages", []) if not m.get("is_read")]
+    if notifications or new_messages:
+        if tg_user_id not in _pending:
+            _pending[tg_user_id] = []
+            _push_queue.put_nowait(tg_user_id)
+        _pending[tg_user_id].append((session, notifications, new_messages))
+    return changes["cursor"] != previous
+
+
+async def _push_worker(bot: Bot):
+    """Take a queued user and push all their pending deliveries; errors stay with that user."""
+    while True:
+        tg_user_id = await _push_queue.get()
+        try:
+            deliveries = _pending.get(tg_user_id, [])
+            while deliveries:
+                session, notifications, new_messages = deliveries.pop(0)
+                # Skip deliveries of a session that logged out (or in again) meanwhile
+                if not is_current(tg_user_id, session):
+                    continue
+                try:
+                    await _deliver(bot, tg_user_id, session, notifications, new_messages)
+                except Exception as e:
+                    logger.error(f"Push error for user {tg_user_id}: {e}")
+        finally:
+            _pending.pop(tg_user_id, None)
+
+
+async def _read_mark_worker():
+    """Mark pushed notifications as read, so backend writes don't hold up Telegram sends."""
+    while True:
+        tg_user_id, notification_id = await _read_queue.get()
+        api = get_api_client(tg_user_id)
+        if not api:
+            continue
+        try:
+            await notif_api.mark_as_read(api, notification_id)
+        except Exception as e:
+            logger.error(f"Failed to mark notification {notification_id} as read for {tg_user_id}: {e}")
+
+
+async def _deliver(bot: Bot, tg_user_id: int, session, notifications: list[dict], new_messages: list[dict]):
+    """Push one user's new notifications and chat messages."""
+    api = get_api_client(tg_user_id)
+    if not api:
+        return
+    for notif in notifications:
+        await _push_notification(bot, tg_user_id, api, notif)
+
+    if new_messages:
+        if chat_tracker.is_in_chat(tg_user_id):
+            chat_id = chat_tracker.get_chat_id(tg_user_id)
+            if chat_id:
+                await _push_chat_update(bot, tg_user_id, chat_id, api, session)
+        else:
+            await telegram_sender.send(
+                bot.send_message,
+                tg_user_id,
+                f"💬 У вас {len(new_messages)} новых сообщений в чате!",
+            )
+
+
+async def _push_notification(bot: Bot, tg_user_id: int, api, notif: dict):
+    """Send one notification (with its file, if any) and queue its read mark."""
+    try:
+        text = format_notification_push(notif)
+        file_sent = False
+
+        if notif.get("file_url") and notif.get("file_name"):
+            try:
+                caption = text if len(text) <= 1024 else None
+                file_sent = await attachment_cache.send(telegram_sender, bot, tg_user_id, api, notif, caption)
+                if file_sent and not caption:
+                    await telegram_sender.send(bot.send_message, tg_user_id, text, parse_mode="HTML")
+            except Exception as e:
+                logger.error(f"Failed to send notification file to {tg_user_id}: {e}")
+
+        if not file_sent:
+            await telegram_sender.send(bot.send_message, tg_user_id, text, parse_mode="HTML")
+
+        _read_queue.put_nowait((tg_user_id, notif["id"]))
+    except Exception as e:
+        logger.error(f"Failed to push notification {notif.get('id')} to {tg_user_id}: {e}")
+
+
 async def _push_chat_update(bot: Bot, tg_user_id: int, chat_id: int, api, session):
     """Delete old chat display and show updated messages (last page) for user in chat mode."""
     try:
@@ -130,12 +290,12 @@ async def _push_chat_update(bot: Bot, tg_user_id: int, chat_id: int, api, sessio
             return
 
         text, current_page, total_pages = format_chat_page(messages, session.partner_id, page=-1)
-        sent = await bot.send_message(chat_id, text)
+        sent = await telegram_sender.send(bot.send_message, chat_id, text)
         chat_tracker.track_message(tg_user_id, sent.message_id)
 
         if total_pages > 1:
             inline_kb = chat_pagination_keyboard(current_page, total_pages)
-            nav_sent = await bot.send_message(chat_id, "📄 Страницы:", reply_markup=inline_kb)
+            nav_sent = await telegram_sender.send(bot.send_message, chat_id, "📄 Страницы:", reply_markup=inline_kb)
             chat_tracker.track_message(tg_user_id, nav_sent.message_id)
 
     except Exception as e:
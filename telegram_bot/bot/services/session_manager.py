@@ -1,6 +1,10 @@
-from dataclasses import dataclass
+import secrets
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 from bot.api_client.base import APIClient
+from bot.config import settings
+from bot.services.state_store import state_store
 
 
 @dataclass
@@ -10,40 +14,94 @@ class UserSession:
     partner_id: int
     partner_name: str
     partner_email: str
+    # Identifies one /login, so a re-login is told apart from the same session loaded again
+    login_id: str = field(default_factory=lambda: secrets.token_hex(8))
 
 
-_sessions: dict[int, UserSession] = {}
+# Sessions live in the state store (they survive restarts); recently used ones and
+# their API clients are kept here, least recently used first.
+_cache: OrderedDict[int, tuple[UserSession, APIClient]] = OrderedDict()
+
+
+def _build_api_client(telegram_user_id: int, session: UserSession) -> APIClient:
+    client = APIClient(
+        access_token=session.access_token,
+        refresh_token=session.refresh_token,
+    )
+
+    async def on_refresh(new_access: str, new_refresh: str):
+        session.access_token = new_access
+        session.refresh_token = new_refresh
+        if is_current(telegram_user_id, session):
+            state_store.save_session(telegram_user_id, asdict(session))
+
+    client.set_tokens_callback(on_refresh)
+    return client
+
+
+def _remember(telegram_user_id: int, session: UserSession) -> tuple[UserSession, APIClient]:
+    entry = (session, _build_api_client(telegram_user_id, session))
+    _cache[telegram_user_id] = entry
+    _cache.move_to_end(telegram_user_id)
+    while len(_cache) > settings.SESSION_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return entry
+
+
+def _cached(telegram_user_id: int) -> Optional[tuple[UserSession, APIClient]]:
+    entry = _cache.get(telegram_user_id)
+    if entry is not None:
+        _cache.move_to_end(telegram_user_id)
+        return entry
+    fields = state_store.load_session(telegram_user_id)
+    if fields is None:
+        return None
+    return _remember(telegram_user_id, UserSession(**fields))
 
 
 def save_session(telegram_user_id: int, session: UserSession) -> None:
-    _sessions[telegram_user_id] = session
+    state_store.save_session(telegram_user_id, asdict(session))
+    _remember(telegram_user_id, session)
 
 
 def get_session(telegram_user_id: int) -> Optional[UserSession]:
-    return _sessions.get(telegram_user_id)
+    entry = _cached(telegram_user_id)
+    return entry[0] if entry else None
 
 
 def delete_session(telegram_user_id: int) -> None:
-    _sessions.pop(telegram_user_id, None)
+    _cache.pop(telegram_user_id, None)
+    state_store.delete_session(telegram_user_id)
 
 
 def get_api_client(telegram_user_id: int) -> Optional[APIClient]:
-    session = get_session(telegram_user_id)
-    if not session:
-        return None
+    entry = _cached(telegram_user_id)
+    return entry[1] if entry else None
 
-    client = APIClient(
-        access_token=session.access_token,
-        refresh_token=session.refresh_token,
-    )
 
-    async def on_refresh(new_access: str, new_refresh: str):
-        session.access_token = new_access
-        session.refresh_token = new_refresh
+def is_current(telegram_user_id: int, session: UserSession) -> bool:
+    """Whether the session is still the user's login (not logged out or logged in again since).
 
-    client.set_tokens_callback(on_refresh)
-    return client
+    Checked against the cache or the store without loading the session into the cache.
+    """
+    entry = _cache.get(telegram_user_id)
+    login_id = entry[0].login_id if entry else state_store.login_id(telegram_user_id)
+    return login_id == session.login_id
+
+
+def get_login_ids() -> dict[int, str]:
+    """login_id of every stored session, for checking many sessions at once (see is_current)."""
+    return state_store.login_ids()
 
 
 def get_all_sessions() -> dict[int, UserSession]:
-    return dict(_sessions)
+    """Every stored session; cached sessions are returned as is, the rest are read without caching."""
+    sessions = {}
+    for telegram_user_id, fields in state_store.load_sessions().items():
+        entry = _cache.get(telegram_user_id)
+        sessions[telegram_user_id] = entry[0] if entry else UserSession(**fields)
+    return sessions
+
+
+def get_session_ids() -> list[int]:
+    return state_store.session_ids()
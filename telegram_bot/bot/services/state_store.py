@@ -0,0 +1,124 @@
+"""Durable bot state in a local SQLite file: user sessions and change feed cursors."""
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    telegram_user_id INTEGER PRIMARY KEY,
+    login_id TEXT NOT NULL,
+    access_token TEXT NOT NULL,
+    refresh_token TEXT NOT NULL,
+    partner_id INTEGER NOT NULL,
+    partner_name TEXT NOT NULL,
+    partner_email TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    telegram_user_id INTEGER PRIMARY KEY,
+    cursor TEXT NOT NULL
+);
+"""
+
+_SESSION_COLUMNS = ("login_id", "access_token", "refresh_token", "partner_id", "partner_name", "partner_email")
+
+
+class StateStore:
+    """SQLite file at BOT_STATE_DB_PATH, opened on first use.
+
+    Writes are single-row (or one transaction per poll round) and the file
+    is local, so the synchronous sqlite3 calls are short enough to run on
+    the event loop. WAL mode keeps readers and the writer from blocking
+    each other.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info(f"Bot state store opened: {self.path}")
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- Sessions ---
+
+    def load_session(self, telegram_user_id: int) -> Optional[dict]:
+        row = self._db().execute(
+            f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions WHERE telegram_user_id = ?",
+            (telegram_user_id,),
+        ).fetchone()
+        return dict(zip(_SESSION_COLUMNS, row)) if row else None
+
+    def load_sessions(self) -> dict[int, dict]:
+        rows = self._db().execute(f"SELECT telegram_user_id, {', '.join(_SESSION_COLUMNS)} FROM sessions")
+        return {row[0]: dict(zip(_SESSION_COLUMNS, row[1:])) for row in rows}
+
+    def session_ids(self) -> list[int]:
+        return [row[0] for row in self._db().execute("SELECT telegram_user_id FROM sessions")]
+
+    def login_id(self, telegram_user_id: int) -> Optional[str]:
+        row = self._db().execute(
+            "SELECT login_id FROM sessions WHERE telegram_user_id = ?", (telegram_user_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def login_ids(self) -> dict[int, str]:
+        return dict(self._db().execute("SELECT telegram_user_id, login_id FROM sessions"))
+
+    def save_session(self, telegram_user_id: int, fields: dict) -> None:
+        conn = self._db()
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO sessions (telegram_user_id, {', '.join(_SESSION_COLUMNS)}, updated_at) "
+                f"VALUES (?, {', '.join('?' for _ in _SESSION_COLUMNS)}, ?)",
+                (telegram_user_id, *(fields[column] for column in _SESSION_COLUMNS), time.time()),
+            )
+
+    def delete_session(self, telegram_user_id: int) -> None:
+        conn = self._db()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE telegram_user_id = ?", (telegram_user_id,))
+
+    # --- Change feed cursors ---
+
+    def load_cursors(self) -> dict[int, str]:
+        return dict(self._db().execute("SELECT telegram_user_id, cursor FROM cursors"))
+
+    def save_cursors(self, cursors: dict[int, str]) -> None:
+        if not cursors:
+            return
+        conn = self._db()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cursors (telegram_user_id, cursor) VALUES (?, ?)",
+                cursors.items(),
+            )
+
+    def delete_cursor(self, telegram_user_id: int) -> None:
+        conn = self._db()
+        with conn:
+            conn.execute("DELETE FROM cursors WHERE telegram_user_id = ?", (telegram_user_id,))
+
+
+state_store = StateStore(settings.BOT_STATE_DB_PATH)
@@ -0,0 +1,136 @@
+"""Rate-limited Telegram sends and cached notification attachments."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import BufferedInputFile, Message
+
+from bot.config import settings
+from bot.utils.formatters import get_notification_file_type
+from bot.utils.rate_limit import KeyedTokenBuckets, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramSender:
+    """Sends through the bot within Telegram's limits.
+
+    Every send takes a token from the chat's bucket (TELEGRAM_CHAT_RATE with
+    bursts of TELEGRAM_CHAT_BURST) and then from the global bucket
+    (TELEGRAM_GLOBAL_RATE), so concurrent push workers never exceed either
+    limit. A 429 (TelegramRetryAfter) is waited out and retried up to
+    TELEGRAM_SEND_RETRIES times.
+    """
+
+    def __init__(self):
+        self._global = TokenBucket(settings.TELEGRAM_GLOBAL_RATE)
+        self._chats = KeyedTokenBuckets(settings.TELEGRAM_CHAT_RATE, settings.TELEGRAM_CHAT_BURST)
+        self.sent = 0
+        self.retries = 0
+
+    async def send(self, method, chat_id: int, *args, **kwargs):
+        """Call a bot send method (bot.send_message, bot.send_photo, ...) for chat_id."""
+        attempt = 0
+        while True:
+            await self._chats.acquire(chat_id)
+            await self._global.acquire()
+            try:
+                result = await method(chat_id, *args, **kwargs)
+            except TelegramRetryAfter as e:
+                if attempt >= settings.TELEGRAM_SEND_RETRIES:
+                    raise
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"Telegram flood limit for chat {chat_id}, retrying in {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+                continue
+            self.sent += 1
+            return result
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "retries": self.retries,
+            "waited_seconds": round(self._global.waited_seconds, 3),
+        }
+
+
+def _uploaded_file_id(message: Message, file_type: str) -> str | None:
+    """Telegram file_id of the file attached to a sent message."""
+    if file_type == "image":
+        return message.photo[-1].file_id if message.photo else None
+    media = message.video if file_type == "video" else message.document
+    return media.file_id if media else None
+
+
+class AttachmentCache:
+    """Notification files shared by all recipients of a notification.
+
+    The first recipient downloads the file from the backend and uploads it;
+    the file_id Telegram returns is then reused for everyone else, so a
+    broadcast costs one download and one upload. Until then (or if Telegram
+    returned no file_id) the downloaded bytes are kept instead. Recipients of the same
+    notification wait for the first upload (a per-notification lock); the
+    last NOTIFICATION_FILE_CACHE_SIZE notifications are kept.
+    """
+
+    def __init__(self):
+        # notification_id -> Telegram file_id or downloaded bytes
+        self._files: OrderedDict[int, str | bytes] = OrderedDict()
+        self._locks: dict[int, asyncio.Lock] = {}
+        self.downloads = 0
+        self.hits = 0
+
+    def _remember(self, notification_id: int, file: str | bytes) -> None:
+        self._files[notification_id] = file
+        self._files.move_to_end(notification_id)
+        while len(self._files) > settings.NOTIFICATION_FILE_CACHE_SIZE:
+            evicted, _ = self._files.popitem(last=False)
+            self._locks.pop(evicted, None)
+
+    async def send(self, sender: TelegramSender, bot, chat_id: int, api, notif: dict, caption: str | None) -> bool:
+        """Send the notification's file to chat_id; False if it could not be downloaded."""
+        notification_id = notif["id"]
+        file_type = get_notification_file_type(notif["file_name"])
+        if file_type == "image":
+            method = bot.send_photo
+        elif file_type == "video":
+            method = bot.send_video
+        else:
+            method = bot.send_document
+
+        lock = self._locks.setdefault(notification_id, asyncio.Lock())
+        async with lock:
+            cached = self._files.get(notification_id)
+            if not isinstance(cached, str):
+                file_bytes = cached
+                if file_bytes is None:
+                    file_bytes = await api.get_raw_bytes(notif["file_url"])
+                    self.downloads += 1
+                    if not file_bytes:
+                        self._locks.pop(notification_id, None)
+                        return False
+                    # Kept even if the upload below fails, so the next recipient doesn't download again
+                    self._remember(notification_id, file_bytes)
+                else:
+                    self.hits += 1
+                input_file = BufferedInputFile(file_bytes, filename=notif["file_name"])
+                message = await sender.send(method, chat_id, input_file, caption=caption, parse_mode="HTML")
+                file_id = _uploaded_file_id(message, file_type)
+                if file_id:
+                    self._remember(notification_id, file_id)
+                return True
+
+        # Already uploaded: send by file_id outside the lock, in parallel with other recipients
+        self.hits += 1
+        await sender.send(method, chat_id, cached, caption=caption, parse_mode="HTML")
+        return True
+
+    def stats(self) -> dict:
+        return {"entries": len(self._files), "downloads": self.downloads, "hits": self.hits}
+
+
+telegram_sender = TelegramSender()
+attachment_cache = AttachmentCache()